@@ -1,44 +1,208 @@
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QGraphicsScene, QGraphicsView,
-    QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsTextItem,
-    QVBoxLayout, QHBoxLayout, QPushButton, QWidget, QLineEdit, QLabel, QMessageBox
+    QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsSimpleTextItem, QGraphicsPolygonItem,
+    QVBoxLayout, QHBoxLayout, QPushButton, QWidget, QLineEdit, QLabel, QMessageBox, QSlider, QFileDialog, QCheckBox
 )
-from collections import deque
 from PyQt5.QtWidgets import QInputDialog
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPen, QBrush
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPen, QBrush, QColor, QPolygonF, QPainter, QTransform, QImage
 from tkinter import simpledialog
 import sys
-import heapq
 from PyQt5.QtCore import QTimer
-import time
+import search_engine
+import graph_store
+import tree_io
+from query_cache import QueryCache
+from search_observers import SearchCounters
+from tree_layout import TidyLayout
+from search_engine import Node, EXPAND
+
+# Animation-only event kinds appended after the search events
+PATH_NODE = "path_node"  # Highlight a node on the solution path
+PATH_EDGE = "path_edge"  # Highlight an edge on the solution path
+
+# Level of detail: below LABEL_MIN_ZOOM labels are unreadable and are not painted, and below
+# DETAIL_MIN_ZOOM nodes and edges are drawn as plain fills and hairlines. A tree of at least
+# OVERVIEW_MIN_NODES nodes is drawn below DETAIL_MIN_ZOOM as one cached overview image
+# instead, since walking that many items every frame is what makes zoomed-out views slow.
+LABEL_MIN_ZOOM = 0.45
+DETAIL_MIN_ZOOM = 0.2
+OVERVIEW_MIN_NODES = 2000
+OVERVIEW_MAX_SIZE = 4096  # Longest side of the overview image in pixels
+MIN_ZOOM, MAX_ZOOM = 0.01, 8.0
+
+# Tidy layout units in pixels
+NODE_SPACING = 80  # Between neighbouring nodes on one level
+LEVEL_SPACING = 100  # Between levels
+
+
+class LabelItem(QGraphicsSimpleTextItem):
+    """Text label that is skipped while painting when the view is zoomed out below LABEL_MIN_ZOOM.
+
+    A simple text item costs a fraction of a QGraphicsTextItem, which keeps a
+    whole text document per label; the translation reproduces that item's
+    4px document margin so labels sit where they always did.
+    """
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.setTransform(QTransform.fromTranslate(4, 4))
+
+    def setDefaultTextColor(self, color):
+        self.setBrush(QBrush(color))
+
+    def paint(self, painter, option, widget=None):
+        if option.levelOfDetailFromTransform(painter.worldTransform()) >= LABEL_MIN_ZOOM:
+            super().paint(painter, option, widget)
+
+
+class NodeItem(QGraphicsEllipseItem):
+    """Node ellipse that is filled without an outline when zoomed out below DETAIL_MIN_ZOOM."""
+
+    def paint(self, painter, option, widget=None):
+        if option.levelOfDetailFromTransform(painter.worldTransform()) >= DETAIL_MIN_ZOOM:
+            super().paint(painter, option, widget)
+        else:
+            painter.fillRect(self.rect(), self.brush())
 
 
+class EdgeItem(QGraphicsLineItem):
+    """Edge line drawn as a one-pixel hairline when zoomed out below DETAIL_MIN_ZOOM."""
 
-class Node:
-    """Represents a node in the binary tree."""
-    
-    def __init__(self, char, heuristic, path_cost=0):
-        self.char = char
-        self.heuristic = heuristic
-        self.children = []  # A list to hold multiple child nodes
-        self.path_cost = path_cost
-        self.parents = []
-    def __eq__(self, other):
-        # Compare nodes based on their unique character
-        return isinstance(other, Node) and self.char == other.char
-    
+    def paint(self, painter, option, widget=None):
+        if option.levelOfDetailFromTransform(painter.worldTransform()) >= DETAIL_MIN_ZOOM:
+            super().paint(painter, option, widget)
+        else:
+            painter.setPen(QPen(self.pen().color(), 0))
+            painter.drawLine(self.line())
+
+
+class ZoomableView(QGraphicsView):
+    """Graphics view that zooms around the cursor with the mouse wheel and pans by dragging.
+
+    on_zoom(zoom) is called after every zoom change. While an overview is
+    set, its image is drawn as the background under the (hidden) items.
+    """
+
+    def __init__(self, scene, parent=None, on_zoom=None):
+        super().__init__(scene, parent)
+        self.on_zoom = on_zoom
+        self.overview = None  # (QImage, scene QRectF it covers)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setRenderHint(QPainter.Antialiasing, False)
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setCacheMode(QGraphicsView.CacheBackground)
+
+    def zoom(self):
+        """Current scale factor of the view."""
+        return self.transform().m11()
+
+    def zoom_by(self, factor):
+        """Scales the view by factor, clamped to MIN_ZOOM..MAX_ZOOM."""
+        factor = min(max(self.zoom() * factor, MIN_ZOOM), MAX_ZOOM) / self.zoom()
+        self.scale(factor, factor)
+        if self.on_zoom is not None:
+            self.on_zoom(self.zoom())
+
+    def set_overview(self, overview):
+        """Sets the (image, scene rect) drawn as the background, or None for none."""
+        self.overview = overview
+        self.resetCachedContent()
+        self.viewport().update()
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        if self.overview is not None:
+            image, target = self.overview
+            painter.drawImage(target, image)
+
+    def wheelEvent(self, event):
+        if event.angleDelta().y():
+            self.zoom_by(1.25 if event.angleDelta().y() > 0 else 0.8)
+
+
+class SearchAnimator:
+    """Replays a search event stream on a QTimer without blocking the GUI thread.
+
+    Events are pulled from the stream only as they are shown, so a recorded
+    trace and a live search generator (search_engine.SearchStream) play the
+    same way, and a live search advances one step per tick.
+    """
+
+    def __init__(self, apply_event, interval=800):
+        self.apply_event = apply_event  # apply_event(kind, char, parent_char) -> True if something was drawn
+        self.events = iter(())
+        self.pending = None  # Next event, read one ahead so the last step finishes right away
+        self.on_finished = None
+        self.paused = False
+        self.timer = QTimer()
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.step)
+
+    def is_running(self):
+        """True while an animation is playing or paused."""
+        return self.on_finished is not None or self.pending is not None
+
+    def start(self, events, on_finished=None):
+        """Starts replaying an iterable of events, cancelling any animation that is still running."""
+        self.cancel()
+        self.events = iter(events)
+        self.pending = next(self.events, None)
+        self.on_finished = on_finished
+        self.paused = False
+        self.timer.start()
+        self.step()  # Show the first step right away
+
+    def step(self):
+        """Applies events up to and including the next one that changes the scene."""
+        while self.pending is not None:
+            event, self.pending = self.pending, next(self.events, None)
+            if self.apply_event(*event):
+                break
+        if self.pending is None:
+            self.finish()
+
+    def finish(self):
+        """Stops the timer and hands control to the on_finished callback."""
+        self.timer.stop()
+        on_finished, self.on_finished = self.on_finished, None
+        if on_finished is not None:
+            on_finished()
+
+    def pause(self):
+        self.paused = True
+        self.timer.stop()
+
+    def resume(self):
+        self.paused = False
+        if self.is_running():
+            self.timer.start()
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
 
-    def __hash__(self):
-        # Hash nodes based on their character for dictionary keys and sets
-        return hash(self.char)
+    def skip_to_end(self):
+        """Applies every remaining event at once, then finishes."""
+        while self.pending is not None:
+            event, self.pending = self.pending, next(self.events, None)
+            self.apply_event(*event)
+        self.finish()
 
-    def __lt__(self, other):
-        if not isinstance(other, Node):
-            return NotImplemented
-        # Compare the values
-        return (self.heuristic < other.heuristic) or (self.path_cost < other.path_cost) or (self.char < other.char)
+    def cancel(self):
+        """Drops the remaining events without calling on_finished."""
+        self.timer.stop()
+        self.events = iter(())
+        self.pending = None
+        self.on_finished = None
 
+    def set_interval(self, interval):
+        """Sets the delay between steps in milliseconds."""
+        self.timer.setInterval(interval)
 
 
 class TreeVisualizer(QMainWindow):
@@ -50,7 +214,7 @@ class TreeVisualizer(QMainWindow):
         # Graphics Scene and View
         self.scene = QGraphicsScene()
         self.scene.setBackgroundBrush(QBrush(Qt.white))
-        self.view = QGraphicsView(self.scene, self)
+        self.view = ZoomableView(self.scene, self, on_zoom=self.update_level_of_detail)
         self.view.setGeometry(0, 0, 1920, 1050)
 
         # Main Container
@@ -71,6 +235,8 @@ class TreeVisualizer(QMainWindow):
 
         self.ucs_button = QPushButton("Perform UCS")
         self.ucs_button.clicked.connect(self.perform_ucs)
+        self.precompute_ucs_input = QCheckBox("Precompute UCS from root")
+        self.precompute_ucs_input.toggled.connect(self.toggle_shortest_paths)
 
         self.greedy_button = QPushButton("Perform greedy")
         self.greedy_button.clicked.connect(self.perform_greedy)
@@ -84,14 +250,31 @@ class TreeVisualizer(QMainWindow):
         self.astar_button = QPushButton("Perform A* Search")
         self.astar_button.clicked.connect(self.perform_astar)
 
+        self.ida_star_button = QPushButton("Perform IDA*")
+        self.ida_star_button.clicked.connect(self.perform_ida_star)
+
+        self.sma_star_button = QPushButton("Perform SMA*")
+        self.sma_star_button.clicked.connect(self.perform_sma_star)
+
+        self.analyze_heuristic_button = QPushButton("Analyze Heuristic")
+        self.analyze_heuristic_button.clicked.connect(self.analyze_heuristic)
+
+        self.bidirectional_button = QPushButton("Perform Bidirectional")
+        self.bidirectional_button.clicked.connect(self.perform_bidirectional)
+
         # Add buttons to the left panel
         left_panel.addWidget(self.dfs_button)
         left_panel.addWidget(self.limited_dfs_button)
         left_panel.addWidget(self.ucs_button )
+        left_panel.addWidget(self.precompute_ucs_input)
         left_panel.addWidget(self.greedy_button )
         left_panel.addWidget(self.iterative_button )
         left_panel.addWidget(self.bfs_button)
         left_panel.addWidget(self.astar_button)
+        left_panel.addWidget(self.ida_star_button)
+        left_panel.addWidget(self.sma_star_button)
+        left_panel.addWidget(self.analyze_heuristic_button)
+        left_panel.addWidget(self.bidirectional_button)
         
 
         # Add Reset Algorithm button
@@ -99,6 +282,34 @@ class TreeVisualizer(QMainWindow):
         self.reset_algorithm_button.clicked.connect(self.reset_algorithm)
         left_panel.addWidget(self.reset_algorithm_button)
 
+        self.stats_button = QPushButton("Search Statistics")
+        self.stats_button.clicked.connect(self.show_search_statistics)
+        left_panel.addWidget(self.stats_button)
+
+        # Animation controls shared by every algorithm
+        self.animator = SearchAnimator(self.apply_search_event)
+
+        self.pause_button = QPushButton("Pause / Resume")
+        self.pause_button.clicked.connect(self.animator.toggle_pause)
+        self.step_button = QPushButton("Step")
+        self.step_button.clicked.connect(self.step_animation)
+        self.skip_button = QPushButton("Skip to End")
+        self.skip_button.clicked.connect(self.animator.skip_to_end)
+        self.cancel_button = QPushButton("Cancel Animation")
+        self.cancel_button.clicked.connect(self.animator.cancel)
+
+        self.speed_slider = QSlider(Qt.Horizontal)
+        self.speed_slider.setRange(50, 2000)  # Delay between steps in milliseconds
+        self.speed_slider.setValue(800)
+        self.speed_slider.valueChanged.connect(self.animator.set_interval)
+
+        left_panel.addWidget(self.pause_button)
+        left_panel.addWidget(self.step_button)
+        left_panel.addWidget(self.skip_button)
+        left_panel.addWidget(self.cancel_button)
+        left_panel.addWidget(QLabel("Step Delay (ms):"))
+        left_panel.addWidget(self.speed_slider)
+
         left_panel.addStretch()  # Push the buttons to the top
 
         # Right Panel Layout for Controls and Tree Visualization
@@ -112,9 +323,10 @@ class TreeVisualizer(QMainWindow):
         self.heuristic_input = QLineEdit()
         self.heuristic_input.setPlaceholderText("Heuristic")
         self.parent_input = QLineEdit()
-        self.parent_input.setPlaceholderText("Parent Node")
+        self.parent_input.setPlaceholderText("Parent Node(s), comma-separated")
         self.path_cost = QLineEdit()
         self.path_cost.setPlaceholderText("Path Cost")
+        self.undirected_input = QCheckBox("Undirected")
 
         controls.addWidget(QLabel("Node:"))
         controls.addWidget(self.char_input)
@@ -124,17 +336,27 @@ class TreeVisualizer(QMainWindow):
         controls.addWidget(self.parent_input)
         controls.addWidget(QLabel("Path Cost:"))
         controls.addWidget(self.path_cost)
+        controls.addWidget(self.undirected_input)
 
         # Buttons for Other Actions
         self.add_button = QPushButton("Add Node")
         self.delete_button = QPushButton("Delete Node")
         self.reset_button = QPushButton("Reset Tree")
+        self.load_button = QPushButton("Load Tree")
+        self.save_button = QPushButton("Save Tree")
+        self.collapse_button = QPushButton("Collapse / Expand")
         self.add_button.clicked.connect(self.add_node)
         self.delete_button.clicked.connect(self.delete_node)
         self.reset_button.clicked.connect(self.reset_tree)
+        self.load_button.clicked.connect(self.load_tree)
+        self.save_button.clicked.connect(self.save_tree)
+        self.collapse_button.clicked.connect(self.toggle_collapse)
         controls.addWidget(self.add_button)
         controls.addWidget(self.delete_button)
         controls.addWidget(self.reset_button)
+        controls.addWidget(self.load_button)
+        controls.addWidget(self.save_button)
+        controls.addWidget(self.collapse_button)
 
         # Add the tree view and controls to the right panel
         right_panel.addWidget(self.view)
@@ -142,9 +364,24 @@ class TreeVisualizer(QMainWindow):
 
         # Initialize the tree root and other variables
         self.tree_root = None
+        self.nodes = {}  # char -> Node, so lookups never walk the tree
+        self.parent_nodes = {}  # char -> layout parent Node (None for the root); extra parents are only edges
         self.node_positions = {}
+        self.tree_layout = TidyLayout(self.shown_children)  # Kept between edits for partial relayouts
+        self.layout_origin = None  # Scene point of layout x = 0 at the root's depth; the root itself may drift
         self.node_graphics = {}
+        self.edge_graphics = {}  # (parent char, child char) -> [line, cost_text]; one entry per undirected pair
         self.algorithm_state = {}  # State of the algorithm
+        self.query_cache = QueryCache()  # Repeated searches replay their cached trace
+        self.shortest_paths = None  # ShortestPathTree from the root while "Precompute UCS" is checked
+        self.last_search = None  # (algorithm, event trace) of the last search played
+        self.collapsed = {}  # char -> [glyph, count_text] for subtrees drawn as one summary glyph, None until drawn
+        self.hidden_chars = set()  # Nodes hidden inside collapsed subtrees
+        self.overview_active = False  # True while a large tree is drawn as one overview image
+        self.overview_timer = QTimer()  # Coalesces changes made in overview mode into one redraw
+        self.overview_timer.setSingleShot(True)
+        self.overview_timer.setInterval(200)
+        self.overview_timer.timeout.connect(self.refresh_overview)
     def reset_node_color(self, char):
         """Resets the color of a node to its original state."""
         if char in self.node_graphics:
@@ -152,62 +389,133 @@ class TreeVisualizer(QMainWindow):
             ellipse.setBrush(QBrush(Qt.yellow))  # Reset to yellow   
     def reset_algorithm(self):
         """Reset algorithm state without resetting the tree."""
-      
+        self.animator.cancel()
         self.algorithm_state.clear()
-        for item in self.scene.items():
-            if isinstance(item, QGraphicsEllipseItem):
-                item.setBrush(QBrush(Qt.yellow))  # Reset node color back to yellow
-            elif isinstance(item, QGraphicsLineItem):
-                item.setPen(QPen(Qt.black, 4))  # Reset edge color to black and line width
-            elif isinstance(item, QGraphicsTextItem):
-                item.setDefaultTextColor(Qt.black)  # Reset text color to black
+        for ellipse, char_text, heuristic_text in self.node_graphics.values():
+            ellipse.setBrush(QBrush(Qt.yellow))  # Reset node color back to yellow
+            char_text.setDefaultTextColor(Qt.black)  # Reset text color to black
+            heuristic_text.setDefaultTextColor(Qt.black)
+        for line, cost_text in self.edge_graphics.values():
+            line.setPen(QPen(Qt.black, 4))  # Reset edge color to black and line width
+            cost_text.setDefaultTextColor(Qt.black)
+        self.schedule_overview()
     
         QMessageBox.information(self, "Reset Algorithm", "Algorithm state has been reset!")   
-    def redraw_tree(self, node):
-        """Recursively draws the tree based on updated positions."""
-        if not node:
-            return
 
-        x, y = self.node_positions[node.char]
-        self.draw_node(node, x, y)
+    def layout_children(self, node):
+        """Children laid out below node; shared nodes sit under their layout parent only."""
+        return [child for child in node.children if self.parent_nodes.get(child.char) is node]
 
-        for child in node.children:
-            child_x, child_y = self.node_positions[child.char]
-            self.draw_edge(x, y, child_x, child_y, cost=child.path_cost)
-            self.redraw_tree(child)
+    def edge_key(self, parent_char, child_char):
+        """Returns the edge_graphics key for an edge in either direction, or None if it is not drawn."""
+        if (parent_char, child_char) in self.edge_graphics:
+            return (parent_char, child_char)
+        if (child_char, parent_char) in self.edge_graphics:
+            return (child_char, parent_char)
+        return None
 
-    def recalculate_positions(self, node, x, y, spacing):
-        """Recursively calculates positions for each node to avoid overlap."""
-        if not node:
+    def shown_children(self, node):
+        """Layout children that are drawn; a collapsed node is laid out as a leaf."""
+        return [] if node.char in self.collapsed else self.layout_children(node)
+
+    def relayout_subtree(self, node):
+        """Re-lays out the tree after the children below node changed and moves only what moved.
+
+        The tidy layout recomputes node's subtree and re-packs its ancestors,
+        so sibling subtrees only shift and nodes that kept their place are
+        not touched.
+        """
+        if node.char in self.hidden_chars:
+            return  # Inside a collapsed subtree; laid out when it is expanded
+        self.apply_layout(self.tree_layout.relayout(node))
+
+    def apply_layout(self, moved):
+        """Converts the layout of the moved nodes to scene positions and moves their graphics."""
+        origin_x, origin_y = self.layout_origin
+        for node in moved:
+            self.node_positions[node.char] = (origin_x + self.tree_layout.x[node] * NODE_SPACING,
+                                              origin_y + self.tree_layout.depth[node] * LEVEL_SPACING)
+        self.place_moved(moved)
+
+    def place_moved(self, moved):
+        """Moves the graphics of the moved nodes, and every edge touching them, to their positions."""
+        for node in moved:
+            self.place_node(node)
+
+        # Edges from other parts of the graph follow the moved nodes too; an edge between two
+        # moved nodes is placed once
+        edges = {}
+        for node in moved:
+            for child in node.children:
+                edges.setdefault(frozenset((node.char, child.char)), (node, child))
+            for parent in node.parents:
+                edges.setdefault(frozenset((parent.char, node.char)), (parent, node))
+        for parent, child in edges.values():
+            self.place_edge(parent, child)
+        self.update_level_of_detail()
+
+    def place_node(self, node):
+        """Moves a node's existing graphics to its position, drawing them on first use."""
+        x, y = self.node_positions[node.char]
+        if node.char not in self.node_graphics:
+            self.draw_node(node, x, y)
             return
 
-        # Set the current node's position
-        self.node_positions[node.char] = (x, y)
-
-        num_children = len(node.children)
-        if num_children > 0:
-            # Calculate the total width required for all children
-            total_child_width = spacing * (num_children - 1)
-
-            # Start placing the children evenly spaced around the current node's position
-            start_x = x - (total_child_width // 2)
-            for i, child in enumerate(node.children):
-                child_x = start_x + i * spacing
-                child_y = y + 100  # Move the child node 100px below the current node
-                self.recalculate_positions(child, child_x, child_y, spacing // 2)
-
-
+        ellipse, char_text, heuristic_text = self.node_graphics[node.char]
+        ellipse.setPos(x, y)
+        char_text.setPos(x - 3, y - 15)
+        heuristic_text.setPos(x - 5, y + 5)
+        if self.collapsed.get(node.char):
+            glyph, count_text = self.collapsed[node.char]
+            glyph.setPos(x, y)
+            count_text.setPos(x + 26, y + 42)
+
+    def place_edge(self, parent, child):
+        """Moves an existing edge to follow its end nodes, drawing it on first use."""
+        if parent.char not in self.node_positions or child.char not in self.node_positions:
+            return  # An end inside a collapsed subtree has not been laid out yet
+        x1, y1 = self.node_positions[parent.char]
+        x2, y2 = self.node_positions[child.char]
+        key = self.edge_key(parent.char, child.char)
+        if key is None:
+            self.draw_edge(x1, y1, x2, y2, cost=parent.cost_to(child), parent_char=parent.char, child_char=child.char)
+            return
 
+        line, cost_text = self.edge_graphics[key]
+        line.setLine(x1, y1, x2, y2)
+        cost_text.setPos((x1 + x2) // 2 - 25, (y1 + y2) // 2 - 10)
 
     def add_node(self):
+        """Adds a node under one or more parents, or links an existing node to more parents."""
         char = self.char_input.text().strip()
         heuristic = self.heuristic_input.text().strip()
         path_cost = self.path_cost.text().strip()
-        parent_char = self.parent_input.text().strip()
+        parent_chars = [parent.strip() for parent in self.parent_input.text().split(",") if parent.strip()]
+        directed = not self.undirected_input.isChecked()
 
-        if not char or not heuristic:
+        if not char:
             return  # Ensure inputs are valid
 
+        # An existing node only gains edges from the listed parents
+        if char in self.nodes:
+            node = self.nodes[char]
+            parents = [self.find_node(parent_char) for parent_char in parent_chars]
+            if not parents or any(parent is None or parent is node or node in parent.edge_costs
+                                  or (not directed and parent in node.edge_costs) for parent in parents):
+                return  # Unknown parent, self-loop or edge already present (in either direction when undirected)
+            cost = float(path_cost) if path_cost else node.path_cost
+            for parent in parents:
+                parent.add_edge(node, cost, directed)
+                self.place_edge(parent, node)
+                self.shortest_paths_add_edge(parent, node, directed)
+            self.apply_collapse()
+            self.query_cache.bump()
+            self.clear_inputs()
+            return
+
+        if not heuristic:
+            return  # New nodes need a heuristic
+
         # Root Node
         if self.tree_root is None:
             width = self.view.width()
@@ -216,40 +524,114 @@ class TreeVisualizer(QMainWindow):
 
             # Create the root node
             self.tree_root = Node(char, float(heuristic), path_cost=float(path_cost) if path_cost else 0)
+            self.nodes[char] = self.tree_root
+            self.parent_nodes[char] = None
             # Update the root node position to the desired position
             self.node_positions[char] = (width // 4, height // 4)  # Adjust the positioning as per your requirements
+            self.layout_origin = self.node_positions[char]
+            self.tree_layout.layout(self.tree_root)
             self.draw_node(self.tree_root, width // 4, height // 4)
+            self.toggle_shortest_paths(self.precompute_ucs_input.isChecked())  # The table starts at the new root
+            self.query_cache.bump()
             self.clear_inputs()
             return  # Return after adding the root node (no parent required)
 
-        # Find Parent Node
-        if parent_char not in self.node_positions:
+        # Find Parent Nodes; the first one decides where the node is laid out
+        parents = [self.find_node(parent_char) for parent_char in parent_chars]
+        if not parents or any(parent is None for parent in parents):
             return  # Parent not found
 
-        parent_node = self.find_node(self.tree_root, parent_char)
-        if not parent_node:
-            return
-
         # Add as a new Child Node
         child_node = Node(char, float(heuristic), path_cost=float(path_cost) if path_cost else 0)
-        parent_node.children.append(child_node)
+        for parent in parents:
+            parent.add_edge(child_node, directed=directed)
+            self.shortest_paths_add_edge(parent, child_node, directed)
+        self.nodes[char] = child_node
+        self.parent_nodes[char] = parents[0]
 
-        # Recalculate positions and redraw the tree
-        self.node_positions.clear()  # Clear previous positions
-        self.scene.clear()  # Clear the scene
-        
-        self.recalculate_positions(self.tree_root, self.view.width() // 4, self.view.height() // 4, 300)
-        self.redraw_tree(self.tree_root)
+        # Only the layout parent's subtree moves when a child is added
+        self.relayout_subtree(parents[0])
+        self.apply_collapse()  # A child added inside a collapsed subtree starts hidden
 
+        self.query_cache.bump()
         self.clear_inputs()
 
+    def load_tree(self):
+        """Replaces the tree with one read from a CSV, JSON or binary graph file, laid out and drawn once."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load Tree", "", f"Tree files (*.csv *.json *{graph_store.EXTENSION});;All files (*)")
+        if not path:
+            return  # User canceled
+
+        try:
+            if path.lower().endswith(graph_store.EXTENSION):
+                root, nodes, parent_nodes, positions = graph_store.load_graph(path)
+            else:
+                root, nodes, parent_nodes = tree_io.load_tree(path)
+                positions = None
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Load Error", str(error))
+            return
+
+        self.reset_tree()
+        self.tree_root = root
+        self.nodes = nodes
+        self.parent_nodes = parent_nodes
+        if root is None:
+            return  # Empty file
+
+        self.layout_origin = (self.view.width() // 4, self.view.height() // 4)
+        moved = self.tree_layout.layout(root)  # Nothing is drawn yet, so this draws every node once
+        if positions:
+            # Restore the saved view; the layout state above still serves later partial relayouts,
+            # so line its origin up with where the saved root sits
+            root_x, root_y = positions[root.char]
+            self.layout_origin = (root_x - self.tree_layout.x[root] * NODE_SPACING, root_y)
+            self.node_positions.update(positions)
+            self.place_moved(moved)
+        else:
+            self.apply_layout(moved)
+        self.toggle_shortest_paths(self.precompute_ucs_input.isChecked())
+
+    def save_tree(self):
+        """Writes the tree, its layout parents and node positions to a binary graph file."""
+        if self.tree_root is None:
+            QMessageBox.warning(self, "Save Error", "There is no tree to save.")
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Tree", "", f"Graph files (*{graph_store.EXTENSION});;All files (*)")
+        if not path:
+            return  # User canceled
+        if not path.lower().endswith(graph_store.EXTENSION):
+            path += graph_store.EXTENSION
+
+        # Nodes hidden in a collapsed subtree keep stale positions, so let the next load lay them out
+        positions = None if self.collapsed else self.node_positions
+        try:
+            graph_store.save_graph(path, self.tree_root, self.parent_nodes, positions)
+        except OSError as error:
+            QMessageBox.warning(self, "Save Error", str(error))
+
     def reset_tree(self):
         """Resets the tree by clearing the scene and all data structures."""
+        self.animator.cancel()
         self.scene.clear()
         self.tree_root = None
+        self.nodes = {}
+        self.parent_nodes = {}
         self.node_positions = {}
+        self.layout_origin = None
+        self.tree_layout.layout(None)
         self.node_graphics = {}
+        self.edge_graphics = {}
         self.goal_node = None  # Reset the goal node
+        self.last_search = None
+        self.collapsed = {}
+        self.hidden_chars = set()
+        self.overview_active = False
+        self.view.set_overview(None)
+        self.query_cache.bump()
+        self.toggle_shortest_paths(self.precompute_ucs_input.isChecked())
 
         # Clear input fields
         self.clear_inputs()
@@ -257,14 +639,14 @@ class TreeVisualizer(QMainWindow):
     def delete_node(self):
         """Delete a node from the tree."""
         char = self.char_input.text().strip()
-        if char not in self.node_positions:
-            return  # Node not found
 
         # Find the node to delete
-        node_to_delete = self.find_node(self.tree_root, char)
+        node_to_delete = self.find_node(char)
+        if not node_to_delete:
+            return  # Node not found
 
-        # Prevent deleting parent nodes with children
-        if node_to_delete and node_to_delete.children:
+        # Prevent deleting parent nodes with children laid out below them
+        if self.layout_children(node_to_delete):
             msg_box = QMessageBox()
             msg_box.setIcon(QMessageBox.Warning)
             msg_box.setWindowTitle("Deletion Error")
@@ -273,8 +655,8 @@ class TreeVisualizer(QMainWindow):
             msg_box.exec_()
             return
 
-        # Remove the edge to the parent
-        self.remove_edge_to_parent(char)
+        # Remove every edge into and out of the node
+        self.remove_node_edges(node_to_delete)
 
         # Remove node graphics
         if char in self.node_graphics:
@@ -283,113 +665,239 @@ class TreeVisualizer(QMainWindow):
             del self.node_graphics[char]
 
         # Remove node from the tree
-        self.delete_node_recursive(self.tree_root, char)
-        del self.node_positions[char]
+        parent = self.parent_nodes.pop(char)
+        if parent is None:
+            self.tree_root = None  # The root was the only node left
+            self.toggle_shortest_paths(self.precompute_ucs_input.isChecked())
+        del self.nodes[char]
+        self.node_positions.pop(char, None)
+        self.tree_layout.forget(node_to_delete)
+
+        # Re-center the remaining siblings
+        if parent is not None:
+            self.relayout_subtree(parent)
+        self.hidden_chars.discard(char)
+        self.apply_collapse()
+        self.query_cache.bump()
 
         # Clear the input field after deletion
         self.char_input.clear()
 
-    def remove_edge_to_parent(self, char):
-        """Remove the edge and cost text connecting the node to its parent."""
-        if char not in self.node_positions:
-            return
-
-        parent = self.find_parent(self.tree_root, char)
-        if not parent or parent.char not in self.node_positions:
-            return
-
-        parent_pos = self.node_positions[parent.char]
-        child_pos = self.node_positions[char]
-
-        # Remove the line and cost label
-        items_to_remove = []
-        for item in self.scene.items():
-            if isinstance(item, QGraphicsLineItem):
-                line = item.line()
-                if (
-                    (line.x1() == parent_pos[0] and line.y1() == parent_pos[1] and
-                     line.x2() == child_pos[0] and line.y2() == child_pos[1]) or
-                    (line.x1() == child_pos[0] and line.y1() == child_pos[1] and
-                     line.x2() == parent_pos[0] and line.y2() == parent_pos[1])
-                ):
-                    items_to_remove.append(item)
-            elif isinstance(item, QGraphicsTextItem):
-                mid_x = (parent_pos[0] + child_pos[0]) // 2
-                mid_y = (parent_pos[1] + child_pos[1]) // 2
-                if abs(item.pos().x() - (mid_x - 25)) < 5 and abs(item.pos().y() - (mid_y - 10)) < 5:
-                    items_to_remove.append(item)
-
-        for item in items_to_remove:
-            self.scene.removeItem(item)
-
-    def delete_node_recursive(self, current, char):
-        """Helper function to delete a node from the tree."""
-        if not current:
-            return None
+    def toggle_collapse(self):
+        """Collapses the subtree below the node in the Character box into one glyph, or expands it again."""
+        char = self.char_input.text().strip()
+        node = self.find_node(char)
+        if node is None:
+            return  # Node not found
 
-        # Remove the node from the children list
-        if any(child.char == char for child in current.children):
-            current.children = [child for child in current.children if child.char != char]
+        if char in self.collapsed:
+            for item in self.collapsed.pop(char) or []:
+                self.scene.removeItem(item)
+        elif self.layout_children(node):
+            self.collapsed[char] = None  # The glyph is drawn by apply_collapse
         else:
-            for child in current.children:
-                self.delete_node_recursive(child, char)
+            return  # Nothing below the node to collapse
+        self.relayout_subtree(node)  # A collapsed subtree takes the room of a single node
+        self.apply_collapse()
+        self.char_input.clear()
 
-        return current
+    def apply_collapse(self):
+        """Hides the nodes below collapsed nodes and keeps one summary glyph per collapsed subtree.
+
+        Only nodes whose visibility changed, and the edges touching them, are
+        updated, so collapsing part of a large tree does not touch the rest.
+        """
+        hidden = set()
+        for char in list(self.collapsed):
+            node = self.nodes.get(char)
+            if node is None or not self.layout_children(node):
+                for item in self.collapsed.pop(char) or []:
+                    self.scene.removeItem(item)  # Nothing left below it to summarize
+                continue
 
-    def find_node(self, current, char):
-        """Find a node in the tree by its character."""
-        if not current:
-            return None
-        if current.char == char:
-            return current
-        # Iterate through all children, not just left or right
-        for child in current.children:
-            result = self.find_node(child, char)
-            if result:
-                return result
-        return None
+            count = 0
+            stack = list(self.layout_children(node))
+            while stack:
+                current = stack.pop()
+                hidden.add(current.char)
+                count += 1
+                stack.extend(self.layout_children(current))
+            if self.collapsed[char] is None:
+                if char not in self.node_positions:
+                    continue  # Collapsed while hidden itself; the glyph is drawn once the node is laid out
+                self.collapsed[char] = self.draw_collapsed_glyph(node)
+            self.collapsed[char][1].setText(f"+{count}")
+
+        changed = [char for char in hidden ^ self.hidden_chars if char in self.nodes]
+        self.hidden_chars = hidden
+        for char in changed:
+            visible = char not in hidden and not self.overview_active
+            for item in self.node_graphics.get(char, []):
+                item.setVisible(visible)
+            node = self.nodes[char]
+            for other in node.children + node.parents:
+                key = self.edge_key(char, other.char)
+                if key is not None:
+                    for item in self.edge_graphics[key]:
+                        item.setVisible(visible and other.char not in hidden)
+        for char, items in self.collapsed.items():
+            for item in items or []:
+                item.setVisible(char not in hidden and not self.overview_active)
+        self.schedule_overview()
+
+    def update_level_of_detail(self, zoom=None):
+        """Draws a large tree as one overview image below DETAIL_MIN_ZOOM, and as items otherwise."""
+        zoom = self.view.zoom() if zoom is None else zoom
+        active = zoom < DETAIL_MIN_ZOOM and len(self.nodes) >= OVERVIEW_MIN_NODES
+        if active == self.overview_active:
+            self.schedule_overview()
+            return
 
-    def find_parent(self, current, char):
-        """Find the parent of a node."""
-        if not current:
+        self.overview_active = active
+        self.show_tree_items(not active)
+        self.view.set_overview(self.render_overview() if active else None)
+
+    def schedule_overview(self):
+        """Redraws the overview image soon, at most once per timer interval, if it is shown."""
+        if self.overview_active and not self.overview_timer.isActive():
+            self.overview_timer.start()
+
+    def refresh_overview(self):
+        """Redraws the overview image from the current item colors."""
+        if self.overview_active:
+            self.view.set_overview(self.render_overview())
+
+    def show_tree_items(self, visible):
+        """Shows or hides every node, edge and glyph item; nodes in collapsed subtrees stay hidden."""
+        hidden = self.hidden_chars
+        for char, items in self.node_graphics.items():
+            for item in items:
+                item.setVisible(visible and char not in hidden)
+        for (parent_char, child_char), items in self.edge_graphics.items():
+            for item in items:
+                item.setVisible(visible and parent_char not in hidden and child_char not in hidden)
+        for char, items in self.collapsed.items():
+            for item in items or []:
+                item.setVisible(visible and char not in hidden)
+
+    def render_overview(self):
+        """Paints every shown node and edge, in its current color, into one image; returns (image, scene rect)."""
+        shown = [char for char in self.node_graphics if char not in self.hidden_chars]
+        if not shown:
             return None
-        # Check if the current node is the parent of any child
-        for child in current.children:
-            if child.char == char:
-                return current
-            result = self.find_parent(child, char)
-            if result:
-                return result
-        return None
+        xs = [self.node_positions[char][0] for char in shown]
+        ys = [self.node_positions[char][1] for char in shown]
+        target = QRectF(min(xs) - 30, min(ys) - 30, max(xs) - min(xs) + 70, max(ys) - min(ys) + 70)
+        scale = min(1.0, OVERVIEW_MAX_SIZE / max(target.width(), target.height()))
+
+        image = QImage(max(1, int(target.width() * scale)), max(1, int(target.height() * scale)),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.scale(scale, scale)
+        painter.translate(-target.left(), -target.top())
+
+        # One drawLines call per edge color instead of one paint call per item
+        lines = {}
+        for (parent_char, child_char), (line, _) in self.edge_graphics.items():
+            if parent_char not in self.hidden_chars and child_char not in self.hidden_chars:
+                lines.setdefault(line.pen().color().rgba(), []).append(line.line())
+        for rgba, color_lines in lines.items():
+            painter.setPen(QPen(QColor.fromRgba(rgba), 0))
+            painter.drawLines(color_lines)
+        for char in shown:
+            ellipse = self.node_graphics[char][0]
+            painter.fillRect(ellipse.rect().translated(ellipse.pos()), ellipse.brush())
+        painter.end()
+        return image, target
+
+    def draw_collapsed_glyph(self, node):
+        """Draws the triangle and hidden-node count that stand for a collapsed subtree."""
+        x, y = self.node_positions[node.char]
+        glyph = QGraphicsPolygonItem(QPolygonF([QPointF(6, 38), QPointF(-14, 72), QPointF(26, 72)]))
+        glyph.setPos(x, y)
+        glyph.setBrush(QBrush(Qt.lightGray))
+        glyph.setPen(QPen(Qt.black))
+        glyph.setZValue(1)
+        self.scene.addItem(glyph)
+
+        count_text = LabelItem("")
+        count_text.setPos(x + 26, y + 42)
+        count_text.setZValue(2)
+        self.scene.addItem(count_text)
+        return [glyph, count_text]
+
+    def toggle_shortest_paths(self, enabled):
+        """Builds the precomputed UCS table from the current root, or drops it."""
+        self.shortest_paths = search_engine.ShortestPathTree(self.tree_root) if enabled else None
+
+    def shortest_paths_add_edge(self, parent, child, directed=True):
+        """Keeps the precomputed UCS table current after parent -> child was added."""
+        if self.shortest_paths is None:
+            return
+        self.shortest_paths.add_edge(parent, child)
+        if not directed:
+            self.shortest_paths.add_edge(child, parent)
+
+    def remove_node_edges(self, node):
+        """Unlinks node from all its parents and children and removes the edge lines and cost labels."""
+        for parent in list(node.parents):
+            parent.remove_edge(node)
+            self.remove_edge_graphics(parent.char, node.char)
+            if self.shortest_paths is not None:
+                self.shortest_paths.remove_edge(parent, node)
+        for child in list(node.children):
+            node.remove_edge(child)
+            self.remove_edge_graphics(node.char, child.char)
+            if self.shortest_paths is not None:
+                self.shortest_paths.remove_edge(node, child)
+
+    def remove_edge_graphics(self, parent_char, child_char):
+        """Removes the line and cost label drawn for an edge, if any."""
+        for item in self.edge_graphics.pop(self.edge_key(parent_char, child_char), []):
+            self.scene.removeItem(item)
+
+    def find_node(self, char):
+        """Find a node in the tree by its character."""
+        return self.nodes.get(char)
 
 
-    def draw_edge(self, x1, y1, x2, y2, cost):
-        """Draw an edge between two nodes."""
-        line = QGraphicsLineItem(x1, y1, x2, y2)
+    def draw_edge(self, x1, y1, x2, y2, cost, parent_char=None, child_char=None):
+        """Draw an edge between two nodes and register it under (parent_char, child_char)."""
+        line = EdgeItem(x1, y1, x2, y2)
         pen = QPen(Qt.black, 4)  # Set the pen width to 4 for a bolder line
         line.setPen(pen)
         self.scene.addItem(line)  # Add the edge first, ensuring it stays behind nodes
 
         mid_x = (x1 + x2) // 2
         mid_y = (y1 + y2) // 2
-        cost_text = QGraphicsTextItem(f"{cost}")
+        cost_text = LabelItem(f"{cost}")
         cost_text.setPos(mid_x - 25, mid_y - 10)
         cost_text.setDefaultTextColor(Qt.black)
         self.scene.addItem(cost_text)
 
+        if self.overview_active or parent_char in self.hidden_chars or child_char in self.hidden_chars:
+            line.setVisible(False)  # Drawn in the overview image, or an end lies inside a collapsed subtree
+            cost_text.setVisible(False)
+
+        if parent_char is not None:
+            self.edge_graphics[(parent_char, child_char)] = [line, cost_text]
+
     def draw_node(self, node, x, y):
         """Draw a node at the given position."""
         radius = 23
-        ellipse = QGraphicsEllipseItem(x - radius, y - radius, 2.5 * radius, 2.5 * radius)
+        # The ellipse is drawn around its own origin so relayouts can move it with setPos
+        ellipse = NodeItem(-radius, -radius, 2.5 * radius, 2.5 * radius)
+        ellipse.setPos(x, y)
         ellipse.setBrush(QBrush(Qt.yellow))
         ellipse.setPen(QPen(Qt.black))
         self.scene.addItem(ellipse)  # Add node after edge to ensure it's on top
 
-        char_text = QGraphicsTextItem(node.char)
+        char_text = LabelItem(node.char)
         char_text.setPos(x - 3, y - 15)
         self.scene.addItem(char_text)
 
-        heuristic_text = QGraphicsTextItem(f"{node.heuristic}")
+        heuristic_text = LabelItem(f"{node.heuristic}")
         heuristic_text.setPos(x - 5, y + 5)
         self.scene.addItem(heuristic_text)
 
@@ -399,6 +907,9 @@ class TreeVisualizer(QMainWindow):
         heuristic_text.setZValue(2)
 
         self.node_graphics[node.char] = [ellipse, char_text, heuristic_text]
+        if self.overview_active:
+            for item in self.node_graphics[node.char]:
+                item.setVisible(False)  # The overview image stands in for it
         
 
     def clear_inputs(self):
@@ -406,87 +917,119 @@ class TreeVisualizer(QMainWindow):
         self.heuristic_input.clear()
         self.parent_input.clear()
         self.path_cost.clear()  # Corrected line
+        self.undirected_input.setChecked(False)
 
-    def visualize_path(self, path):
-        """Highlight the path from the traversal result."""
+    def path_events(self, path):
+        """Builds the animation events that highlight a solution path."""
         if not path or len(path) < 2:
-            return
+            return []
 
         # Highlight the nodes in the path
-        for char in path:
-            if char in self.node_graphics:
-                ellipse, _, _ = self.node_graphics[char]
-                ellipse.setBrush(QBrush(Qt.green))
-                QApplication.processEvents()
-                time.sleep(0.5)
+        events = [(PATH_NODE, char, None) for char in path]
 
         # Highlight the edges in the path
         for i in range(len(path) - 1):
-            parent_char = path[i]
-            child_char = path[i + 1]
-
-            # Find the parent node in the tree
-            parent_node = self.find_node(self.tree_root, parent_char)
-
-            # If parent node exists, highlight the edge to the child
-            if parent_node:
-                for child in parent_node.children:
-                    if child.char == child_char:
-                        parent_pos = self.node_positions.get(parent_char)
-                        child_pos = self.node_positions.get(child_char)
-                        if parent_pos and child_pos:
-                            self.highlight_edge(parent_pos, child_pos)
-
-    # Handle potential branching in the path
-        for i in range(len(path) - 2):
-            current_char = path[i]
-            current_node = self.find_node(self.tree_root, current_char)
-            for child in current_node.children:
-                if child.char in path[i+2:]:  # Check if any descendant in the path
-                    parent_pos = self.node_positions.get(current_char)
-                    child_pos = self.node_positions.get(child.char)
-                    if parent_pos and child_pos:
-                        self.highlight_edge(parent_pos, child_pos)
-
-    def is_descendant(self, current, parent, child):
-        """Checks if child is a descendant of parent in the tree."""
-        if not current:
-            return False
-        if current.char == child:
+            if self.edge_key(path[i], path[i + 1]) is not None:
+                events.append((PATH_EDGE, path[i + 1], path[i]))
+        return events
+
+    def highlight_edge(self, parent_char, child_char):
+        """Highlight the edge from parent_char to child_char."""
+        key = self.edge_key(parent_char, child_char)
+        if key is not None:
+            line, _ = self.edge_graphics[key]
+            line.setPen(QPen(Qt.green, 3))  # Green, thicker line for the edge
+
+    def highlight_edge2(self, parent_char, child_char):
+        """Highlight the edge between two nodes while it is being explored."""
+        # Backward searches reach a node from its child, so accept either direction
+        key = self.edge_key(parent_char, child_char)
+        if key is not None:
+            line, _ = self.edge_graphics[key]
+            line.setPen(QPen(Qt.blue, 3))  # Blue, thicker line for the edge
+
+    def highlight_expansion(self, char, parent_char):
+        """Colors an expanded node and the edge it was reached through."""
+        if char in self.node_graphics:
+            ellipse, _, _ = self.node_graphics[char]
+            ellipse.setBrush(QBrush(Qt.blue))  # Set the node color to blue
+            ellipse.update()  # Force the ellipse to refresh visually
+
+        if parent_char is not None:
+            self.highlight_edge2(parent_char, char)
+
+    def apply_search_event(self, kind, char, parent_char):
+        """Draws one animation event; returns True when the scene changed."""
+        self.schedule_overview()
+        if kind == EXPAND:
+            self.highlight_expansion(char, parent_char)
             return True
-        # Check through all children of the current node
-        for child_node in current.children:
-            if self.is_descendant(child_node, parent, child):
-                return True
-        return False
-
-    def highlight_edge(self, parent_pos, child_pos):
-        """Highlight the edge between two positions."""
-        for item in self.scene.items():
-            if isinstance(item, QGraphicsLineItem):
-                line = item.line()
-                if (
-                    (line.x1() == parent_pos[0] and line.y1() == parent_pos[1] and
-                    line.x2() == child_pos[0] and line.y2() == child_pos[1]) or
-                    (line.x1() == child_pos[0] and line.y1() == child_pos[1] and
-                    line.x2() == parent_pos[0] and line.y2() == parent_pos[1])
-                ):
-                    item.setPen(QPen(Qt.green, 3))  # Green, thicker line for the edge
-                    QApplication.processEvents()
-                    time.sleep(0.5)
-    def highlight_edge2(self, parent_pos, child_pos):
-        """Highlight the edge between two positions."""
-        for item in self.scene.items():
-            if isinstance(item, QGraphicsLineItem):
-                line = item.line()
-                if (
-                    (line.x1() == parent_pos[0] and line.y1() == parent_pos[1] and
-                    line.x2() == child_pos[0] and line.y2() == child_pos[1]) or
-                    (line.x1() == child_pos[0] and line.y1() == child_pos[1] and
-                    line.x2() == parent_pos[0] and line.y2() == parent_pos[1])
-                ):
-                    item.setPen(QPen(Qt.blue, 3))  # Green, thicker line for the edge
-                    
+        if kind == PATH_NODE and char in self.node_graphics:
+            ellipse, _, _ = self.node_graphics[char]
+            ellipse.setBrush(QBrush(Qt.green))
+            return True
+        if kind == PATH_EDGE and self.edge_key(parent_char, char) is not None:
+            self.highlight_edge(parent_char, char)
+            return True
+        return False  # Enqueue and goal events are not drawn
+
+    def step_animation(self):
+        """Advances a paused animation by one step."""
+        if not self.animator.paused:
+            self.animator.pause()
+        if self.animator.is_running():
+            self.animator.step()
+
+    def ask_find_all(self, goal_chars):
+        """Asks whether to stop after the first goal; returns None if the user canceled."""
+        if len(goal_chars) < 2:
+            return False  # Nothing to choose with a single goal
+
+        mode, ok = QInputDialog.getItem(
+            self, "Search Mode",
+            "Stop search after finding:",
+            ["First goal", "All goals"],
+            editable=False
+        )
+        if not ok:
+            return None
+        return mode == "All goals"
+
+    def show_all_goals(self, title, result):
+        """Shows the path and cost to every goal reached by a find-all search."""
+        lines = [
+            f"Goal: {goal}, Path: {' -> '.join(path)}, Cost: {cost}" + (f" (expansion {index + 1})" if index >= 0 else "")
+            for goal, (path, cost, index) in result.goals.items()
+        ]
+        QMessageBox.information(self, title, "\n".join(lines))
+
+    def play_search(self, events, result, on_finished):
+        """Animates a recorded search, then highlights the path to every goal it reached."""
+        self.last_search = (result.algorithm, tuple(events))
+        for path, _, _ in result.goals.values():
+            events.extend(self.path_events(path))
+        self.animator.start(events, on_finished)
+
+    def show_search_statistics(self):
+        """Shows the counters of the last search, collected by replaying its event trace."""
+        if self.last_search is None:
+            QMessageBox.information(self, "Search Statistics", "Run a search first.")
+            return
+
+        algorithm, events = self.last_search
+        counters = SearchCounters()
+        for event in events:
+            counters(*event)
+        lines = [
+            f"Algorithm: {algorithm}",
+            f"Expansions: {counters.expansions} ({counters.re_expansions} re-expansions)",
+            f"Pushes: {counters.enqueues} ({counters.duplicate_pushes} duplicates)",
+            f"Pruned: {counters.prunes}",
+            f"Goals reached: {counters.goals}",
+            f"Frontier high-water mark: {counters.frontier_high_water} nodes",
+        ]
+        QMessageBox.information(self, "Search Statistics", "\n".join(lines))
+
     #############################################################
     def perform_dfs(self):
         """Performs Depth-First Search on the tree and visualizes the path."""
@@ -504,55 +1047,26 @@ class TreeVisualizer(QMainWindow):
             QMessageBox.warning(self, "Invalid Input", "Please enter at least one valid goal node.")
             return
 
-        # Use a stack (implemented with deque) for DFS
-        stack = deque([(self.tree_root, None)])  # Stack contains (current_node, parent_node)
-        visited = set()  # Keep track of visited nodes
-        path = []  # Store the path during DFS
+        find_all = self.ask_find_all(goal_node_chars)
+        if find_all is None:
+            return  # User canceled
+
+        result, events = self.query_cache.search(
+            "DFS", None, goal_node_chars, {"find_all": find_all},
+            lambda on_event: search_engine.dfs(self.tree_root, goal_node_chars, find_all, on_event=on_event)
+        )
 
-        def highlight_step():
-            """Inner function to highlight the next step."""
-            if not stack:
-                # All nodes processed, but no goal was found
+        def show_result():
+            if find_all and result.found:
+                self.show_all_goals("DFS Result", result)
+            elif result.found:
+                QMessageBox.information(self, "DFS Result", f"Goal Node Found: {result.goal}\nTraversal: {' -> '.join(result.expanded)}\nDFS Path: {' -> '.join(result.path)}")
+            else:
                 QMessageBox.information(self, "DFS Result", "None of the goal nodes were reachable through DFS.")
-                return
 
-            current_node, parent_node = stack.pop()
-
-            # Highlight the current node
-            if current_node.char in self.node_graphics:
-                ellipse, _, _ = self.node_graphics[current_node.char]
-                ellipse.setBrush(QBrush(Qt.blue))  # Set the node color to blue
-                ellipse.update()  # Force the ellipse to refresh visually
-
-            # Mark the node as visited
-            visited.add(current_node.char)
-            path.append(current_node.char)  # Add to the traversal path
-
-            # Highlight the edge from parent to current
-            if parent_node:
-                parent_pos = self.node_positions[parent_node.char]
-                current_pos = self.node_positions[current_node.char]
-                self.highlight_edge2(parent_pos, current_pos)
-
-            # Check if the current node is one of the goal nodes
-            if current_node.char in goal_node_chars:
-                # Highlight the path and stop further processing
-                self.visualize_path(path)
-                QMessageBox.information(self, "DFS Result", f"Goal Node Found: {current_node.char}\nDFS Path: {' -> '.join(path)}")
-                return  # Stop the search
-
-            # Process children in reverse order for DFS (last child is processed first)
-            for child in reversed(current_node.children):
-                if child.char not in visited:
-                    stack.append((child, current_node))
-
-            # Continue to the next step
-            QTimer.singleShot(800, highlight_step)  # 800ms delay between steps
-
-        # Start the visualization
-        highlight_step()
-        
-    ############################################################################   
+        self.play_search(events, result, show_result)
+
+    ############################################################################
     def perform_limited_dfs(self):
         """Performs Depth-First Search with a user-defined depth limit."""
         if not self.tree_root:
@@ -574,66 +1088,31 @@ class TreeVisualizer(QMainWindow):
         if not ok:
             return  # User canceled or entered invalid depth
 
-        # Use a stack (implemented with deque) for DFS
-        stack = deque([(self.tree_root, None, 0)])  # Stack contains (current_node, parent_node, depth)
-        visited = set()  # Keep track of visited nodes
-        path = []  # Store the path during DFS
-        found_goal = False  # Flag to check if goal node is found
-
-        def highlight_step():
-            """Inner function to highlight the next step."""
-            nonlocal found_goal  # Declare found_goal as nonlocal to modify the outer variable
-
-            if not stack:
-                # All nodes processed, but no goal was found
-                if found_goal:
-                    QMessageBox.information(self, "DFS Result", f"Goal Node Found: {current_node.char}\nDFS Path: {' -> '.join(path)}")
-                    
-                else:
-                    QMessageBox.information(self, "DFS Result", "None of the goal nodes were found within the depth limit.")
-                return
-
-            current_node, parent_node, current_depth = stack.pop()
-
-            # Highlight the current node
-            if current_node.char in self.node_graphics:
-                ellipse, _, _ = self.node_graphics[current_node.char]
-                ellipse.setBrush(QBrush(Qt.blue))  # Set the node color to blue
-                ellipse.update()  # Force the ellipse to refresh visually
-
-            # Mark the node as visited
-            visited.add(current_node.char)
-            path.append(current_node.char)  # Add to the traversal path
-
-            # Highlight the edge from parent to current
-            if parent_node:
-                parent_pos = self.node_positions[parent_node.char]
-                current_pos = self.node_positions[current_node.char]
-                self.highlight_edge2(parent_pos, current_pos)
+        find_all = self.ask_find_all(goal_node_chars)
+        if find_all is None:
+            return  # User canceled
 
-            # Check if the current node is one of the goal nodes
-            if current_node.char in goal_node_chars:
-                found_goal = True
-                self.visualize_path(path)
-                # Stop the search if goal is found
-                QTimer.singleShot(500, lambda: QMessageBox.information(self, "DFS Result", f"Goal Node Found: {current_node.char}\nDFS Path: {' -> '.join(path)}"))
-
-                return
+        result, events = self.query_cache.search(
+            "Limited DFS", None, goal_node_chars, {"depth_limit": depth_limit, "find_all": find_all},
+            lambda on_event: search_engine.limited_dfs(self.tree_root, goal_node_chars, depth_limit, find_all, on_event=on_event)
+        )
 
-            # Process children in reverse order for DFS (last child is processed first) if within depth limit
-            if current_depth < depth_limit:
-                for child in reversed(current_node.children):
-                    if child.char not in visited:
-                        stack.append((child, current_node, current_depth + 1))
+        def show_result():
+            if find_all and result.found:
+                self.show_all_goals("DFS Result", result)
+            elif result.found:
+                QMessageBox.information(self, "DFS Result", f"Goal Node Found: {result.goal}\nTraversal: {' -> '.join(result.expanded)}\nDFS Path: {' -> '.join(result.path)}")
+            else:
+                QMessageBox.information(self, "DFS Result", "None of the goal nodes were found within the depth limit.")
 
-            # Continue to the next step
-            QTimer.singleShot(800, highlight_step)  # 800ms delay between steps
+        self.play_search(events, result, show_result)
 
-        # Start the visualization
-        highlight_step()
-        
     ##################### TO BE CONTINUED ########################################
     def perform_iterative(self):
+        """Performs iterative deepening search, raising the depth limit until a goal is found."""
+        if not self.tree_root:
+            return  # No tree to traverse
+
         goals = simpledialog.askstring("Input", "Enter the goal node values (comma-separated)")
         if not goals:
             QMessageBox.warning(self, "Error", "Please enter at least one goal node.")
@@ -644,80 +1123,43 @@ class TreeVisualizer(QMainWindow):
             QMessageBox.warning(self, "Error", "Invalid input. Please enter valid goal nodes.")
             return
 
-        def get_max_depth():
-            max_depth = simpledialog.askinteger("Input", "Enter the maximum depth (positive integer)")
-            if max_depth is None:
-                return None  # Return None to indicate no valid input
-            if max_depth <= 0:
-                QMessageBox.warning(self, "Error", "Please enter a valid maximum depth.")
-                return None
-            else:
-                return max_depth
-
-        while True:
-            max_depth = get_max_depth()
-            if max_depth is None:
-                break  # Exit the loop if the user chooses not to retry
-
-            self.reset_visualization_to_original()  # Reset visualization at the start of each new depth level
-
-            depth_limit = max_depth
-            stack = deque([(self.tree_root, None, 0)])  # (current_node, parent_node, current_depth)
-            path = []
-            visited = set()
-            found_goal = False
+        find_all = self.ask_find_all(goals)
+        if find_all is None:
+            return  # User canceled
 
-            def highlight_step():
-                nonlocal found_goal
-
-                if not stack:
-                    if found_goal:
-                        return
-                    else:
-                        QMessageBox.information(self, "Search Result", "None of the goal nodes were reachable within the given depth.")
-                        return
-
-                current_node, parent_node, current_depth = stack.pop()
-
-                if current_node.char in self.node_graphics:
-                    ellipse, _, _ = self.node_graphics[current_node.char]
-                    ellipse.setBrush(QBrush(Qt.blue))  # Highlight the node
-                    ellipse.update()
-
-                visited.add(current_node.char)
-                path.append(current_node.char)
-
-                if parent_node:
-                    parent_pos = self.node_positions[parent_node.char]
-                    current_pos = self.node_positions[current_node.char]
-                    self.highlight_edge2(parent_pos, current_pos)
+        max_depth = simpledialog.askinteger("Input", "Enter the maximum depth (positive integer)")
+        if max_depth is None:
+            return  # User canceled
+        if max_depth <= 0:
+            QMessageBox.warning(self, "Error", "Please enter a valid maximum depth.")
+            return
 
-                if current_node.char in goals:
-                    found_goal = True
-                    self.visualize_path(path)
-                    QTimer.singleShot(500, lambda: QMessageBox.information(self, "Result", f"Goal Node Found: {current_node.char}\nPath: {' -> '.join(path)}"))
-                    return
+        self.reset_visualization_to_original()  # Reset visualization before animating
 
-                if current_depth < depth_limit:
-                    for child in reversed(current_node.children):
-                        if child.char not in visited:
-                            stack.append((child, current_node, current_depth + 1))
+        result, events = self.query_cache.search(
+            "IDDFS", None, goals, {"max_depth": max_depth, "find_all": find_all},
+            lambda on_event: search_engine.iterative_deepening(self.tree_root, goals, max_depth, find_all, on_event=on_event)
+        )
 
-                QTimer.singleShot(800, highlight_step)  # Delay between steps
+        def show_result():
+            per_depth = ", ".join(f"{depth}: {count}" for depth, count in enumerate(result.iterations))
+            if not result.found:
+                QMessageBox.information(self, "Search Result", f"None of the goal nodes were reachable within the given depth.\nNodes expanded per depth limit: {per_depth}")
+            elif find_all:
+                self.show_all_goals("Result", result)
+            else:
+                QMessageBox.information(self, "Result", f"Goal Node Found: {result.goal} at depth {len(result.path) - 1}\nPath: {' -> '.join(result.path)}\nNodes expanded per depth limit: {per_depth}")
 
-            highlight_step()
-            if found_goal:
-                break
+        self.play_search(events, result, show_result)
 
     def reset_visualization_to_original(self):
         for node_char, (ellipse, _, _) in self.node_graphics.items():
             ellipse.setBrush(QBrush(Qt.yellow))  # Reset to original color
             ellipse.update()
-        for item in self.scene.items():
-            if isinstance(item, QGraphicsLineItem):
-                item.setPen(QPen(Qt.black))  # Reset edges to original color
-                item.update()
-                
+        for line, _ in self.edge_graphics.values():
+            line.setPen(QPen(Qt.black))  # Reset edges to original color
+            line.update()
+
     ###########################################################################
     def perform_greedy(self):
         goals = simpledialog.askstring("Input", "Enter the goal nodes (comma-separated)")
@@ -731,41 +1173,29 @@ class TreeVisualizer(QMainWindow):
             return
 
         for goal in goal_nodes:
-            if goal not in self.node_positions:
+            if goal not in self.nodes:
                 QMessageBox.warning(self, "Error", f"Goal node '{goal}' does not exist in the tree.")
                 return
 
-        priority_queue = []
-        heapq.heappush(priority_queue, (self.tree_root.heuristic, self.tree_root, [self.tree_root.char], self.tree_root.heuristic))
-        visited = set()
-
-        while priority_queue:
-            total_heuristic, current_node, path, path_cost = heapq.heappop(priority_queue)
-
-            if current_node.char in visited:
-                continue
-
-            visited.add(current_node.char)
-
-            if current_node.char in self.node_graphics:
-                ellipse, _, _ = self.node_graphics[current_node.char]
-                ellipse.setBrush(QBrush(Qt.blue))
-                QApplication.processEvents()
-                time.sleep(0.5)
+        find_all = self.ask_find_all(goal_nodes)
+        if find_all is None:
+            return  # User canceled
 
-            if current_node.char in goal_nodes:
-                QMessageBox.information(self, "Result", f"Path to reach '{current_node.char}' (using Greedy Search): {' -> '.join(path)} with total heuristic cost {path_cost}")
-                self.visualize_path(path)
-                return
+        result, events = self.query_cache.search(
+            "Greedy", None, goal_nodes, {"find_all": find_all},
+            lambda on_event: search_engine.greedy(self.tree_root, goal_nodes, find_all, on_event=on_event)
+        )
 
-            for child in current_node.children:
-                if child.char not in visited:
-                    new_path_cost = path_cost + child.heuristic
-                    heapq.heappush(priority_queue, (child.heuristic, child, path + [child.char], new_path_cost))
+        def show_result():
+            if find_all and result.found:
+                self.show_all_goals("Result", result)
+            elif result.found:
+                QMessageBox.information(self, "Result", f"Path to reach '{result.goal}' (using Greedy Search): {' -> '.join(result.path)} with total cost {result.cost}")
+            else:
+                QMessageBox.information(self, "Result", "None of the goal nodes are reachable.")
 
-        QMessageBox.information(self, "Result", f"None of the goal nodes are reachable.")
+        self.play_search(events, result, show_result)
 
-    
     ##################################################################################################
     def perform_bfs(self):
         """Perform Breadth-First Search (BFS) with step-by-step visualization."""
@@ -783,232 +1213,291 @@ class TreeVisualizer(QMainWindow):
             return
         goal_chars = [goal.strip() for goal in goals_input.split(",")]
 
-        if start_char not in self.node_positions:
+        if start_char not in self.nodes:
             QMessageBox.warning(self, "Error", f"Node {start_char} does not exist.")
             return
         for goal_char in goal_chars:
-            if goal_char not in self.node_positions:
+            if goal_char not in self.nodes:
                 QMessageBox.warning(self, "Error", f"Node {goal_char} does not exist.")
                 return
 
-        queue = deque([(start_char, [start_char])])
-        visited = set()
-        traversal = []
+        find_all = self.ask_find_all(goal_chars)
+        if find_all is None:
+            return  # User canceled
 
-        while queue:
-            current_char, path = queue.popleft()
+        start_node = self.find_node(start_char)
+        result, events = self.query_cache.search(
+            "BFS", start_char, goal_chars, {"find_all": find_all},
+            lambda on_event: search_engine.bfs(start_node, goal_chars, find_all, on_event=on_event)
+        )
 
-            if current_char in visited:
-                continue
+        def show_result():
+            traversal = ' -> '.join(result.expanded)
+            if find_all and result.found:
+                self.show_all_goals("BFS Result", result)
+            elif result.found:
+                QMessageBox.information(
+                    self, "BFS Result", f"Traversal: {traversal}\nPath to Goal: {' -> '.join(result.path)}"
+                )
+            else:
+                QMessageBox.information(self, "BFS Result", f"Traversal: {traversal}\nGoal nodes not found.")
 
-            visited.add(current_char)
-            traversal.append(current_char)
+        self.play_search(events, result, show_result)
 
-            if current_char in self.node_graphics:
-                ellipse, _, _ = self.node_graphics[current_char]
-                ellipse.setBrush(QBrush(Qt.yellow))
-                QApplication.processEvents()
-                time.sleep(0.5)
+    def perform_bidirectional(self):
+        """Searches forward from a start node and backward from the goals until the frontiers meet."""
+        if not self.tree_root:
+            QMessageBox.warning(self, "Error", "Tree is empty. Add nodes first.")
+            return
 
-            if current_char in goal_chars:
-                self.visualize_path(path)
-                QMessageBox.information(
-                    self, "BFS Result", f"Traversal: {' -> '.join(traversal)}\nPath to Goal: {' -> '.join(path)}"
-                )
-                return
+        start_char, ok_start = QInputDialog.getText(self, "Bidirectional Search", "Enter the starting node:")
+        if not ok_start or not start_char.strip():
+            return
+        start_char = start_char.strip()
 
-            current_node = self.find_node(self.tree_root, current_char)
-            for child in current_node.children:
-                if child.char not in visited:
-                    queue.append((child.char, path + [child.char]))
+        goals_input, ok_goal = QInputDialog.getText(self, "Bidirectional Search", "Enter the goal nodes (comma-separated):")
+        if not ok_goal or not goals_input.strip():
+            return
+        goal_chars = [goal.strip() for goal in goals_input.split(",") if goal.strip()]
 
-            if current_char in self.node_graphics:
-                ellipse.setBrush(QBrush(Qt.blue))
-                QApplication.processEvents()
-                time.sleep(0.5)
+        for char in [start_char] + goal_chars:
+            if char not in self.nodes:
+                QMessageBox.warning(self, "Error", f"Node {char} does not exist.")
+                return
 
-        QMessageBox.information(
-            self, "BFS Result", f"Traversal: {' -> '.join(traversal)}\nGoal nodes not found."
+        mode, ok = QInputDialog.getItem(self, "Search Mode", "Expand frontiers by:", ["BFS", "UCS"], editable=False)
+        if not ok:
+            return  # User canceled
+
+        result, events = self.query_cache.search(
+            "Bidirectional", start_char, goal_chars, {"weighted": mode == "UCS"},
+            lambda on_event: search_engine.bidirectional_search(
+                self.nodes[start_char], [self.nodes[char] for char in goal_chars],
+                weighted=mode == "UCS", on_event=on_event
+            )
         )
-        
+
+        def show_result():
+            if result.found:
+                QMessageBox.information(
+                    self, "Bidirectional Result",
+                    f"Goal Node Found: {result.goal}\nPath: {' -> '.join(result.path)} with total cost {result.cost}\nNodes expanded: {len(result.expanded)}"
+                )
+            else:
+                QMessageBox.information(self, "Bidirectional Result", "None of the goal nodes are reachable from the starting node.")
+
+        self.play_search(events, result, show_result)
+
     #####################
     # This is the A* Algorithm with multiple goal support and alphabetical tie-breaking
     def perform_astar(self):
-       """Performs A* Search on the tree for multiple goals and visualizes the paths."""
-       if not self.tree_root:
-           return  # No tree to traverse
-   
-       # Get user input for the goal nodes
-       goal_nodes_input, ok = QInputDialog.getText(self, "Choose Goals", "Enter the characters of the goal nodes separated by commas:")
-   
-       if not ok or not goal_nodes_input:
-           return  # User canceled or entered empty input
-   
-       goal_node_chars = [char.strip() for char in goal_nodes_input.split(",") if char.strip()]
-       goal_nodes = [self.find_node(self.tree_root, char) for char in goal_node_chars]
-   
-       if any(node is None for node in goal_nodes):
-           QMessageBox.warning(self, "Error", "One or more goal nodes not found!")
-           return
-   
-       # Ask user whether to stop search after finding the first goal
-       stop_after_first, ok = QInputDialog.getItem(
-           self, "Search Mode",
-           "Stop search after finding:",
-           ["First goal", "All goals"],
-           editable=False
-       )
-   
-       if not ok:
-           return  # User canceled
-   
-       stop_after_first = stop_after_first == "First goal"
-   
-       # Priority queue and sets
-       open_set = []  # Priority queue: (f_score, id(node), node)
-       heapq.heappush(open_set, (0, id(self.tree_root), self.tree_root))
-   
-       closed_set = set()
-       came_from = {}
-       g_score = {self.tree_root: 0}  # Cost from start to node
-   
-       found_goals = set()
-       paths = {}
-   
-       def highlight_step():
-           """Inner function to visualize the next step."""
-           nonlocal found_goals
-   
-           if not open_set:
-               # No more nodes to process
-               if not found_goals:
-                   QMessageBox.information(self, "A* Result", "None of the goal nodes were found.")
-               else:
-                   # Visualize all paths after all goals are found
-                   for goal_char, path in paths.items():
-                       self.visualize_path(path)
-                       QMessageBox.information(self, "Goal Found", f"Goal: {goal_char}, Path: {' -> '.join(path)}")
-               return
-   
-           # Pop the node with the lowest f_score
-           current_f_score, _, current_node = heapq.heappop(open_set)
-   
-           # Skip this node if it's already expanded
-           if current_node in closed_set:
-               QTimer.singleShot(800, highlight_step)  # Continue to the next step
-               return
-   
-           # Highlight the current node
-           if current_node.char in self.node_graphics:
-               ellipse, _, _ = self.node_graphics[current_node.char]
-               ellipse.setBrush(QBrush(Qt.blue))  # Set the node color to blue
-               ellipse.update()  # Force the ellipse to refresh visually
-   
-           # Mark the node as expanded
-           closed_set.add(current_node)
-   
-           # Goal check
-           if current_node.char in goal_node_chars and current_node.char not in found_goals:
-               path = []
-               temp_node = current_node
-   
-               while temp_node:
-                   path.append(temp_node.char)
-                   temp_node = came_from.get(temp_node)
-   
-               path.reverse()
-               paths[current_node.char] = path
-   
-               # Add the goal to the found set
-               found_goals.add(current_node.char)
-   
-               if stop_after_first:
-                   # Visualize and show the path for the first goal found
-                   self.visualize_path(path)
-                   QMessageBox.information(self, "Goal Found", f"Goal: {current_node.char}, Path: {' -> '.join(path)}")
-                   return
-   
-               if len(found_goals) == len(goal_nodes):
-                   # Visualize all paths after all goals are found
-                   for goal_char, path in paths.items():
-                       self.visualize_path(path)
-                       QMessageBox.information(self, "Goal Found", f"Goal: {goal_char}, Path: {' -> '.join(path)}")
-                   return
-   
-           # Explore neighbors
-           for child in current_node.children:
-               tentative_g_score = g_score[current_node] + child.path_cost
-   
-               # Only consider this path if it's better
-               if tentative_g_score < g_score.get(child, float('inf')):
-                   came_from[child] = current_node
-                   g_score[child] = tentative_g_score
-                   f_score = tentative_g_score + child.heuristic
-   
-                   # Push the updated node into open_set with tie-breaking
-                   heapq.heappush(open_set, (f_score, id(child), child))
-   
-           # Sort the open_set by f_score and break ties alphabetically by node.char
-           open_set.sort(key=lambda x: (x[0], x[2].char))
-   
-           # Continue to the next step
-           QTimer.singleShot(800, highlight_step)  # 800ms delay between steps
-
-      # Start the visualization
-       highlight_step()
-                     
-    ##################################################
-    def perform_ucs(self):
-            """Perform Uniform Cost Search (UCS) on the tree."""
-            goals_input = simpledialog.askstring("Input", "Enter the goal nodes (comma-separated)")
-            if not goals_input:
-                QMessageBox.warning(self, "Error", "Please enter at least one goal node.")
+        """Performs A* Search on the tree for multiple goals and visualizes the paths."""
+        if not self.tree_root:
+            return  # No tree to traverse
+
+        # Get user input for the goal nodes
+        goal_nodes_input, ok = QInputDialog.getText(self, "Choose Goals", "Enter the characters of the goal nodes separated by commas:")
+
+        if not ok or not goal_nodes_input:
+            return  # User canceled or entered empty input
+
+        goal_node_chars = [char.strip() for char in goal_nodes_input.split(",") if char.strip()]
+        goal_nodes = [self.find_node(char) for char in goal_node_chars]
+
+        if any(node is None for node in goal_nodes):
+            QMessageBox.warning(self, "Error", "One or more goal nodes not found!")
+            return
+
+        # Ask user whether to stop search after finding the first goal
+        find_all = self.ask_find_all(goal_node_chars)
+        if find_all is None:
+            return  # User canceled
+
+        result, events = self.query_cache.search(
+            "A*", None, goal_node_chars, {"find_all": find_all},
+            lambda on_event: search_engine.astar(self.tree_root, goal_node_chars, find_all, on_event=on_event)
+        )
+
+        def show_result():
+            if not result.found:
+                QMessageBox.information(self, "A* Result", "None of the goal nodes were found.")
                 return
-            
-            goals = [goal.strip() for goal in goals_input.split(',')]
+            self.show_all_goals("Goal Found", result)
+
+        self.play_search(events, result, show_result)
+
+    def ask_goal_chars(self):
+        """Asks for comma-separated goal chars; returns None on cancel or an unknown goal."""
+        goal_nodes_input, ok = QInputDialog.getText(self, "Choose Goals", "Enter the characters of the goal nodes separated by commas:")
+        if not ok or not goal_nodes_input:
+            return None  # User canceled or entered empty input
+
+        goal_node_chars = [char.strip() for char in goal_nodes_input.split(",") if char.strip()]
+        if any(self.find_node(char) is None for char in goal_node_chars):
+            QMessageBox.warning(self, "Error", "One or more goal nodes not found!")
+            return None
+        return goal_node_chars
+
+    def memory_summary(self, result, goal_node_chars):
+        """Describes the peak frontier of a memory-bounded search next to plain A*."""
+        astar_result, _ = self.query_cache.search(
+            "A*", None, goal_node_chars, {"find_all": False},
+            lambda on_event: search_engine.astar(self.tree_root, goal_node_chars, on_event=on_event)
+        )
+        return (f"Peak frontier: {result.peak_frontier} nodes ({len(result.expanded)} expansions)\n"
+                f"A* peak frontier: {astar_result.peak_frontier} nodes ({len(astar_result.expanded)} expansions)")
+
+    def perform_ida_star(self):
+        """Performs Iterative Deepening A* and compares its memory use with A*."""
+        if not self.tree_root:
+            return  # No tree to traverse
 
-            if self.tree_root is None:
-                QMessageBox.warning(self, "Error", "The tree is empty.")
+        goal_node_chars = self.ask_goal_chars()
+        if goal_node_chars is None:
+            return
+
+        result, events = self.query_cache.search(
+            "IDA*", None, goal_node_chars, {},
+            lambda on_event: search_engine.ida_star(self.tree_root, goal_node_chars, on_event=on_event)
+        )
+
+        def show_result():
+            summary = self.memory_summary(result, goal_node_chars)
+            if not result.found:
+                QMessageBox.information(self, "IDA* Result", f"None of the goal nodes were found.\n\n{summary}")
                 return
+            QMessageBox.information(self, "IDA* Result",
+                                    f"Path to '{result.goal}': {' -> '.join(result.path)} with total cost {result.cost}\n"
+                                    f"f-cost bounds tried: {len(result.iterations)}\n\n{summary}")
 
-            for goal in goals:
-                if goal not in self.node_positions:
-                    QMessageBox.warning(self, "Error", f"Goal node '{goal}' does not exist in the tree.")
-                    return
+        self.play_search(events, result, show_result)
 
-            priority_queue = []
-            heapq.heappush(priority_queue, (0, self.tree_root.char, self.tree_root, [self.tree_root.char]))
-            visited = set()
+    def perform_sma_star(self):
+        """Performs SMA* with a user-chosen node budget and compares its memory use with A*."""
+        if not self.tree_root:
+            return  # No tree to traverse
 
-            while priority_queue:
-                total_cost, _, current_node, path = heapq.heappop(priority_queue)
+        goal_node_chars = self.ask_goal_chars()
+        if goal_node_chars is None:
+            return
 
-                if current_node.char in visited:
-                    continue
+        max_nodes, ok = QInputDialog.getInt(self, "Node Budget", "Maximum number of nodes SMA* may keep in memory:", value=100, min=2)
+        if not ok:
+            return
 
-                visited.add(current_node.char)
+        result, events = self.query_cache.search(
+            "SMA*", None, goal_node_chars, {"max_nodes": max_nodes},
+            lambda on_event: search_engine.sma_star(self.tree_root, goal_node_chars, max_nodes, on_event=on_event)
+        )
 
-                if current_node.char in self.node_graphics:
-                    ellipse, _, _ = self.node_graphics[current_node.char]
-                    ellipse.setBrush(QBrush(Qt.blue))
-                    QApplication.processEvents()
-                    time.sleep(0.5)
+        def show_result():
+            summary = self.memory_summary(result, goal_node_chars)
+            if not result.found:
+                QMessageBox.information(self, "SMA* Result", f"No goal path fits in a budget of {max_nodes} nodes.\n\n{summary}")
+                return
+            QMessageBox.information(self, "SMA* Result",
+                                    f"Path to '{result.goal}': {' -> '.join(result.path)} with total cost {result.cost}\n\n{summary}")
 
-                if current_node.char in goals:
-                    QMessageBox.information(self, "Result", f"Path to reach '{current_node.char}' (using UCS): {' -> '.join(path)} with total cost {total_cost}")
-                    self.visualize_path(path)
-                    return
+        self.play_search(events, result, show_result)
 
-                for child in current_node.children:
-                    if child.char not in visited:
-                        new_total_cost = total_cost + child.path_cost
-                        heapq.heappush(priority_queue, (new_total_cost, child.char, child, path + [child.char]))
+    def analyze_heuristic(self):
+        """Checks every heuristic against the true cost to the chosen goals and marks the offenders.
 
-            QMessageBox.information(self, "Result", "None of the goal nodes are reachable.")
+        Inadmissible nodes turn red and inconsistent edges orange; "Reset
+        Algorithm" clears the marks.
+        """
+        if not self.tree_root:
+            return  # No tree to analyze
 
+        goal_node_chars = self.ask_goal_chars()
+        if goal_node_chars is None:
+            return
 
+        self.animator.cancel()
+        report = search_engine.heuristic_report(self.tree_root, goal_node_chars)
+        for char, _, _ in report["inadmissible"]:
+            if char in self.node_graphics:  # Nodes added inside a collapsed subtree are not drawn yet
+                ellipse, _, _ = self.node_graphics[char]
+                ellipse.setBrush(QBrush(Qt.red))
+        for parent_char, child_char, _, _, _ in report["inconsistent"]:
+            key = self.edge_key(parent_char, child_char)
+            if key is not None:
+                line, _ = self.edge_graphics[key]
+                line.setPen(QPen(QColor(255, 140, 0), 4))
+        self.schedule_overview()
+
+        def listing(items, limit=8):
+            return ", ".join(items[:limit]) + (f" and {len(items) - limit} more" if len(items) > limit else "")
+
+        lines = []
+        if report["admissible"]:
+            lines.append("Admissible: every h is at most the true cost to a goal.")
+        else:
+            lines.append("Inadmissible nodes (h > h*): " + listing(
+                [f"{char} (h={h}, h*={true_cost})" for char, h, true_cost in report["inadmissible"]]))
+        if report["consistent"]:
+            lines.append("Consistent: h(parent) <= cost + h(child) on every edge.")
+        else:
+            lines.append("Inconsistent edges (h(parent) > cost + h(child)): " + listing(
+                [f"{parent} -> {child} ({h_parent} > {cost} + {h_child})"
+                 for parent, child, h_parent, cost, h_child in report["inconsistent"]]))
+        if report["mean_accuracy"] is not None:
+            lines.append(f"Mean h / h*: {report['mean_accuracy']:.2f}")
+
+        for name, label in (("A*", "A*"), ("UCS", "UCS (no heuristic)")):
+            stats = report[name]
+            if stats["effective_branching_factor"] is not None:
+                lines.append(f"{label}: {stats['expanded']} expansions, effective branching factor {stats['effective_branching_factor']:.2f}")
+            else:
+                lines.append(f"{label}: {stats['expanded']} expansions")
+        if report["optimal_cost"] is None:
+            lines.append("No goal is reachable from the root.")
+        elif not report["astar_optimal"]:
+            lines.append(f"A* returned cost {report['A*']['cost']}, but the optimal cost is {report['optimal_cost']}.")
+
+        QMessageBox.information(self, "Heuristic Analysis", "\n".join(lines))
 
+    ##################################################
+    def perform_ucs(self):
+        """Perform Uniform Cost Search (UCS) on the tree."""
+        goals_input = simpledialog.askstring("Input", "Enter the goal nodes (comma-separated)")
+        if not goals_input:
+            QMessageBox.warning(self, "Error", "Please enter at least one goal node.")
+            return
+
+        goals = [goal.strip() for goal in goals_input.split(',')]
+
+        if self.tree_root is None:
+            QMessageBox.warning(self, "Error", "The tree is empty.")
+            return
+
+        for goal in goals:
+            if goal not in self.nodes:
+                QMessageBox.warning(self, "Error", f"Goal node '{goal}' does not exist in the tree.")
+                return
+
+        find_all = self.ask_find_all(goals)
+        if find_all is None:
+            return  # User canceled
+
+        if self.shortest_paths is not None:
+            # Answered from the precomputed table: nothing is expanded, only the path is shown
+            result, events = self.shortest_paths.query(goals, find_all), []
+        else:
+            result, events = self.query_cache.search(
+                "UCS", None, goals, {"find_all": find_all},
+                lambda on_event: search_engine.ucs(self.tree_root, goals, find_all, on_event=on_event)
+            )
+
+        def show_result():
+            if find_all and result.found:
+                self.show_all_goals("Result", result)
+            elif result.found:
+                QMessageBox.information(self, "Result", f"Path to reach '{result.goal}' (using UCS): {' -> '.join(result.path)} with total cost {result.cost}")
+            else:
+                QMessageBox.information(self, "Result", "None of the goal nodes are reachable.")
 
+        self.play_search(events, result, show_result)
 
 
 if __name__ == "__main__":
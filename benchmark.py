@@ -0,0 +1,230 @@
+"""Headless benchmark harness for the search algorithms.
+
+Generates synthetic trees and graphs with a controlled branching factor, depth,
+edge-cost distribution and heuristic quality, runs DFS, Limited DFS, IDDFS,
+BFS, UCS, Greedy and A* on each instance and writes one machine-readable row
+per (instance, algorithm) pair. IDDFS is the standard O(depth)-memory driver;
+"IDDFS (reuse)" is its frontier-reusing mode, which holds a whole level like
+BFS, reported separately so the two memory profiles are not mixed up:
+
+    python benchmark.py --shape tree --branching 2 3 --depth 10 --heuristic 0.5 1.0
+
+Every list-valued option is swept as a cartesian product. Wall time is the
+best of ``--repeat`` untraced runs; peak memory comes from one extra run under
+tracemalloc so tracing never distorts the timings. Optimality is judged
+against the true cheapest cost from a reverse Dijkstra pass.
+"""
+import argparse
+import csv
+import itertools
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import search_engine
+from search_engine import Node
+
+
+# Edge-cost distributions; every cost is positive
+COST_DISTRIBUTIONS = {
+    "unit": lambda rng: 1,
+    "uniform": lambda rng: rng.randint(1, 10),
+    "exponential": lambda rng: round(rng.expovariate(0.2), 2) + 0.01,
+    "bimodal": lambda rng: 1 if rng.random() < 0.8 else 50,
+}
+
+ALGORITHMS = {
+    "DFS": lambda root, goals, depth: search_engine.dfs(root, goals),
+    "Limited DFS": lambda root, goals, depth: search_engine.limited_dfs(root, goals, depth),
+    "IDDFS": lambda root, goals, depth: search_engine.iterative_deepening(root, goals),
+    "IDDFS (reuse)": lambda root, goals, depth: search_engine.iterative_deepening(root, goals, reuse_frontier=True),
+    "BFS": lambda root, goals, depth: search_engine.bfs(root, goals),
+    "UCS": lambda root, goals, depth: search_engine.ucs(root, goals),
+    "Greedy": lambda root, goals, depth: search_engine.greedy(root, goals),
+    "A*": lambda root, goals, depth: search_engine.astar(root, goals),
+}
+
+MAX_NODES = 2_000_000  # Refuse instances that would not fit in memory comfortably
+
+
+def generate_tree(branching, depth, costs="uniform", seed=0):
+    """Builds a full tree with branching children per node; returns (root, levels) with the nodes of each depth."""
+    if branching < 1 or depth < 0:
+        raise ValueError("A tree needs branching >= 1 and depth >= 0")
+    size = depth + 1 if branching == 1 else (branching ** (depth + 1) - 1) // (branching - 1)
+    if size > MAX_NODES:
+        raise ValueError(f"A tree with branching {branching} and depth {depth} has {size} nodes (limit {MAX_NODES})")
+
+    rng = random.Random(seed)
+    cost = COST_DISTRIBUTIONS[costs]
+    counter = itertools.count()
+    root = Node(f"n{next(counter)}", 0)
+    levels = [[root]]
+    for _ in range(depth):
+        level = []
+        for parent in levels[-1]:
+            for _ in range(branching):
+                child = Node(f"n{next(counter)}", 0)
+                parent.add_edge(child, cost(rng))
+                level.append(child)
+        levels.append(level)
+    return root, levels
+
+
+def generate_graph(width, branching, depth, costs="uniform", back_edges=0.0, seed=0):
+    """Builds a layered graph of depth + 1 layers with width nodes each (one root on top).
+
+    Every node links to branching random nodes on the next layer, so nodes
+    are shared by several parents, and each node gets an extra edge back to a
+    random earlier layer with probability back_edges, which adds cycles.
+    Returns (root, levels).
+    """
+    if width < 1 or branching < 1 or depth < 0:
+        raise ValueError("A graph needs width >= 1, branching >= 1 and depth >= 0")
+    if width * depth + 1 > MAX_NODES:
+        raise ValueError(f"A graph of {width * depth + 1} nodes is over the limit of {MAX_NODES}")
+
+    rng = random.Random(seed)
+    cost = COST_DISTRIBUTIONS[costs]
+    counter = itertools.count()
+    root = Node(f"n{next(counter)}", 0)
+    levels = [[root]]
+    for _ in range(depth):
+        level = [Node(f"n{next(counter)}", 0) for _ in range(width)]
+        parents = levels[-1]
+        # Give every node one parent first so the whole graph is reachable
+        for child in level:
+            rng.choice(parents).add_edge(child, cost(rng))
+        for parent in parents:
+            for child in rng.sample(level, min(branching, width)):
+                if child not in parent.edge_costs:
+                    parent.add_edge(child, cost(rng))
+        levels.append(level)
+
+    for depth_index, level in enumerate(levels[1:], start=1):
+        for node in level:
+            if rng.random() < back_edges:
+                target = rng.choice(levels[rng.randrange(depth_index)])
+                if target not in node.edge_costs:
+                    node.add_edge(target, cost(rng))
+    return root, levels
+
+
+def assign_heuristics(nodes, goal_nodes, quality):
+    """Sets h = quality * h* on every node and returns h*, the true cost-to-goal map.
+
+    quality 1 is the perfect heuristic, 0 is no heuristic at all, and values
+    above 1 overestimate (inadmissible). Nodes that cannot reach a goal get
+    the largest finite estimate.
+    """
+    true_cost = search_engine.cost_to_goal(goal_nodes)
+    dead_end = max(true_cost.values(), default=0)
+    for node in nodes:
+        node.heuristic = quality * true_cost.get(node, dead_end)
+    return true_cost
+
+
+def measure(run, repeat):
+    """Returns (result, best wall time in seconds, peak traced memory in bytes) for run()."""
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, peak_memory
+
+
+def run_benchmark(shape="tree", branching=2, depth=8, width=100, costs="uniform", heuristic=1.0,
+                  back_edges=0.0, goals=1, seed=0, repeat=3, algorithms=None):
+    """Benchmarks one synthetic instance and yields one result row per algorithm."""
+    if shape == "tree":
+        root, levels = generate_tree(branching, depth, costs, seed)
+    else:
+        root, levels = generate_graph(width, branching, depth, costs, back_edges, seed)
+    nodes = [node for level in levels for node in level]
+
+    # Goals sit on the deepest layer so every algorithm has to search the whole depth
+    goal_nodes = random.Random(seed).sample(levels[-1], min(goals, len(levels[-1])))
+    goal_chars = [goal.char for goal in goal_nodes]
+    true_cost = assign_heuristics(nodes, goal_nodes, heuristic)
+    optimal_cost = true_cost.get(root)
+
+    instance = {
+        "shape": shape,
+        "branching": branching,
+        "depth": depth,
+        "width": width if shape == "graph" else None,
+        "nodes": len(nodes),
+        "edges": sum(len(node.children) for node in nodes),
+        "costs": costs,
+        "heuristic_quality": heuristic,
+        "seed": seed,
+        "goals": len(goal_chars),
+        "optimal_cost": optimal_cost,
+    }
+    for name in algorithms or ALGORITHMS:
+        search = ALGORITHMS[name]
+        result, wall_time, peak_memory = measure(lambda: search(root, goal_chars, depth), repeat)
+        yield dict(instance, **{
+            "algorithm": name,
+            "found": result.found,
+            "cost": result.cost if result.found else None,
+            "optimal": result.found and optimal_cost is not None and result.cost <= optimal_cost + 1e-9,
+            "path_length": len(result.path),
+            "expanded": len(result.expanded),
+            "peak_frontier": result.peak_frontier,
+            "wall_time_s": wall_time,
+            "peak_memory_bytes": peak_memory,
+        })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms on synthetic trees and graphs.")
+    parser.add_argument("--shape", nargs="+", choices=["tree", "graph"], default=["tree"])
+    parser.add_argument("--branching", nargs="+", type=int, default=[2])
+    parser.add_argument("--depth", nargs="+", type=int, default=[8])
+    parser.add_argument("--width", nargs="+", type=int, default=[100], help="nodes per layer of a graph")
+    parser.add_argument("--costs", nargs="+", choices=sorted(COST_DISTRIBUTIONS), default=["uniform"])
+    parser.add_argument("--heuristic", nargs="+", type=float, default=[1.0], help="heuristic quality: h = quality * h*")
+    parser.add_argument("--back-edges", nargs="+", type=float, default=[0.0], help="probability of a cycle-making edge per graph node")
+    parser.add_argument("--goals", type=int, default=1, help="goal nodes drawn from the deepest layer")
+    parser.add_argument("--seed", nargs="+", type=int, default=[0])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per algorithm; the best is reported")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--output", help="file to write instead of stdout")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = None
+        for shape, branching, depth, width, costs, heuristic, back_edges, seed in itertools.product(
+                args.shape, args.branching, args.depth, args.width, args.costs, args.heuristic, args.back_edges, args.seed):
+            if shape == "tree" and (width, back_edges) != (args.width[0], args.back_edges[0]):
+                continue  # Graph-only options do not change a tree
+            for row in run_benchmark(shape, branching, depth, width, costs, heuristic, back_edges,
+                                     args.goals, seed, args.repeat, args.algorithms):
+                if args.format == "jsonl":
+                    out.write(json.dumps(row) + "\n")
+                else:
+                    if writer is None:
+                        writer = csv.DictWriter(out, fieldnames=list(row))
+                        writer.writeheader()
+                    writer.writerow(row)
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Compact, array-backed graph for headless search over large trees.
+
+Nodes get integer ids in breadth-first order. Children are stored CSR-style:
+the children of node ``i`` are ``targets[offsets[i]:offsets[i + 1]]`` and the
+matching edge costs are ``edge_costs[offsets[i]:offsets[i + 1]]``. The columns
+live in flat ``array`` buffers, so each node costs a few dozen bytes instead of
+a full Node object. NumPy is optional; when it is installed, ``numpy_columns``
+exposes zero-copy views of the buffers for vectorized work.
+"""
+from array import array
+from collections import deque
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+from search_engine import SearchResult
+
+
+class CompactGraph:
+    """Read-only CSR representation of a Node graph."""
+
+    def __init__(self, chars, heuristics, offsets, targets, edge_costs):
+        self.chars = chars  # node id -> char
+        self.index = {char: node_id for node_id, char in enumerate(chars)}
+        self.heuristics = heuristics  # array('d'), one value per node
+        self.offsets = offsets  # array('q'), len(chars) + 1 entries
+        self.targets = targets  # array('q'), child ids for every node back to back
+        self.edge_costs = edge_costs  # array('d'), cost of each edge in targets
+        self.path_costs = None  # array('d') of the nodes' own path costs, when kept
+
+    @classmethod
+    def from_tree(cls, root, path_costs=False):
+        """Converts the Node graph reachable from root; shared nodes and cycles get one id per node.
+
+        Ids are assigned in breadth-first order, so the root is id 0. With
+        path_costs the nodes' own path costs are kept in ``graph.path_costs``.
+        """
+        chars = []
+        index = {}
+        heuristics = array('d')
+        costs = array('d')
+        offsets = array('q', [0])
+        targets = array('q')
+        edge_costs = array('d')
+
+        def node_id(node):
+            """Returns the id of node, assigning the next one on first sight."""
+            if node.char not in index:
+                index[node.char] = len(chars)
+                chars.append(node.char)
+                heuristics.append(node.heuristic)
+                costs.append(node.path_cost)
+                queue.append(node)
+            return index[node.char]
+
+        queue = deque()
+        if root is not None:
+            node_id(root)
+        while queue:
+            node = queue.popleft()
+            for child in node.children:
+                targets.append(node_id(child))
+                edge_costs.append(node.cost_to(child))
+            offsets.append(len(targets))
+
+        graph = cls(chars, heuristics, offsets, targets, edge_costs)
+        if path_costs:
+            graph.path_costs = costs
+        return graph
+
+    def __len__(self):
+        return len(self.chars)
+
+    def children(self, node_id):
+        """Returns the child ids of node_id."""
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def nbytes(self):
+        """Bytes held by the numeric buffers."""
+        return sum(column.itemsize * len(column) for column in (self.heuristics, self.offsets, self.targets, self.edge_costs))
+
+    def numpy_columns(self):
+        """Returns zero-copy NumPy views of the heuristic, offset, target and edge-cost buffers."""
+        if np is None:
+            raise ImportError("numpy_columns requires NumPy (pip install numpy)")
+        return {
+            "heuristics": np.frombuffer(self.heuristics, dtype=np.float64),
+            "offsets": np.frombuffer(self.offsets, dtype=np.int64),
+            "targets": np.frombuffer(self.targets, dtype=np.int64),
+            "edge_costs": np.frombuffer(self.edge_costs, dtype=np.float64),
+        }
+
+    def set_heuristics(self, values):
+        """Replaces the whole heuristic column, e.g. with a vectorized NumPy result."""
+        if len(values) != len(self.chars):
+            raise ValueError(f"Expected {len(self.chars)} heuristic values, got {len(values)}")
+        if np is not None and isinstance(values, np.ndarray):
+            self.heuristics = array('d', values.astype(np.float64).tobytes())
+        else:
+            self.heuristics = array('d', values)
+
+    def _path(self, came_from, node_id):
+        """Follows came_from links back to the start and returns the chars in order."""
+        path = []
+        while node_id is not None:
+            path.append(self.chars[node_id])
+            node_id = came_from[node_id]
+        path.reverse()
+        return path
+
+
+def _start_id(graph, start):
+    """Maps a start char to its node id, defaulting to the root."""
+    if start is None:
+        return 0 if len(graph) else None
+    return graph.index.get(start)
+
+
+def ucs(graph, goals, start=None, find_all=False):
+    """Uniform Cost Search on a CompactGraph; same ordering as search_engine.ucs."""
+    result = SearchResult("UCS")
+    start_id = _start_id(graph, start)
+    if start_id is None:
+        return result
+
+    goals = set(goals)
+    chars, offsets, targets, edge_costs = graph.chars, graph.offsets, graph.targets, graph.edge_costs
+    came_from = {start_id: None}
+    best_cost = {start_id: 0}
+    visited = set()
+    priority_queue = [(0, chars[start_id], start_id)]
+
+    while priority_queue:
+        total_cost, char, node_id = heapq.heappop(priority_queue)
+        if node_id in visited or total_cost > best_cost[node_id]:
+            continue  # Stale entry left behind by a cheaper push
+
+        visited.add(node_id)
+        result.expanded.append(char)
+
+        if char in goals:
+            result.record_goal(char, graph._path(came_from, node_id), total_cost)
+            if not find_all or len(result.goals) == len(goals):
+                return result
+
+        for edge in range(offsets[node_id], offsets[node_id + 1]):
+            child_id = targets[edge]
+            if child_id in visited:
+                continue
+            new_total_cost = total_cost + edge_costs[edge]
+            # Like PriorityFrontier, only a strictly cheaper path replaces the queued one
+            if new_total_cost < best_cost.get(child_id, float('inf')):
+                came_from[child_id] = node_id
+                best_cost[child_id] = new_total_cost
+                heapq.heappush(priority_queue, (new_total_cost, chars[child_id], child_id))
+
+    return result
+
+
+def astar(graph, goals, start=None, find_all=False):
+    """A* search on a CompactGraph using f = g + heuristic; same ordering as search_engine.astar."""
+    result = SearchResult("A*")
+    start_id = _start_id(graph, start)
+    if start_id is None:
+        return result
+
+    goals = set(goals)
+    chars, offsets, targets = graph.chars, graph.offsets, graph.targets
+    heuristics, edge_costs = graph.heuristics, graph.edge_costs
+    came_from = {start_id: None}
+    g_score = {start_id: 0}
+    closed_set = set()
+    open_set = [(heuristics[start_id], 0, chars[start_id], start_id)]  # (f, g, char, id)
+
+    while open_set:
+        _, g, char, node_id = heapq.heappop(open_set)
+        if node_id in closed_set or g > g_score[node_id]:
+            continue  # Stale entry left behind by a cheaper push
+
+        closed_set.add(node_id)
+        result.expanded.append(char)
+
+        if char in goals:
+            result.record_goal(char, graph._path(came_from, node_id), g)
+            if not find_all or len(result.goals) == len(goals):
+                return result
+
+        for edge in range(offsets[node_id], offsets[node_id + 1]):
+            child_id = targets[edge]
+            if child_id in closed_set:
+                continue  # Expanded nodes are never reopened, as in search_engine.astar
+            tentative_g_score = g + edge_costs[edge]
+            if tentative_g_score < g_score.get(child_id, float('inf')):
+                came_from[child_id] = node_id
+                g_score[child_id] = tentative_g_score
+                heapq.heappush(open_set, (tentative_g_score + heuristics[child_id], tentative_g_score, chars[child_id], child_id))
+
+    return result
@@ -0,0 +1,327 @@
+"""Persistent binary storage of a Node graph, memory-mapped on load.
+
+A graph file holds the same CSR columns as a CompactGraph, plus path costs,
+layout parents and optional layout positions. Every column is a fixed-width
+little-endian array at an 8-byte aligned offset, so ``MappedGraph`` opens a
+file by mapping it and casting slices of the mapping into typed views:
+nothing is parsed or copied up front, and a graph with millions of nodes
+opens in constant time. Pages are read from disk only as a search touches
+them, and processes that map the same file share them.
+
+Layout (n nodes, m edges)::
+
+    header          magic, version, flags, n, m, char bytes
+    heuristics      float64[n]
+    path_costs      float64[n]
+    offsets         int64[n + 1]    children of i: targets[offsets[i]:offsets[i + 1]]
+    targets         int64[m]
+    edge_costs      float64[m]
+    layout_parents  int64[n]        -1 for the root
+    char_offsets    int64[n + 1]    char of i: chars[char_offsets[i]:char_offsets[i + 1]]
+    char_order      int64[n]        node ids sorted by UTF-8 char, for lookups
+    positions       float64[2 * n]  x, y pairs; only when FLAG_POSITIONS is set
+    chars           UTF-8 bytes
+
+Node ids are assigned in breadth-first order from the root, so the root is
+id 0. A MappedGraph is a CompactGraph, so compact_graph.ucs, compact_graph.astar
+and parallel_search.search_many run on it directly; ``load_graph`` builds the
+Node objects the GUI needs.
+"""
+from array import array
+from collections.abc import Sequence
+import mmap
+import struct
+import sys
+
+from compact_graph import CompactGraph
+from search_engine import Node
+
+
+MAGIC = b"AIGR"
+VERSION = 1
+FLAG_POSITIONS = 1
+EXTENSION = ".aigraph"
+
+_HEADER = struct.Struct("<4sHHqqq")  # magic, version, flags, nodes, edges, char bytes
+_NEEDS_SWAP = sys.byteorder != "little"
+
+
+def _sections(node_count, edge_count, flags):
+    """Returns {name: (offset, count, typecode)} for every column, and where the char bytes start."""
+    sections = {}
+    offset = _HEADER.size
+    columns = [
+        ("heuristics", node_count, 'd'),
+        ("path_costs", node_count, 'd'),
+        ("offsets", node_count + 1, 'q'),
+        ("targets", edge_count, 'q'),
+        ("edge_costs", edge_count, 'd'),
+        ("layout_parents", node_count, 'q'),
+        ("char_offsets", node_count + 1, 'q'),
+        ("char_order", node_count, 'q'),
+    ]
+    if flags & FLAG_POSITIONS:
+        columns.append(("positions", 2 * node_count, 'd'))
+    for name, count, typecode in columns:
+        sections[name] = (offset, count, typecode)
+        offset += 8 * count  # Both typecodes are 8 bytes wide, so every column stays aligned
+    return sections, offset
+
+
+def _write_column(file, typecode, values):
+    """Writes values as a little-endian column of typecode."""
+    column = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+    if _NEEDS_SWAP:
+        column = array(typecode, column)
+        column.byteswap()
+    file.write(column)
+
+
+def save_compact(path, graph, path_costs=None, layout_parents=None, positions=None):
+    """Writes a CompactGraph to path.
+
+    path_costs and layout_parents are per-node columns (zeros and -1 when not
+    given); positions is a flat column of 2 * n floats, x and y per node.
+    """
+    node_count, edge_count = len(graph.chars), len(graph.targets)
+    encoded = [char.encode("utf-8") for char in graph.chars]
+    char_offsets = array('q', [0])
+    for data in encoded:
+        char_offsets.append(char_offsets[-1] + len(data))
+    char_order = sorted(range(node_count), key=encoded.__getitem__)
+    flags = FLAG_POSITIONS if positions is not None else 0
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, flags, node_count, edge_count, char_offsets[-1]))
+        _write_column(file, 'd', graph.heuristics)
+        _write_column(file, 'd', path_costs if path_costs is not None else array('d', bytes(8 * node_count)))
+        _write_column(file, 'q', graph.offsets)
+        _write_column(file, 'q', graph.targets)
+        _write_column(file, 'd', graph.edge_costs)
+        _write_column(file, 'q', layout_parents if layout_parents is not None else array('q', [-1]) * node_count)
+        _write_column(file, 'q', char_offsets)
+        _write_column(file, 'q', char_order)
+        if positions is not None:
+            if len(positions) != 2 * node_count:
+                raise ValueError(f"Expected {2 * node_count} position values, got {len(positions)}")
+            _write_column(file, 'd', positions)
+        file.write(b"".join(encoded))
+
+
+def save_graph(path, root, parent_nodes=None, positions=None):
+    """Writes the Node graph reachable from root to path.
+
+    parent_nodes maps each char to its layout parent Node (or None), and
+    positions maps chars to (x, y); both are optional. Every edge is stored
+    as a directed edge, so an undirected edge is stored as its two halves.
+    """
+    graph = CompactGraph.from_tree(root, path_costs=True)
+    chars, index = graph.chars, graph.index
+
+    layout_parents = array('q', [-1]) * len(chars)
+    for char, parent in (parent_nodes or {}).items():
+        if parent is not None and char in index and parent.char in index:
+            layout_parents[index[char]] = index[parent.char]
+
+    flat_positions = None
+    if positions:
+        flat_positions = array('d')
+        for char in chars:
+            x, y = positions.get(char, (0.0, 0.0))
+            flat_positions.extend((x, y))
+
+    save_compact(path, graph, graph.path_costs, layout_parents, flat_positions)
+
+
+class _CharColumn(Sequence):
+    """Node id -> char, decoded from the mapped UTF-8 bytes on access."""
+
+    def __init__(self, char_offsets, data):
+        self._offsets = char_offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, node_id):
+        return self.encoded(node_id).decode("utf-8")
+
+    def encoded(self, node_id):
+        """The UTF-8 bytes of node_id's char."""
+        if not 0 <= node_id < len(self._offsets) - 1:
+            raise IndexError(node_id)
+        return bytes(self._data[self._offsets[node_id]:self._offsets[node_id + 1]])
+
+
+class _CharIndex:
+    """Char -> node id by binary search over the stored sort order, without building a dict."""
+
+    def __init__(self, chars, char_order):
+        self._chars = chars
+        self._order = char_order
+
+    def __len__(self):
+        return len(self._order)
+
+    def get(self, char, default=None):
+        key = char.encode("utf-8")
+        low, high = 0, len(self._order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._chars.encoded(self._order[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._order) and self._chars.encoded(self._order[low]) == key:
+            return self._order[low]
+        return default
+
+    def __contains__(self, char):
+        return self.get(char) is not None
+
+    def __getitem__(self, char):
+        node_id = self.get(char)
+        if node_id is None:
+            raise KeyError(char)
+        return node_id
+
+
+class MappedGraph(CompactGraph):
+    """A CompactGraph whose columns are zero-copy views of a memory-mapped graph file.
+
+    Close it (or use it as a context manager) to release the mapping; the
+    column views must not be used afterwards.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        self._views = [buffer]
+        try:
+            self._map_columns(buffer)
+        except Exception:
+            self.close()
+            raise
+
+    def _map_columns(self, buffer):
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f"'{self.path}' is too short to be a graph file")
+        magic, version, flags, node_count, edge_count, char_bytes = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"'{self.path}' is not a graph file")
+        if version != VERSION:
+            raise ValueError(f"'{self.path}' has unsupported graph file version {version}")
+        sections, chars_start = _sections(node_count, edge_count, flags)
+        if min(node_count, edge_count, char_bytes) < 0 or len(buffer) != chars_start + char_bytes:
+            raise ValueError(f"'{self.path}' is truncated or corrupt")
+
+        columns = {}
+        for name, (offset, count, typecode) in sections.items():
+            view = buffer[offset:offset + 8 * count]
+            self._views.append(view)
+            if _NEEDS_SWAP:
+                column = array(typecode)  # Big-endian hosts pay for one swapped copy
+                column.frombytes(view)
+                column.byteswap()
+            else:
+                column = view.cast(typecode)
+                self._views.append(column)
+            columns[name] = column
+        data = buffer[chars_start:]
+        self._views.append(data)
+
+        self.chars = _CharColumn(columns["char_offsets"], data)
+        self.index = _CharIndex(self.chars, columns["char_order"])
+        self.heuristics = columns["heuristics"]
+        self.path_costs = columns["path_costs"]
+        self.offsets = columns["offsets"]
+        self.targets = columns["targets"]
+        self.edge_costs = columns["edge_costs"]
+        self.layout_parents = columns["layout_parents"]
+        self.positions = columns.get("positions")  # x, y pairs per node, or None
+
+    def validate(self):
+        """Checks every stored offset and node id against the column sizes; raises ValueError if one is out of range.
+
+        Opening a file only checks its header and size, so this O(n + m) pass is
+        what stands between a corrupt file and an IndexError deep inside a
+        search. load_graph always runs it.
+        """
+        node_count, edge_count = len(self.heuristics), len(self.targets)
+
+        def check(valid, problem):
+            if not valid:
+                raise ValueError(f"'{self.path}' is corrupt: {problem}")
+
+        def ascending(column):
+            return all(low <= high for low, high in zip(column, column[1:]))
+
+        check(self.offsets[0] == 0 and self.offsets[-1] == edge_count and ascending(self.offsets),
+              "edge offsets are out of range")
+        check(edge_count == 0 or 0 <= min(self.targets) and max(self.targets) < node_count,
+              "an edge target is out of range")
+        check(node_count == 0 or -1 <= min(self.layout_parents) and max(self.layout_parents) < node_count,
+              "a layout parent is out of range")
+        char_offsets = self.chars._offsets
+        check(char_offsets[0] == 0 and char_offsets[-1] == len(self.chars._data) and ascending(char_offsets),
+              "char offsets are out of range")
+        order = self.index._order
+        check(node_count == 0 or 0 <= min(order) and max(order) < node_count, "the char order is out of range")
+        # Strictly ascending keys make the order a permutation and the chars unique
+        keys = [self.chars.encoded(node_id) for node_id in order]
+        check(all(low < high for low, high in zip(keys, keys[1:])), "chars are duplicated or out of order")
+
+    def __reduce__(self):
+        # Spawned pool workers map the file again instead of unpickling the columns
+        return (MappedGraph, (self.path,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Releases the column views and unmaps the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+
+def load_graph(path):
+    """Reads a graph file into Nodes; returns (root, nodes, parent_nodes, positions).
+
+    positions maps chars to (x, y), or is None when the file has none. Raises
+    ValueError for a file that is not a well-formed graph file.
+    """
+    with MappedGraph(path) as graph:
+        graph.validate()
+        chars = list(graph.chars)
+        heuristics, path_costs = graph.heuristics.tolist(), graph.path_costs.tolist()
+        node_list = [Node(char, heuristics[i], path_costs[i]) for i, char in enumerate(chars)]
+        offsets, targets, edge_costs = graph.offsets.tolist(), graph.targets.tolist(), graph.edge_costs.tolist()
+        for node_id, node in enumerate(node_list):
+            for edge in range(offsets[node_id], offsets[node_id + 1]):
+                node.add_edge(node_list[targets[edge]], edge_costs[edge])
+
+        # Ids are in breadth-first order, so the first edge into a node comes from its BFS parent,
+        # which stands in for a layout parent the file does not store
+        layout_parents = graph.layout_parents.tolist()
+        for node_id in range(len(node_list)):
+            for edge in range(offsets[node_id], offsets[node_id + 1]):
+                child_id = targets[edge]
+                if layout_parents[child_id] < 0 and child_id != 0:
+                    layout_parents[child_id] = node_id
+        parent_nodes = {}
+        for char, parent_id in zip(chars, layout_parents):
+            parent_nodes[char] = node_list[parent_id] if parent_id >= 0 else None
+        positions = None
+        if graph.positions is not None:
+            flat = graph.positions.tolist()
+            positions = {char: (flat[2 * i], flat[2 * i + 1]) for i, char in enumerate(chars)}
+
+    nodes = {node.char: node for node in node_list}
+    return (node_list[0] if node_list else None), nodes, parent_nodes, positions
@@ -0,0 +1,120 @@
+"""Parallel batch search over a process pool sharing one read-only graph.
+
+The graph is converted once to a CompactGraph and handed to every worker
+through the pool initializer. With the ``fork`` start method (Linux) the
+workers inherit it copy-on-write. Its ``array`` columns (heuristics, offsets,
+targets and edge costs) hold no reference counts, so their pages stay shared.
+Its ``chars`` list and ``index`` dict are ordinary Python objects, and every
+query touches their reference counts, so each worker ends up copying those
+pages. A graph_store.MappedGraph keeps the chars and their index in the
+mapped file as well, so workers share all of it. With ``spawn`` each worker
+unpickles the graph once rather than once per query. Queries are
+independent, so they spread over the workers with no coordination, and
+results come back in query order. By default a worker sends back only a QueryResult
+(goal, path, cost and number of expansions), so what crosses the process
+boundary does not grow with the size of the search; pass ``trace=True`` to
+get full SearchResults with their expansion order.
+
+UCS and A* follow the same ordering as search_engine.ucs and
+search_engine.astar (what the GUI's UCS and A* buttons run), so a batch
+returns the same paths, costs and expansion orders as running the queries one
+by one.
+"""
+import multiprocessing
+import os
+import sys
+
+import compact_graph
+from compact_graph import CompactGraph
+
+
+ALGORITHMS = {
+    "ucs": compact_graph.ucs,
+    "astar": compact_graph.astar,
+}
+
+_graph = None  # The worker's CompactGraph, set once by _init_worker
+
+
+class QueryResult:
+    """Outcome of one batch query without its expansion trace."""
+
+    __slots__ = ("algorithm", "goal", "path", "cost", "goals", "expansions")
+
+    def __init__(self, result):
+        self.algorithm = result.algorithm
+        self.goal = result.goal
+        self.path = result.path
+        self.cost = result.cost
+        self.goals = result.goals  # goal char -> (path, cost, expansion index)
+        self.expansions = len(result.expanded)
+
+    @property
+    def found(self):
+        """True when at least one goal was reached."""
+        return self.goal is not None
+
+    def __repr__(self):
+        return f"QueryResult({self.algorithm!r}, goal={self.goal!r}, path={self.path!r}, cost={self.cost!r})"
+
+
+def _init_worker(graph):
+    """Pool initializer: keeps the shared graph for every query this worker runs."""
+    global _graph
+    _graph = graph
+
+
+def _run(task):
+    """Runs one (algorithm, start, goals, find_all, trace) query on the worker's graph."""
+    algorithm, start, goals, find_all, trace = task
+    result = ALGORITHMS[algorithm](_graph, goals, start, find_all)
+    return result if trace else QueryResult(result)
+
+
+def _task(query, algorithm, find_all, trace):
+    """Normalizes a query given as (start, goals) or a dict into a task tuple."""
+    if isinstance(query, dict):
+        algorithm = query.get("algorithm", algorithm)
+        find_all = query.get("find_all", find_all)
+        start, goals = query.get("start"), query["goals"]
+    else:
+        start, goals = query
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}' (expected one of {', '.join(ALGORITHMS)})")
+    if isinstance(goals, str):
+        goals = [goals]
+    return algorithm, start, tuple(goals), bool(find_all), bool(trace)
+
+
+def search_many(graph, queries, algorithm="ucs", find_all=False, processes=None, chunksize=None, trace=False):
+    """Runs many independent searches in parallel and returns their results in query order.
+
+    graph is a CompactGraph or a root Node (converted once). Each query is a
+    (start char, goal chars) pair, where a start of None means the root, or a
+    dict with "start", "goals" and optionally "algorithm" and "find_all" to
+    override the defaults. processes defaults to the CPU count; with one
+    process the queries run in this process and no pool is started.
+
+    Results are QueryResults, or SearchResults with the full expansion order
+    when trace is set.
+    """
+    if not isinstance(graph, CompactGraph):
+        graph = CompactGraph.from_tree(graph)
+    tasks = [_task(query, algorithm, find_all, trace) for query in queries]
+    processes = processes or os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+
+    if processes <= 1:
+        _init_worker(graph)
+        try:
+            return [_run(task) for task in tasks]
+        finally:
+            _init_worker(None)
+
+    if chunksize is None:
+        # A few chunks per worker balance uneven queries without much pickling overhead
+        chunksize = max(1, len(tasks) // (processes * 4))
+    # Fork shares the buffers for free; elsewhere it is unsafe or missing, so use the default
+    context = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else None)
+    with context.Pool(processes, initializer=_init_worker, initargs=(graph,)) as pool:
+        return pool.map(_run, tasks, chunksize)
@@ -0,0 +1,71 @@
+"""LRU cache of search results and their event traces.
+
+Entries are keyed by (algorithm, start, goals, options, graph version). The
+owner of the graph calls ``bump()`` after every edit, so a result computed on
+an older graph is never returned. A cached entry keeps the full
+``on_event`` trace, so a repeated query can be animated again without
+searching.
+"""
+from collections import OrderedDict
+
+
+class QueryCache:
+    """Least-recently-used cache of (SearchResult, event trace) pairs."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.version = 0  # Graph version; bumped by every edit
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (SearchResult, tuple of events)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def bump(self):
+        """Records a graph edit; nothing cached before it can be returned again."""
+        self.version += 1
+        self._entries.clear()  # Keys of older versions can never match, so free them now
+
+    def clear(self):
+        """Drops every entry without changing the version."""
+        self._entries.clear()
+
+    def key(self, algorithm, start, goals, options=None):
+        """Builds the cache key for a query on the current graph version; goal order does not matter."""
+        return (algorithm, start, tuple(sorted(set(goals))), tuple(sorted((options or {}).items())), self.version)
+
+    def search(self, algorithm, start, goals, options, run):
+        """Returns (result, events) for a query, calling run(on_event) only on a miss.
+
+        events is a new list on every call, so the caller may extend it (for
+        example with path highlights) without touching the cached trace.
+        """
+        key = self.key(algorithm, start, goals, options)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            result, events = entry
+            return result, list(events)
+
+        self.misses += 1
+        events = []
+        result = run(lambda *event: events.append(event))
+        self._entries[key] = (result, tuple(events))
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)  # Evict the least recently used entry
+        return result, events
+
+    def replay(self, algorithm, start, goals, options=None, on_event=None):
+        """Feeds a cached trace to on_event again; returns the cached result, or None on a miss."""
+        key = self.key(algorithm, start, goals, options)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        result, events = entry
+        if on_event is not None:
+            for event in events:
+                on_event(*event)
+        return result
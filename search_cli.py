@@ -0,0 +1,189 @@
+"""Command-line batch runner for search queries, with no display needed.
+
+Loads a tree or graph file through tree_io, reads one query per line from a
+file or stdin and writes one JSON result per line:
+
+    python search_cli.py graph.csv queries.txt > results.jsonl
+    echo "astar A G,H" | python search_cli.py graph.json
+
+A query is either a JSON object such as
+``{"algorithm": "ucs", "start": "A", "goals": ["G"], "find_all": true}`` or a
+plain line ``algorithm start goal[,goal...] [option=value ...]``, where a start
+of ``-`` means the root. Blank lines and lines starting with ``#`` are
+skipped. Only search_engine and tree_io are imported, never Qt or tkinter, so
+the runner starts fast on headless servers and in cron jobs.
+"""
+import argparse
+import json
+import sys
+
+import search_engine
+import tree_io
+
+
+def _bool(value):
+    """Parses a boolean option given as text or JSON."""
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ("1", "true", "yes", "on"):
+        return True
+    if str(value).lower() in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"Expected true or false, got {value!r}")
+
+
+def _int_or_none(value):
+    """Parses an integer option where an empty value or "none" means unbounded."""
+    if value is None or str(value).lower() in ("", "none"):
+        return None
+    return int(value)
+
+
+# algorithm name -> (runner(start, goal_chars, nodes, options), {option: parser})
+ALGORITHMS = {
+    "dfs": (lambda start, goals, nodes, o: search_engine.dfs(start, goals, o["find_all"]),
+            {"find_all": _bool}),
+    "limited_dfs": (lambda start, goals, nodes, o: search_engine.limited_dfs(start, goals, o["depth_limit"], o["find_all"]),
+                    {"depth_limit": _int_or_none, "find_all": _bool}),
+    "iddfs": (lambda start, goals, nodes, o: search_engine.iterative_deepening(start, goals, o["max_depth"], o["find_all"]),
+              {"max_depth": _int_or_none, "find_all": _bool}),
+    "bfs": (lambda start, goals, nodes, o: search_engine.bfs(start, goals, o["find_all"]),
+            {"find_all": _bool}),
+    "ucs": (lambda start, goals, nodes, o: search_engine.ucs(start, goals, o["find_all"]),
+            {"find_all": _bool}),
+    "greedy": (lambda start, goals, nodes, o: search_engine.greedy(start, goals, o["find_all"]),
+               {"find_all": _bool}),
+    "astar": (lambda start, goals, nodes, o: search_engine.astar(start, goals, o["find_all"]),
+              {"find_all": _bool}),
+    "ida_star": (lambda start, goals, nodes, o: search_engine.ida_star(start, goals),
+                 {}),
+    "sma_star": (lambda start, goals, nodes, o: search_engine.sma_star(start, goals, o["max_nodes"]),
+                 {"max_nodes": int}),
+    "bidirectional": (lambda start, goals, nodes, o: search_engine.bidirectional_search(start, [nodes[goal] for goal in goals], o["weighted"]),
+                      {"weighted": _bool}),
+}
+
+DEFAULT_OPTIONS = {"find_all": False, "depth_limit": None, "max_depth": None, "max_nodes": 1000, "weighted": False}
+
+
+def parse_query(line):
+    """Parses a JSON or plain-text query line into a dict with algorithm, start, goals and options."""
+    line = line.strip()
+    if line.startswith("{"):
+        query = json.loads(line)
+        if not isinstance(query, dict):
+            raise ValueError("A JSON query must be an object")
+        goals = query.get("goals", [])
+        if isinstance(goals, str):
+            goals = goals.split(",")
+        options = {key: value for key, value in query.items() if key not in ("algorithm", "start", "goals")}
+        algorithm, start = query.get("algorithm"), query.get("start")
+    else:
+        fields = line.split()
+        if len(fields) < 3:
+            raise ValueError("Expected 'algorithm start goal[,goal...] [option=value ...]'")
+        algorithm, start, goals = fields[0], fields[1], fields[2].split(",")
+        options = {}
+        for field in fields[3:]:
+            key, separator, value = field.partition("=")
+            if not separator:
+                raise ValueError(f"Expected option=value, got {field!r}")
+            options[key] = value
+
+    if not algorithm:
+        raise ValueError("The query has no algorithm")
+    return {
+        "algorithm": str(algorithm).lower(),
+        "start": None if start in (None, "", "-") else str(start),
+        "goals": [str(goal).strip() for goal in goals if str(goal).strip()],
+        "options": options,
+    }
+
+
+def run_query(query, root, nodes):
+    """Runs one parsed query on the graph and returns its SearchResult."""
+    if query["algorithm"] not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{query['algorithm']}' (expected one of {', '.join(ALGORITHMS)})")
+    runner, parsers = ALGORITHMS[query["algorithm"]]
+
+    options = dict(DEFAULT_OPTIONS)
+    for key, value in query["options"].items():
+        if key not in parsers:
+            raise ValueError(f"Unknown option '{key}' for {query['algorithm']}")
+        options[key] = parsers[key](value)
+
+    start = root if query["start"] is None else nodes.get(query["start"])
+    if start is None:
+        raise ValueError(f"Start node '{query['start']}' does not exist")
+    if not query["goals"]:
+        raise ValueError("The query has no goals")
+    for goal in query["goals"]:
+        if goal not in nodes:
+            raise ValueError(f"Goal node '{goal}' does not exist")
+    return runner(start, query["goals"], nodes, options)
+
+
+def result_record(query, result, trace=False):
+    """Converts a query and its SearchResult into a JSON-ready dict."""
+    record = {
+        "algorithm": query["algorithm"],
+        "start": query["start"],
+        "goals": query["goals"],
+        "found": result.found,
+        "goal": result.goal,
+        "path": result.path,
+        "cost": result.cost,
+        "expanded": len(result.expanded),
+        "peak_frontier": result.peak_frontier,
+    }
+    if len(result.goals) > 1:
+        record["reached"] = {goal: {"path": path, "cost": cost, "expansion": index}
+                             for goal, (path, cost, index) in result.goals.items()}
+    if trace:
+        record["expansion_order"] = result.expanded
+    return record
+
+
+def run_batch(lines, root, nodes, out, trace=False):
+    """Answers every query line, writing one JSON line each; returns the number of failed queries."""
+    failures = 0
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            query = parse_query(line)
+            record = result_record(query, run_query(query, root, nodes), trace)
+        except (ValueError, TypeError) as error:  # json.JSONDecodeError is a ValueError too
+            failures += 1
+            record = {"line": line_number, "error": str(error)}
+        out.write(json.dumps(record) + "\n")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run search queries on a tree or graph file and print JSON lines.")
+    parser.add_argument("graph", help="CSV or JSON tree/graph file (see tree_io)")
+    parser.add_argument("queries", nargs="?", help="query file; stdin when omitted or '-'")
+    parser.add_argument("--output", help="file to write instead of stdout")
+    parser.add_argument("--trace", action="store_true", help="include the full expansion order in every result")
+    args = parser.parse_args(argv)
+
+    try:
+        root, nodes, _ = tree_io.load_tree(args.graph)
+    except (OSError, ValueError) as error:
+        parser.exit(2, f"{parser.prog}: cannot load {args.graph}: {error}\n")
+
+    queries = sys.stdin if args.queries in (None, "-") else open(args.queries, encoding="utf-8")
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        failures = run_batch(queries, root, nodes, out, args.trace)
+    finally:
+        if queries is not sys.stdin:
+            queries.close()
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1121 @@
+"""Headless search algorithms for the AI Search Module.
+
+Everything in this module works directly on the Node graph and never imports
+Qt, so searches can run in batch jobs at full speed. TreeVisualizer subscribes
+to the events reported through ``on_event`` to animate a search after it ran.
+
+Each algorithm is written as a generator, ``iter_<name>``, that yields its
+``(kind, char, parent_char)`` events one at a time and returns the
+SearchResult when it finishes. Nothing runs until an event is asked for and
+the search is suspended between events, so a caller can stop early, step
+several searches in turn or hand events to the animator at its own pace.
+SearchStream wraps a generator to keep its result, and the plain functions
+(``ucs`` and friends) drive one to the end for callers that want a result
+straight away:
+
+    stream = SearchStream(iter_astar(root, ["G"]))
+    for kind, char, parent_char in stream:
+        if kind == EXPAND and char == "D":
+            stream.close()  # Nothing past this point is ever computed
+            break
+
+Every search stops at the first goal it reaches unless ``find_all`` is set,
+in which case a single traversal keeps going until every goal is recorded in
+``result.goals``.
+"""
+from collections import deque
+import heapq
+import itertools
+
+
+# Event kinds yielded by the search generators and reported to the ``on_event(kind, char, parent_char)`` callback
+EXPAND = "expand"    # A node is taken off the frontier and expanded
+ENQUEUE = "enqueue"  # A child is pushed onto the frontier
+GOAL = "goal"        # A goal node has been reached
+PRUNE = "prune"      # A reached node is dropped: already visited, no better than its queued entry, cut off or forgotten
+
+
+class Node:
+    """Represents a node in the search graph.
+
+    A node may have several parents, and edges may form cycles. Each edge
+    keeps its own cost in the parent's ``edge_costs``; ``path_cost`` is only
+    the default for edges added without one, such as plain tree edges.
+    """
+
+    __slots__ = ("char", "heuristic", "children", "path_cost", "parents", "edge_costs")
+
+    def __init__(self, char, heuristic, path_cost=0):
+        self.char = char
+        self.heuristic = heuristic
+        self.children = []  # A list to hold multiple child nodes
+        self.path_cost = path_cost
+        self.parents = []  # Back-links kept in step with the parents' children lists
+        self.edge_costs = {}  # child Node -> cost of the edge to it
+
+    def __eq__(self, other):
+        # Compare nodes based on their unique character
+        return isinstance(other, Node) and self.char == other.char
+
+    def __hash__(self):
+        # Hash nodes based on their character for dictionary keys and sets
+        return hash(self.char)
+
+    def __lt__(self, other):
+        if not isinstance(other, Node):
+            return NotImplemented
+        # Lexicographic comparison keeps the ordering a strict weak ordering
+        return (self.heuristic, self.path_cost, self.char) < (other.heuristic, other.path_cost, other.char)
+
+    def add_edge(self, child, cost=None, directed=True):
+        """Links self to child, or updates the cost of an existing edge.
+
+        cost defaults to child.path_cost. An undirected edge is stored as a
+        pair of directed edges with the same cost.
+        """
+        if child is self:
+            raise ValueError(f"Node '{self.char}' cannot have an edge to itself")
+        if child not in self.edge_costs and child not in self.children:
+            self.children.append(child)
+            child.parents.append(self)
+        self.edge_costs[child] = child.path_cost if cost is None else cost
+        if not directed:
+            child.add_edge(self, self.edge_costs[child])
+
+    def remove_edge(self, child, directed=True):
+        """Unlinks self from child (and child from self when directed is False)."""
+        if child in self.children:
+            self.children.remove(child)
+            child.parents.remove(self)
+        self.edge_costs.pop(child, None)
+        if not directed:
+            child.remove_edge(self)
+
+    def cost_to(self, child):
+        """Cost of the edge from self to child."""
+        return self.edge_costs.get(child, child.path_cost)
+
+
+class SearchResult:
+    """Outcome of a search: goal reached, path to it, its cost and the expansion order."""
+
+    def __init__(self, algorithm, goal=None, path=None, cost=0, expanded=None, goals=None):
+        self.algorithm = algorithm
+        self.goal = goal
+        self.path = path if path is not None else []
+        self.cost = cost
+        self.expanded = expanded if expanded is not None else []
+        self.goals = goals if goals is not None else {}  # goal char -> (path, cost, expansion index)
+        self.iterations = []  # Nodes expanded at each depth limit, for iterative deepening
+        self.peak_frontier = 0  # Largest number of nodes held on the frontier at once
+
+    def record_goal(self, char, path, cost):
+        """Records a reached goal; the first one also becomes goal, path and cost."""
+        self.goals[char] = (path, cost, len(self.expanded) - 1)
+        if self.goal is None:
+            self.goal = char
+            self.path = path
+            self.cost = cost
+
+    @property
+    def found(self):
+        """True when at least one goal was reached."""
+        return self.goal is not None
+
+    def __repr__(self):
+        return f"SearchResult({self.algorithm!r}, goal={self.goal!r}, path={self.path!r}, cost={self.cost!r})"
+
+
+def _event(kind, node, parent=None):
+    """Builds the (kind, char, parent_char) tuple a search generator yields."""
+    return kind, node.char, parent.char if parent is not None else None
+
+
+def _run(steps, on_event):
+    """Drives a search generator to the end, reporting each event to on_event; returns its SearchResult."""
+    while True:
+        try:
+            event = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        if on_event is not None:
+            on_event(*event)
+
+
+class SearchStream:
+    """Iterator over the events of one search generator that keeps its SearchResult.
+
+    ``result`` is None until the generator is exhausted; ``close()`` stops the
+    search early, leaving it None.
+    """
+
+    def __init__(self, steps):
+        self._steps = steps
+        self.result = None
+        self.done = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.done:
+            raise StopIteration
+        try:
+            return next(self._steps)
+        except StopIteration as stop:
+            self.result = stop.value
+            self.done = True
+            raise StopIteration from None
+
+    def close(self):
+        """Abandons the search; no further events are computed."""
+        self._steps.close()
+        self.done = True
+
+    def run(self, on_event=None):
+        """Consumes the remaining events, reporting them to on_event, and returns the result."""
+        for event in self:
+            if on_event is not None:
+                on_event(*event)
+        return self.result
+
+
+def interleave(streams):
+    """Steps several SearchStreams in turn, one event each, yielding (stream, event) pairs.
+
+    A stream drops out when it is exhausted, so the searches share the caller
+    fairly however long each one runs.
+    """
+    active = deque(streams)
+    while active:
+        stream = active.popleft()
+        event = next(stream, None)
+        if event is not None:
+            active.append(stream)
+            yield stream, event
+
+
+def _reconstruct_path(came_from, node):
+    """Follows came_from links back to the start and returns the path of chars."""
+    path = []
+    while node is not None:
+        path.append(node.char)
+        node = came_from[node]
+    path.reverse()
+    return path
+
+
+def iter_limited_dfs(root, goals, depth_limit=None, find_all=False, algorithm="Limited DFS"):
+    """Depth-first search from root that does not expand below depth_limit (None means no limit).
+
+    With a depth limit, a node first reached along a deep path is expanded
+    again when a shallower path reaches it, since the shallower path leaves
+    more depth for its descendants. Without one, every node is expanded once.
+    """
+    goals = set(goals)
+    result = SearchResult(algorithm)
+    if root is None:
+        return result
+
+    def seen(char, depth):
+        """True when char was already expanded at depth or shallower (at any depth without a limit)."""
+        best = best_depth.get(char)
+        return best is not None and (depth_limit is None or best <= depth)
+
+    # Each entry links to its parent's entry, so a re-expanded node never rewrites a path still on the stack
+    stack = deque([(root, None, 0, 0)])  # (current_node, parent entry, depth, cost so far)
+    best_depth = {}  # char -> shallowest depth it was expanded at
+
+    while stack:
+        entry = stack.pop()
+        current_node, parent_entry, current_depth, cost = entry
+        parent_node = parent_entry[0] if parent_entry is not None else None
+        if seen(current_node.char, current_depth):
+            yield _event(PRUNE, current_node, parent_node)
+            continue
+
+        best_depth[current_node.char] = current_depth
+        result.expanded.append(current_node.char)
+        yield _event(EXPAND, current_node, parent_node)
+
+        if current_node.char in goals and current_node.char not in result.goals:
+            yield _event(GOAL, current_node, parent_node)
+            path = []
+            link = entry
+            while link is not None:
+                path.append(link[0].char)
+                link = link[1]
+            path.reverse()
+            result.record_goal(current_node.char, path, cost)
+            if not find_all or len(result.goals) == len(goals):
+                return result
+
+        # Process children in reverse order so the first child is expanded first
+        if depth_limit is None or current_depth < depth_limit:
+            for child in reversed(current_node.children):
+                if not seen(child.char, current_depth + 1):
+                    stack.append((child, entry, current_depth + 1, cost + current_node.cost_to(child)))
+                    yield _event(ENQUEUE, child, current_node)
+        result.peak_frontier = max(result.peak_frontier, len(stack))
+
+    return result
+
+
+def limited_dfs(root, goals, depth_limit=None, find_all=False, on_event=None, algorithm="Limited DFS"):
+    """Runs iter_limited_dfs to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_limited_dfs(root, goals, depth_limit, find_all, algorithm), on_event)
+
+
+def iter_dfs(root, goals, find_all=False):
+    """Depth-first search from root; stops at the first goal reached."""
+    return iter_limited_dfs(root, goals, None, find_all, algorithm="DFS")
+
+
+def dfs(root, goals, find_all=False, on_event=None):
+    """Runs iter_dfs to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_dfs(root, goals, find_all), on_event)
+
+
+def iter_iterative_deepening(root, goals, max_depth=None, find_all=False, reuse_frontier=False):
+    """Iterative deepening DFS: raises the depth limit from 0 until the shallowest goal is found.
+
+    Each iteration is a fresh limited_dfs, so memory stays O(depth) at the
+    price of re-walking the shallower levels. reuse_frontier opts into keeping
+    the nodes cut off at the previous limit in DFS order instead, so each
+    iteration only expands one new level and no node is expanded twice; that
+    holds a whole level at once, like BFS, and gives up the O(depth) memory.
+    Either way ``result.iterations`` holds the nodes expanded at each depth
+    limit, and the search ends early once a limit no longer cuts anything off.
+    """
+    goals = set(goals)
+    result = SearchResult("IDDFS")
+    if root is None:
+        return result
+
+    if not reuse_frontier:
+        depth_limit = 0
+        while max_depth is None or depth_limit <= max_depth:
+            attempt = yield from iter_limited_dfs(root, goals, depth_limit, find_all)
+            offset = len(result.expanded)
+            result.expanded.extend(attempt.expanded)
+            result.peak_frontier = max(result.peak_frontier, attempt.peak_frontier)
+            result.iterations.append(len(attempt.expanded))
+            exhausted = len(result.iterations) > 1 and result.iterations[-1] == result.iterations[-2]
+            if (attempt.found and (not find_all or len(attempt.goals) == len(goals))) or exhausted:
+                for goal, (path, cost, index) in attempt.goals.items():
+                    result.goals[goal] = (path, cost, offset + index)
+                result.goal, result.path, result.cost = attempt.goal, attempt.path, attempt.cost
+                return result
+            depth_limit += 1
+        return result
+
+    visited = {root.char}
+    came_from = {root: None}
+    g_score = {root: 0}
+    fringe = [root]  # Nodes at exactly the current depth limit, in DFS order
+    depth_limit = 0
+
+    while fringe and (max_depth is None or depth_limit <= max_depth):
+        # Everything shallower was checked by earlier iterations; only the new level is visited
+        for count, node in enumerate(fringe, start=1):
+            result.expanded.append(node.char)
+            yield _event(EXPAND, node, came_from[node])
+            if node.char in goals:
+                yield _event(GOAL, node, came_from[node])
+                result.record_goal(node.char, _reconstruct_path(came_from, node), g_score[node])
+                if not find_all or len(result.goals) == len(goals):
+                    result.iterations.append(count)  # Stop at the first goal in DFS order, as limited_dfs does
+                    return result
+        result.iterations.append(len(fringe))
+
+        # Extend the cut-off nodes by one level for the next depth limit
+        next_fringe = []
+        for node in fringe:
+            for child in node.children:
+                if child.char not in visited:
+                    visited.add(child.char)
+                    came_from[child] = node
+                    g_score[child] = g_score[node] + node.cost_to(child)
+                    next_fringe.append(child)
+                    yield _event(ENQUEUE, child, node)
+                else:
+                    yield _event(PRUNE, child, node)
+        fringe = next_fringe
+        result.peak_frontier = max(result.peak_frontier, len(fringe))
+        depth_limit += 1
+
+    return result
+
+
+def iterative_deepening(root, goals, max_depth=None, find_all=False, reuse_frontier=False, on_event=None):
+    """Runs iter_iterative_deepening to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_iterative_deepening(root, goals, max_depth, find_all, reuse_frontier), on_event)
+
+
+def iter_bfs(start, goals, find_all=False):
+    """Breadth-first search from start; stops at the shallowest goal."""
+    goals = set(goals)
+    result = SearchResult("BFS")
+    if start is None:
+        return result
+
+    queue = deque([(start, None, 0)])  # (node, parent, cost)
+    visited = set()
+    came_from = {}
+
+    while queue:
+        current_node, parent_node, cost = queue.popleft()
+        if current_node.char in visited:
+            yield _event(PRUNE, current_node, parent_node)
+            continue
+
+        visited.add(current_node.char)
+        came_from[current_node] = parent_node
+        result.expanded.append(current_node.char)
+        yield _event(EXPAND, current_node, parent_node)
+
+        if current_node.char in goals:
+            yield _event(GOAL, current_node, parent_node)
+            result.record_goal(current_node.char, _reconstruct_path(came_from, current_node), cost)
+            if not find_all or len(result.goals) == len(goals):
+                return result
+
+        for child in current_node.children:
+            if child.char not in visited:
+                queue.append((child, current_node, cost + current_node.cost_to(child)))
+                yield _event(ENQUEUE, child, current_node)
+        result.peak_frontier = max(result.peak_frontier, len(queue))
+
+    return result
+
+
+def bfs(start, goals, find_all=False, on_event=None):
+    """Runs iter_bfs to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_bfs(start, goals, find_all), on_event)
+
+
+def iter_ucs(root, goals, find_all=False):
+    """Uniform Cost Search from root; returns the cheapest path to any goal."""
+    goals = set(goals)
+    result = SearchResult("UCS")
+    if root is None:
+        return result
+
+    frontier = PriorityFrontier()
+    frontier.push(root, 0, 0)
+    visited = set()
+    came_from = {}
+
+    while frontier:
+        current_node, total_cost, _, parent_node = frontier.pop()
+        visited.add(current_node.char)
+        came_from[current_node] = parent_node
+        result.expanded.append(current_node.char)
+        yield _event(EXPAND, current_node, parent_node)
+
+        if current_node.char in goals:
+            yield _event(GOAL, current_node, parent_node)
+            result.record_goal(current_node.char, _reconstruct_path(came_from, current_node), total_cost)
+            if not find_all or len(result.goals) == len(goals):
+                return result
+
+        for child in current_node.children:
+            if child.char not in visited:
+                new_total_cost = total_cost + current_node.cost_to(child)
+                if frontier.push(child, new_total_cost, new_total_cost, current_node):
+                    yield _event(ENQUEUE, child, current_node)
+                else:
+                    yield _event(PRUNE, child, current_node)
+        result.peak_frontier = max(result.peak_frontier, len(frontier))
+
+    return result
+
+
+def ucs(root, goals, find_all=False, on_event=None):
+    """Runs iter_ucs to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_ucs(root, goals, find_all), on_event)
+
+
+def iter_greedy(root, goals, find_all=False):
+    """Greedy best-first search from root, ordered by node heuristic only."""
+    goals = set(goals)
+    result = SearchResult("Greedy")
+    if root is None:
+        return result
+
+    frontier = PriorityFrontier()
+    frontier.push(root, root.heuristic, 0)
+    visited = set()
+    came_from = {}
+
+    while frontier:
+        current_node, _, cost, parent_node = frontier.pop()
+        visited.add(current_node.char)
+        came_from[current_node] = parent_node
+        result.expanded.append(current_node.char)
+        yield _event(EXPAND, current_node, parent_node)
+
+        if current_node.char in goals:
+            yield _event(GOAL, current_node, parent_node)
+            result.record_goal(current_node.char, _reconstruct_path(came_from, current_node), cost)
+            if not find_all or len(result.goals) == len(goals):
+                return result
+
+        for child in current_node.children:
+            if child.char not in visited:
+                if frontier.push(child, child.heuristic, cost + current_node.cost_to(child), current_node):
+                    yield _event(ENQUEUE, child, current_node)
+                else:
+                    yield _event(PRUNE, child, current_node)
+        result.peak_frontier = max(result.peak_frontier, len(frontier))
+
+    return result
+
+
+def greedy(root, goals, find_all=False, on_event=None):
+    """Runs iter_greedy to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_greedy(root, goals, find_all), on_event)
+
+
+def iter_astar(root, goals, find_all=False):
+    """A* search from root using f = g + heuristic."""
+    goals = set(goals)
+    result = SearchResult("A*")
+    if root is None:
+        return result
+
+    frontier = PriorityFrontier()
+    frontier.push(root, root.heuristic, 0)
+    closed_set = set()
+    came_from = {root: None}
+
+    while frontier:
+        # Pop the node with the lowest (f, g, char)
+        current_node, _, g, _ = frontier.pop()
+        closed_set.add(current_node)
+        result.expanded.append(current_node.char)
+        yield _event(EXPAND, current_node, came_from.get(current_node))
+
+        if current_node.char in goals:
+            yield _event(GOAL, current_node, came_from.get(current_node))
+            result.record_goal(current_node.char, _reconstruct_path(came_from, current_node), g)
+            if not find_all or len(result.goals) == len(goals):
+                return result
+
+        # Explore neighbors; expanded nodes are never reopened
+        for child in current_node.children:
+            if child in closed_set:
+                yield _event(PRUNE, child, current_node)
+                continue
+            tentative_g_score = g + current_node.cost_to(child)
+            if frontier.push(child, tentative_g_score + child.heuristic, tentative_g_score):
+                came_from[child] = current_node
+                yield _event(ENQUEUE, child, current_node)
+            else:
+                yield _event(PRUNE, child, current_node)
+        result.peak_frontier = max(result.peak_frontier, len(frontier))
+
+    return result
+
+
+def astar(root, goals, find_all=False, on_event=None):
+    """Runs iter_astar to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_astar(root, goals, find_all), on_event)
+
+
+def iter_ida_star(root, goals):
+    """IDA*: depth-first searches bounded by f = g + heuristic, raising the bound each iteration.
+
+    Memory is only the current path, so ``result.peak_frontier`` (the deepest
+    path held) is the whole memory use. The price is that a node shared by
+    several paths of a graph is searched again along each of them.
+    ``result.iterations`` records the nodes expanded per f-bound.
+    """
+    goals = set(goals)
+    result = SearchResult("IDA*")
+    if root is None:
+        return result
+
+    threshold = root.heuristic
+    while True:
+        expanded_before = len(result.expanded)
+        next_threshold = float('inf')  # Smallest f that exceeded the current bound
+
+        result.expanded.append(root.char)
+        yield _event(EXPAND, root)
+        if root.char in goals:
+            yield _event(GOAL, root)
+            result.record_goal(root.char, [root.char], 0)
+            return result
+        for child in root.children:
+            yield _event(ENQUEUE, child, root)  # Each child is then either pruned or expanded
+
+        # The stack is the current path, each entry with the children still to try
+        stack = [(root, 0, iter(root.children))]
+        on_path = {root}
+        while stack:
+            node, g, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                on_path.discard(node)
+                continue
+            if child in on_path:
+                yield _event(PRUNE, child, node)
+                continue  # Never loop back along the current path
+
+            child_g = g + node.cost_to(child)
+            f = child_g + child.heuristic
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                yield _event(PRUNE, child, node)
+                continue
+
+            result.expanded.append(child.char)
+            yield _event(EXPAND, child, node)
+            if child.char in goals:
+                yield _event(GOAL, child, node)
+                result.record_goal(child.char, [entry[0].char for entry in stack] + [child.char], child_g)
+                result.iterations.append(len(result.expanded) - expanded_before)
+                return result
+
+            for grandchild in child.children:
+                yield _event(ENQUEUE, grandchild, child)
+            stack.append((child, child_g, iter(child.children)))
+            on_path.add(child)
+            result.peak_frontier = max(result.peak_frontier, len(stack))
+
+        result.iterations.append(len(result.expanded) - expanded_before)
+        if next_threshold == float('inf'):
+            return result  # Nothing was cut off, so no goal is reachable
+        threshold = next_threshold
+
+
+def ida_star(root, goals, on_event=None):
+    """Runs iter_ida_star to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_ida_star(root, goals), on_event)
+
+
+class _MemoryNode:
+    """A search-tree node held in SMA* memory."""
+
+    __slots__ = ("node", "parent", "g", "f", "depth", "live_children", "forgotten", "in_open", "version")
+
+    def __init__(self, node, parent, g, f, depth):
+        self.node = node
+        self.parent = parent  # _MemoryNode this one was generated from
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.live_children = []  # Generated children still in memory
+        self.forgotten = {}  # Node -> backed-up f of a child dropped to save memory
+        self.in_open = False
+        self.version = 0  # Bumped whenever heap entries for this node go stale
+
+
+def iter_sma_star(root, goals, max_nodes=1000):
+    """Simplified memory-bounded A* that never holds more than max_nodes search nodes.
+
+    When memory is full the shallowest highest-f leaf is dropped and its f is
+    remembered by its parent, which goes back on the open list so the dropped
+    branch can be regenerated later. The search is optimal when the cheapest
+    solution path fits in the budget. When it does not fit, SMA* returns the
+    cheapest solution it can still hold, which may cost more, and no goal only
+    when no solution path fits at all.
+    """
+    goals = set(goals)
+    result = SearchResult("SMA*")
+    if root is None:
+        return result
+    if max_nodes < 2:
+        raise ValueError("SMA* needs a budget of at least 2 nodes")
+
+    counter = itertools.count()
+    best_heap = []   # (f, -depth, counter, version, node): lowest f, deepest first
+    worst_heap = []  # (-f, depth, counter, version, node): highest f, shallowest first, leaves only
+    open_count = 0
+
+    def add_open(memory_node):
+        """Puts a node on the open list, or refreshes its priority.
+
+        A leaf is keyed by its own f; a node with forgotten children is keyed
+        by the best of them, since expanding it regenerates those children.
+        """
+        nonlocal open_count
+        if not memory_node.in_open:
+            memory_node.in_open = True
+            open_count += 1
+        memory_node.version += 1
+        f = min(memory_node.forgotten.values()) if memory_node.forgotten else memory_node.f
+        tie = next(counter)
+        heapq.heappush(best_heap, (f, -memory_node.depth, tie, memory_node.version, memory_node))
+        if not memory_node.live_children:
+            heapq.heappush(worst_heap, (-f, memory_node.depth, tie, memory_node.version, memory_node))
+
+    def remove_open(memory_node):
+        nonlocal open_count
+        memory_node.in_open = False
+        open_count -= 1
+
+    def top(heap):
+        """Returns the (f, node) at the top of heap, discarding stale entries."""
+        while heap:
+            entry = heap[0]
+            memory_node = entry[-1]
+            if memory_node.in_open and entry[3] == memory_node.version and not (heap is worst_heap and memory_node.live_children):
+                return abs(entry[0]), memory_node
+            heapq.heappop(heap)
+        return float('inf'), None
+
+    add_open(_MemoryNode(root, None, 0, root.heuristic, 0))
+    used = 1  # Search nodes currently in memory
+
+    while True:
+        best_f, best = top(best_heap)
+        if best is None or best_f == float('inf'):
+            return result  # No goal reachable within the memory budget
+
+        parent_node = best.parent.node if best.parent is not None else None
+        if best.node.char in goals:
+            result.expanded.append(best.node.char)
+            yield _event(EXPAND, best.node, parent_node)
+            yield _event(GOAL, best.node, parent_node)
+            path = []
+            memory_node = best
+            while memory_node is not None:
+                path.append(memory_node.node.char)
+                memory_node = memory_node.parent
+            path.reverse()
+            result.record_goal(best.node.char, path, best.g)
+            return result
+
+        remove_open(best)
+        result.expanded.append(best.node.char)
+        yield _event(EXPAND, best.node, parent_node)
+
+        ancestors = set()
+        memory_node = best
+        while memory_node is not None:
+            ancestors.add(memory_node.node)
+            memory_node = memory_node.parent
+
+        # A node expanded before only regenerates the children it forgot
+        regenerate = best.forgotten
+        best.forgotten = {}
+        for child in best.node.children:
+            if child in ancestors or (regenerate and child not in regenerate):
+                continue  # Never loop back along the current path or duplicate a live child
+            g = best.g + best.node.cost_to(child)
+            if child.char not in goals and best.depth + 1 >= max_nodes - 1:
+                f = float('inf')  # The path cannot be extended any further within the budget
+            else:
+                f = max(best.f, g + child.heuristic)  # pathmax keeps f non-decreasing
+            f = max(f, regenerate.get(child, f))
+            memory_child = _MemoryNode(child, best, g, f, best.depth + 1)
+            best.live_children.append(memory_child)
+            add_open(memory_child)
+            used += 1
+            yield _event(ENQUEUE, child, best.node)
+
+        if not best.live_children:
+            best.f = float('inf')  # Dead end: keep it as a leaf so it is dropped first
+            add_open(best)
+
+        # Back the best child f up through the ancestors
+        memory_node = best
+        while memory_node is not None and memory_node.live_children:
+            new_f = min([c.f for c in memory_node.live_children] + list(memory_node.forgotten.values()))
+            if new_f == memory_node.f and memory_node is not best:
+                break
+            memory_node.f = new_f
+            memory_node = memory_node.parent
+
+        # Drop the worst leaves until the budget holds again
+        while used > max_nodes:
+            worst_f, worst = top(worst_heap)
+            if worst is None or worst is best or worst.parent is None:
+                break  # Only the node being expanded is left to drop
+            remove_open(worst)
+            used -= 1
+            parent = worst.parent
+            parent.live_children.remove(worst)
+            parent.forgotten[worst.node] = worst_f
+            add_open(parent)
+            yield _event(PRUNE, worst.node, parent.node)
+
+        result.peak_frontier = max(result.peak_frontier, open_count)
+
+
+def sma_star(root, goals, max_nodes=1000, on_event=None):
+    """Runs iter_sma_star to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_sma_star(root, goals, max_nodes), on_event)
+
+
+def memory_report(root, goals, max_nodes=1000):
+    """Runs A*, IDA* and SMA* on the same query and returns one row per algorithm.
+
+    Each row is a dict with the goal, cost, nodes expanded and peak frontier,
+    so the memory-bounded searches can be compared with plain A*.
+    """
+    goals = list(goals)
+    rows = []
+    for result in (astar(root, goals), ida_star(root, goals), sma_star(root, goals, max_nodes)):
+        rows.append({
+            "algorithm": result.algorithm,
+            "goal": result.goal,
+            "cost": result.cost,
+            "expanded": len(result.expanded),
+            "peak_frontier": result.peak_frontier,
+        })
+    return rows
+
+
+def iter_bidirectional_search(start, goal_nodes, weighted=False):
+    """Searches forward from start through children and backward from the goals through parents.
+
+    The two frontiers grow alternately (always the smaller one) until they
+    meet, which cuts the work from about b^d to about 2 * b^(d/2). With
+    weighted False every edge counts as one step, giving bidirectional BFS;
+    with weighted True edges use their own costs (bidirectional UCS).
+    The search stops once the best meeting cost can no longer improve, and
+    result.cost is always the edge-cost total of the returned path.
+    """
+    goal_nodes = list(goal_nodes)
+    result = SearchResult("Bidirectional UCS" if weighted else "Bidirectional BFS")
+    if start is None or not goal_nodes:
+        return result
+
+    def step_cost(parent, child):
+        """Cost of the edge from parent to child."""
+        return parent.cost_to(child) if weighted else 1
+
+    # Per direction: frontier, tentative distances, came-from links and expanded nodes
+    forward = (PriorityFrontier(), {start: 0}, {start: None}, set())
+    backward = (PriorityFrontier(), {}, {}, set())
+    forward[0].push(start, 0, 0)
+    for goal in goal_nodes:
+        backward[0].push(goal, 0, 0)
+        backward[1][goal] = 0
+        backward[2][goal] = None
+
+    best_cost = 0 if start in backward[1] else float('inf')
+    meeting_node = start if start in backward[1] else None
+
+    while forward[0] and backward[0]:
+        # Stop once no meeting through the two frontiers can beat the best one found
+        if forward[0].peek()[1] + backward[0].peek()[1] >= best_cost:
+            break
+
+        is_forward = len(forward[0]) <= len(backward[0])
+        frontier, distance, came_from, closed = forward if is_forward else backward
+        other_distance = backward[1] if is_forward else forward[1]
+
+        node, d, _, _ = frontier.pop()
+        closed.add(node)
+        result.expanded.append(node.char)
+        yield _event(EXPAND, node, came_from[node])
+
+        neighbors = [(child, step_cost(node, child)) for child in node.children] if is_forward else \
+            [(parent, step_cost(parent, node)) for parent in node.parents]
+        for neighbor, cost in neighbors:
+            if neighbor in closed:
+                yield _event(PRUNE, neighbor, node)
+                continue
+            new_distance = d + cost
+            if frontier.push(neighbor, new_distance, new_distance):
+                distance[neighbor] = new_distance
+                came_from[neighbor] = node
+                yield _event(ENQUEUE, neighbor, node)
+            else:
+                yield _event(PRUNE, neighbor, node)
+            if neighbor in other_distance and distance[neighbor] + other_distance[neighbor] < best_cost:
+                best_cost = distance[neighbor] + other_distance[neighbor]
+                meeting_node = neighbor
+        result.peak_frontier = max(result.peak_frontier, len(forward[0]) + len(backward[0]))
+
+    if meeting_node is not None:
+        # Forward links lead back to start; backward links lead on to a goal
+        path_nodes = []
+        node = meeting_node
+        while node is not None:
+            path_nodes.append(node)
+            node = forward[2][node]
+        path_nodes.reverse()
+        node = backward[2][meeting_node]
+        while node is not None:
+            path_nodes.append(node)
+            node = backward[2][node]
+
+        goal = path_nodes[-1]
+        yield _event(GOAL, goal, path_nodes[-2] if len(path_nodes) > 1 else None)
+        cost = sum(parent.cost_to(child) for parent, child in zip(path_nodes, path_nodes[1:]))
+        result.record_goal(goal.char, [node.char for node in path_nodes], cost)
+
+    return result
+
+
+def bidirectional_search(start, goal_nodes, weighted=False, on_event=None):
+    """Runs iter_bidirectional_search to the end, reporting its events to on_event; returns the SearchResult."""
+    return _run(iter_bidirectional_search(start, goal_nodes, weighted), on_event)
+
+
+def cost_to_goal(goal_nodes):
+    """Reverse Dijkstra from the goals along parent links.
+
+    Returns a dict mapping every node that can reach a goal to the cost of its
+    cheapest path there, i.e. the perfect heuristic h*.
+    """
+    distance = {}
+    heap = [(0, goal.char, goal) for goal in goal_nodes]
+    heapq.heapify(heap)
+    while heap:
+        d, _, node = heapq.heappop(heap)
+        if node in distance:
+            continue
+        distance[node] = d
+        for parent in node.parents:
+            if parent not in distance:
+                heapq.heappush(heap, (d + parent.cost_to(node), parent.char, parent))
+    return distance
+
+
+def effective_branching_factor(expanded, depth):
+    """Solves expanded = 1 + b + b^2 + ... + b^depth for b, the uniform tree that would cost as much.
+
+    expanded counts the start node. Returns None when depth is 0, since any
+    branching factor fits.
+    """
+    if depth <= 0 or expanded <= 0:
+        return None
+    target = expanded
+
+    def tree_size(b):
+        return sum(b ** level for level in range(depth + 1))
+
+    low, high = 0.0, float(max(expanded, 1))
+    for _ in range(100):  # Bisection; tree_size grows monotonically with b
+        middle = (low + high) / 2
+        if tree_size(middle) < target:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def heuristic_report(root, goals):
+    """Checks every heuristic reachable from root against the true cost-to-goal.
+
+    Returns a dict with:
+    - the nodes whose heuristic overestimates h* (inadmissible: char, h, h*);
+    - the edges where h(parent) > cost + h(child) (inconsistent: parent,
+      child, h(parent), cost, h(child));
+    - the mean h / h* over nodes that can reach a goal;
+    - for A* and for UCS (h = 0): nodes expanded, solution depth, cost, and
+      the effective branching factor that cost corresponds to;
+    - whether A* returned an optimal path.
+    """
+    goals = set(goals)
+    nodes = []
+    seen = {root.char} if root is not None else set()
+    queue = deque([root] if root is not None else [])
+    while queue:
+        node = queue.popleft()
+        nodes.append(node)
+        for child in node.children:
+            if child.char not in seen:
+                seen.add(child.char)
+                queue.append(child)
+
+    true_cost = cost_to_goal([node for node in nodes if node.char in goals])
+    inadmissible = [(node.char, node.heuristic, true_cost[node]) for node in nodes
+                    if node in true_cost and node.heuristic > true_cost[node] + 1e-9]
+    inconsistent = [(node.char, child.char, node.heuristic, node.cost_to(child), child.heuristic)
+                    for node in nodes for child in node.children
+                    if node.heuristic > node.cost_to(child) + child.heuristic + 1e-9]
+    ratios = [node.heuristic / true_cost[node] for node in nodes if true_cost.get(node, 0) > 0]
+
+    report = {
+        "nodes": len(nodes),
+        "admissible": not inadmissible,
+        "consistent": not inconsistent,
+        "inadmissible": inadmissible,
+        "inconsistent": inconsistent,
+        "mean_accuracy": sum(ratios) / len(ratios) if ratios else None,
+        "optimal_cost": true_cost.get(root),
+    }
+    for result in (astar(root, goals), ucs(root, goals)):
+        depth = len(result.path) - 1
+        report[result.algorithm] = {
+            "expanded": len(result.expanded),
+            "depth": depth if result.found else None,
+            "cost": result.cost if result.found else None,
+            "effective_branching_factor": effective_branching_factor(len(result.expanded), depth) if result.found else None,
+        }
+    report["astar_optimal"] = report["A*"]["cost"] is not None and report["A*"]["cost"] <= report["optimal_cost"] + 1e-9
+    return report
+
+
+class ShortestPathTree:
+    """Single-source shortest paths from one UCS pass, kept current as the graph is edited.
+
+    ``distance`` maps the char of every node reachable from source to its
+    cheapest cost and ``predecessor`` to the char before it on that path, so
+    a goal query only walks back along predecessors: O(path length).
+    add_edge and remove_edge repair just the part of the table an edit can
+    change. A full rebuild breaks ties like ucs; after repairs a goal may be
+    reached by a different path of the same cost.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.distance = {}
+        self.predecessor = {}
+        self.rebuild()
+
+    def rebuild(self):
+        """Recomputes the whole table with one Dijkstra pass from source."""
+        self.distance = {}
+        self.predecessor = {}
+        if self.source is not None:
+            self.distance[self.source.char] = 0
+            self.predecessor[self.source.char] = None
+            self._relax([(0, self.source.char, self.source)])
+
+    def _relax(self, heap):
+        """Dijkstra from the queued (distance, char, node) entries, lowering distances where a cheaper path appears."""
+        heapq.heapify(heap)
+        settled = set()
+        while heap:
+            d, char, node = heapq.heappop(heap)
+            if char in settled or d > self.distance[char]:
+                continue  # Stale entry left behind by a cheaper push
+            settled.add(char)
+            for child in node.children:
+                new_distance = d + node.cost_to(child)
+                if new_distance < self.distance.get(child.char, float('inf')):
+                    self.distance[child.char] = new_distance
+                    self.predecessor[child.char] = char
+                    heapq.heappush(heap, (new_distance, child.char, child))
+
+    def add_edge(self, parent, child):
+        """Updates the table after an edge parent -> child was added (child may be a new node)."""
+        if parent.char not in self.distance:
+            return  # Nothing reaches the edge, so no path changes
+        new_distance = self.distance[parent.char] + parent.cost_to(child)
+        if new_distance < self.distance.get(child.char, float('inf')):
+            self.distance[child.char] = new_distance
+            self.predecessor[child.char] = parent.char
+            self._relax([(new_distance, child.char, child)])
+
+    def remove_edge(self, parent, child):
+        """Updates the table after the edge parent -> child was removed from the graph."""
+        if self.predecessor.get(child.char) != parent.char:
+            return  # No cheapest path used the edge
+
+        # Every node whose cheapest path ran through the edge loses its distance
+        affected = {child.char: child}
+        stack = [child]
+        while stack:
+            node = stack.pop()
+            for grandchild in node.children:
+                if grandchild.char not in affected and self.predecessor.get(grandchild.char) == node.char:
+                    affected[grandchild.char] = grandchild
+                    stack.append(grandchild)
+        for char in affected:
+            del self.distance[char]
+            del self.predecessor[char]
+
+        # Re-enter each affected node from its cheapest unaffected parent, then settle the rest
+        heap = []
+        for char, node in affected.items():
+            for parent_node in node.parents:
+                if parent_node.char in self.distance:
+                    new_distance = self.distance[parent_node.char] + parent_node.cost_to(node)
+                    if new_distance < self.distance.get(char, float('inf')):
+                        self.distance[char] = new_distance
+                        self.predecessor[char] = parent_node.char
+            if char in self.distance:
+                heap.append((self.distance[char], char, node))
+        self._relax(heap)
+
+    def path_to(self, goal):
+        """Returns the cheapest path of chars from source to goal, or None if goal is unreachable."""
+        if goal not in self.distance:
+            return None
+        path = []
+        while goal is not None:
+            path.append(goal)
+            goal = self.predecessor[goal]
+        path.reverse()
+        return path
+
+    def query(self, goals, find_all=False):
+        """Answers a UCS query from the table without expanding anything.
+
+        The nearest goal (ties broken by char, as ucs does) becomes
+        result.goal; with find_all every reachable goal is recorded.
+        """
+        result = SearchResult("UCS (precomputed)")
+        reachable = sorted((self.distance[goal], goal) for goal in set(goals) if goal in self.distance)
+        for cost, goal in reachable if find_all else reachable[:1]:
+            result.record_goal(goal, self.path_to(goal), cost)
+        return result
+
+
+class PriorityFrontier:
+    """Min-priority frontier ordered by (f, g, char, insertion counter).
+
+    Each node is queued at most once. Pushing a node that is already queued
+    with a worse (f, g) lowers its priority in O(log n) by retiring the old
+    heap entry, so pop, push and decrease-key are all logarithmic and the
+    heap invariant is never broken by re-sorting.
+    """
+
+    _REMOVED = object()  # Placeholder for a heap entry superseded by decrease-key
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}  # node -> its live heap entry
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, node):
+        return node in self._entries
+
+    def priority(self, node):
+        """Returns the queued (f, g) of node."""
+        entry = self._entries[node]
+        return entry[0], entry[1]
+
+    def push(self, node, f, g=0, data=None):
+        """Queues node, or lowers its priority; returns False if it is already queued with a better one."""
+        entry = self._entries.get(node)
+        if entry is not None:
+            if (f, g) >= (entry[0], entry[1]):
+                return False
+            entry[4] = self._REMOVED
+
+        entry = [f, g, node.char, next(self._counter), node, data]
+        self._entries[node] = entry
+        heapq.heappush(self._heap, entry)
+        return True
+
+    def peek(self):
+        """Returns (node, f, g, data) for the lowest-priority node without removing it."""
+        while self._heap and self._heap[0][4] is self._REMOVED:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            raise KeyError("peek at an empty frontier")
+        f, g, _, _, node, data = self._heap[0]
+        return node, f, g, data
+
+    def pop(self):
+        """Removes and returns (node, f, g, data) for the lowest-priority node."""
+        while self._heap:
+            f, g, _, _, node, data = heapq.heappop(self._heap)
+            if node is not self._REMOVED:
+                del self._entries[node]
+                return node, f, g, data
+        raise KeyError("pop from an empty frontier")
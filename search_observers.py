@@ -0,0 +1,208 @@
+"""Observers that watch a search through its ``on_event`` callback.
+
+A SearchObserver is itself an ``on_event(kind, char, parent_char)`` callable
+that dispatches every event to ``on_expand``, ``on_enqueue``, ``on_goal`` or
+``on_prune``, so it plugs into any algorithm in search_engine. A search run
+without observers pays a single ``is None`` check per event, so the
+collectors cost nothing when they are not attached:
+
+    counters, timer = SearchCounters(), PhaseTimer()
+    result, report = instrument(
+        lambda on_event: search_engine.astar(root, ["G"], on_event=on_event),
+        counters, timer, profile=True)
+    print(counters.as_dict(), timer.phases, report["wall_time_s"])
+    report["profile"].sort_stats("cumulative").print_stats(10)
+"""
+import cProfile
+import pstats
+import time
+import tracemalloc
+
+from search_engine import EXPAND, ENQUEUE, GOAL, PRUNE
+
+
+FORWARD, BACKWARD = 0, 1  # Search directions told apart by SearchCounters
+
+
+class SearchObserver:
+    """Base class for search observers; override the hooks you need.
+
+    Every hook receives the char of the node and the char of the node it was
+    reached from (None for the start). Unknown event kinds are ignored.
+    """
+
+    _HOOKS = {EXPAND: "on_expand", ENQUEUE: "on_enqueue", GOAL: "on_goal", PRUNE: "on_prune"}
+
+    def __call__(self, kind, char, parent_char):
+        hook = self._HOOKS.get(kind)
+        if hook is not None:
+            getattr(self, hook)(char, parent_char)
+
+    def on_expand(self, char, parent_char):
+        """A node was taken off the frontier and expanded."""
+
+    def on_enqueue(self, char, parent_char):
+        """A node was pushed onto the frontier."""
+
+    def on_goal(self, char, parent_char):
+        """A goal node was reached."""
+
+    def on_prune(self, char, parent_char):
+        """A reached node was dropped without being queued or expanded."""
+
+
+class SearchCounters(SearchObserver):
+    """Counts expansions, re-expansions, pushes, duplicate pushes, prunes and goals.
+
+    A duplicate push is an enqueue of a node that is still waiting on the
+    frontier: a cheaper path found by UCS or A* (a decrease-key), or a second
+    copy on a DFS stack or BFS queue. With a lazy-deletion heap each of them
+    is a stale entry popped and skipped later. ``frontier_high_water`` is the
+    largest number of distinct nodes waiting at once. A prune of a waiting
+    node from the parent it was queued by, such as SMA* forgetting a leaf or
+    IDA* cutting a child off at the bound, takes it off the frontier.
+
+    Bidirectional search has one frontier per direction, so nodes are
+    counted per direction: a node queued or expanded by both searches is not
+    a duplicate. The first start expanded is the forward root; any other node
+    expanded without a parent (a goal, in bidirectional search) roots the
+    backward direction, and every other expansion belongs to the direction
+    whose frontier queued the node from that parent.
+    """
+
+    def __init__(self):
+        self.expansions = 0
+        self.re_expansions = 0
+        self.enqueues = 0
+        self.duplicate_pushes = 0
+        self.prunes = 0
+        self.goals = 0
+        self.frontier_high_water = 0
+        self._expanded = set()  # (char, direction)
+        self._queued = {}  # (char, direction) -> char of the parent that queued it
+        self._root = None  # Char of the first start expanded
+        self._direction = FORWARD  # Direction of the node being expanded
+
+    def on_expand(self, char, parent_char):
+        if parent_char is None:
+            if self._root is None:
+                self._root = char
+            self._direction = FORWARD if char == self._root else BACKWARD
+        elif self._queued.get((char, BACKWARD)) == parent_char:
+            self._direction = BACKWARD
+        else:
+            self._direction = FORWARD
+
+        key = (char, self._direction)
+        self.expansions += 1
+        if key in self._expanded:
+            self.re_expansions += 1
+        self._expanded.add(key)
+        self._queued.pop(key, None)
+
+    def on_enqueue(self, char, parent_char):
+        key = (char, self._direction)
+        self.enqueues += 1
+        if key in self._queued:
+            self.duplicate_pushes += 1
+        self._queued[key] = parent_char
+        self.frontier_high_water = max(self.frontier_high_water, len(self._queued))
+
+    def on_goal(self, char, parent_char):
+        self.goals += 1
+
+    def on_prune(self, char, parent_char):
+        self.prunes += 1
+        key = (char, self._direction)
+        if key in self._queued and self._queued[key] == parent_char:
+            del self._queued[key]  # Dropped from the frontier, not just refused a second entry
+
+    def as_dict(self):
+        """Returns the counters as a plain dict, for reports and JSON output."""
+        return {
+            "expansions": self.expansions,
+            "re_expansions": self.re_expansions,
+            "enqueues": self.enqueues,
+            "duplicate_pushes": self.duplicate_pushes,
+            "prunes": self.prunes,
+            "goals": self.goals,
+            "frontier_high_water": self.frontier_high_water,
+        }
+
+
+class PhaseTimer(SearchObserver):
+    """Splits search time into selecting the next node and expanding it.
+
+    The time up to each expand event (popping the frontier and skipping stale
+    entries) goes to ``phases["select"]``; the time after it (goal test,
+    child generation and pushes) goes to ``phases["expand"]``. ``first_goal``
+    is the time from the first event to the first goal. The timer's own
+    overhead is left out of both phases.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.phases = {"select": 0.0, "expand": 0.0}
+        self.first_goal = None
+        self._start = None
+        self._last = None
+
+    def __call__(self, kind, char, parent_char):
+        now = self.clock()
+        if self._last is None:
+            self._start = now
+        else:
+            self.phases["select" if kind == EXPAND else "expand"] += now - self._last
+        if kind == GOAL and self.first_goal is None:
+            self.first_goal = now - self._start
+        self._last = self.clock()
+
+
+def combine(*callbacks):
+    """Merges on_event callbacks and observers into one callback; None when none are given."""
+    callbacks = [callback for callback in callbacks if callback is not None]
+    if not callbacks:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def on_event(kind, char, parent_char):
+        for callback in callbacks:
+            callback(kind, char, parent_char)
+    return on_event
+
+
+def instrument(run, *observers, profile=False, trace_memory=False):
+    """Runs run(on_event) with the observers attached and returns (result, report).
+
+    report holds ``wall_time_s``, plus ``peak_memory_bytes`` when
+    trace_memory is set and a ``pstats.Stats`` under ``profile`` when profile
+    is set. Profiling and memory tracing slow the search down several times,
+    so leave them off when the timings matter.
+    """
+    on_event = combine(*observers)
+    report = {}
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif trace_memory:
+        tracemalloc.reset_peak()
+    profiler = cProfile.Profile() if profile else None
+
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        result = run(on_event)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        report["wall_time_s"] = time.perf_counter() - start
+        if trace_memory:
+            _, report["peak_memory_bytes"] = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+
+    if profiler is not None:
+        report["profile"] = pstats.Stats(profiler)
+    return result, report
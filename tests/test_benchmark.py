@@ -0,0 +1,11 @@
+"""Tests for the synthetic benchmark harness."""
+import benchmark
+
+
+def test_iddfs_rows_keep_their_memory_profiles():
+    rows = {row["algorithm"]: row for row in benchmark.run_benchmark("tree", branching=2, depth=4, repeat=1)}
+    assert set(rows) == set(benchmark.ALGORITHMS)
+    assert all(row["found"] for row in rows.values())
+    assert rows["IDDFS"]["peak_frontier"] <= 4 + 1  # O(depth) memory
+    assert rows["IDDFS"]["expanded"] > rows["BFS"]["expanded"]  # Shallower levels are walked again
+    assert rows["IDDFS (reuse)"]["peak_frontier"] == rows["BFS"]["peak_frontier"]
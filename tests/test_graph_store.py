@@ -0,0 +1,46 @@
+"""Tests for the memory-mapped binary graph files."""
+import pytest
+
+import graph_store
+import search_engine
+from compact_graph import CompactGraph
+from test_search_engine import small_graph
+
+
+def test_graph_file_round_trip_and_corrupt_target(tmp_path):
+    nodes = small_graph()
+    path = tmp_path / f"small{graph_store.EXTENSION}"
+    graph_store.save_graph(str(path), nodes["A"])
+    root, loaded, _, positions = graph_store.load_graph(str(path))
+    assert root.char == "A" and positions is None
+    assert search_engine.ucs(root, ["F"]).path == ["A", "B", "E", "F"]
+    assert set(loaded) == set(nodes)
+
+    data = bytearray(path.read_bytes())
+    sections, _ = graph_store._sections(len(nodes), 6, 0)
+    offset = sections["targets"][0]
+    data[offset:offset + 8] = (len(nodes)).to_bytes(8, "little")
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        graph_store.load_graph(str(path))
+
+
+def test_saved_graph_matches_compact_graph(tmp_path):
+    nodes = small_graph()
+    for cost, node in enumerate(nodes.values()):
+        node.path_cost = cost
+    path = str(tmp_path / f"small{graph_store.EXTENSION}")
+    graph_store.save_graph(path, nodes["A"], {"A": None, "B": nodes["A"], "C": nodes["A"]},
+                           {char: (i, -i) for i, char in enumerate(nodes)})
+    compact = CompactGraph.from_tree(nodes["A"], path_costs=True)
+    with graph_store.MappedGraph(path) as mapped:
+        mapped.validate()
+        assert list(mapped.chars) == compact.chars
+        for column in ("heuristics", "path_costs", "offsets", "targets", "edge_costs"):
+            assert list(getattr(mapped, column)) == list(getattr(compact, column))
+        assert mapped.layout_parents[mapped.index["B"]] == mapped.index["A"]
+
+    root, loaded, parent_nodes, positions = graph_store.load_graph(path)
+    assert {char: node.path_cost for char, node in loaded.items()} == {char: node.path_cost for char, node in nodes.items()}
+    assert parent_nodes["E"] is loaded["B"]  # Not stored, so the breadth-first parent stands in
+    assert positions["C"] == (2, -2)
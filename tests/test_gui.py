@@ -0,0 +1,76 @@
+"""Tests that drive TreeVisualizer through its input boxes on an offscreen display."""
+import importlib.util
+import os
+
+import pytest
+
+import search_engine
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("tkinter")
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "AI Search Module.py")
+
+
+@pytest.fixture(scope="module")
+def gui():
+    spec = importlib.util.spec_from_file_location("ai_search_module", _PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    app = QApplication.instance() or QApplication([])
+    yield module
+    app.processEvents()
+
+
+@pytest.fixture
+def window(gui):
+    window = gui.TreeVisualizer()
+    yield window
+    window.reset_tree()
+    window.deleteLater()
+
+
+def add(window, char, heuristic, parents="", cost="", undirected=False):
+    window.char_input.setText(char)
+    window.heuristic_input.setText(str(heuristic))
+    window.parent_input.setText(parents)
+    window.path_cost.setText(str(cost))
+    window.undirected_input.setChecked(undirected)
+    window.add_node()
+
+
+def toggle_collapse(window, char):
+    window.char_input.setText(char)
+    window.toggle_collapse()
+
+
+def test_collapse_inside_collapsed_subtree(window):
+    add(window, "A", 3)
+    add(window, "B", 2, "A", 1)
+    toggle_collapse(window, "A")
+    add(window, "C", 1, "B", 1)
+    add(window, "D", 0, "C", 1)
+    toggle_collapse(window, "C")  # C was never laid out, so it has no position yet
+    assert window.collapsed["C"] is None
+    assert window.hidden_chars == {"B", "C", "D"}
+
+    toggle_collapse(window, "A")
+    assert "C" in window.node_positions and "D" not in window.node_positions
+    glyph, count_text = window.collapsed["C"]
+    assert glyph.pos().x() == window.node_positions["C"][0]
+    assert count_text.text() == "+1"
+    assert window.hidden_chars == {"D"}
+
+
+def test_undirected_edge_keeps_existing_reverse_cost(window):
+    add(window, "A", 3)
+    add(window, "B", 2, "A", 1)
+    window.toggle_shortest_paths(True)
+    add(window, "A", 3, "B", 5, undirected=True)  # B -> A would overwrite the cost of A -> B
+    a, b = window.nodes["A"], window.nodes["B"]
+    assert a.cost_to(b) == 1
+    assert a not in b.edge_costs
+    assert window.shortest_paths.distance == search_engine.ShortestPathTree(a).distance
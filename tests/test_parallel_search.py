@@ -0,0 +1,28 @@
+"""Tests for batch search over a process pool."""
+import random
+
+import pytest
+
+import parallel_search
+import search_engine
+from test_search_engine import random_graph
+
+
+@pytest.mark.parametrize("algorithm, search", [("ucs", search_engine.ucs), ("astar", search_engine.astar)])
+@pytest.mark.parametrize("processes", [1, 2])
+def test_search_many_matches_engine(algorithm, search, processes):
+    rng = random.Random(5)
+    nodes = random_graph(rng, 40, 60)
+    for node in nodes:
+        node.heuristic = 0  # Admissible for any edge costs
+    queries = [(rng.choice(nodes).char, [rng.choice(nodes).char, rng.choice(nodes).char]) for _ in range(12)]
+    by_char = {node.char: node for node in nodes}
+
+    slim = parallel_search.search_many(nodes[0], queries, algorithm, processes=processes)
+    traced = parallel_search.search_many(nodes[0], queries, algorithm, processes=processes, trace=True)
+    for (start, goals), query_result, traced_result in zip(queries, slim, traced):
+        expected = search(by_char[start], goals)
+        assert isinstance(query_result, parallel_search.QueryResult)
+        assert (query_result.goal, query_result.path, query_result.cost) == (expected.goal, expected.path, expected.cost)
+        assert query_result.expansions == len(expected.expanded)
+        assert traced_result.expanded == expected.expanded
@@ -0,0 +1,52 @@
+"""Tests for the LRU cache of search results."""
+import search_engine
+from query_cache import QueryCache
+from test_search_engine import small_graph
+
+
+def cached_ucs(cache, root, goals, calls):
+    def run(on_event):
+        calls.append(goals)
+        return search_engine.ucs(root, goals, on_event=on_event)
+    return cache.search("UCS", root.char, goals, {"find_all": False}, run)
+
+
+def test_repeated_query_is_served_from_cache():
+    nodes = small_graph()
+    cache, calls = QueryCache(), []
+    result, events = cached_ucs(cache, nodes["A"], ["F"], calls)
+    events.append(("highlight", "F", None))  # Callers may extend the list they get back
+    again, replayed = cached_ucs(cache, nodes["A"], ["F"], calls)
+    assert again is result
+    assert replayed == events[:-1]
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+
+
+def test_goal_order_and_duplicates_share_a_key():
+    cache = QueryCache()
+    assert cache.key("UCS", "A", ["F", "D"]) == cache.key("UCS", "A", ["D", "F", "D"])
+    assert cache.key("UCS", "A", ["F"]) != cache.key("UCS", "A", ["F"], {"find_all": True})
+
+
+def test_bump_invalidates_every_entry():
+    nodes = small_graph()
+    cache, calls = QueryCache(), []
+    cached_ucs(cache, nodes["A"], ["F"], calls)
+    nodes["A"].add_edge(nodes["F"], 1)
+    cache.bump()
+    assert len(cache) == 0
+    result, _ = cached_ucs(cache, nodes["A"], ["F"], calls)
+    assert len(calls) == 2
+    assert result.path == ["A", "F"]
+
+
+def test_least_recently_used_entry_is_evicted():
+    nodes = small_graph()
+    cache, calls = QueryCache(maxsize=2), []
+    for goals in (["D"], ["E"], ["D"], ["F"]):
+        cached_ucs(cache, nodes["A"], goals, calls)
+    assert calls == [["D"], ["E"], ["F"]]
+    assert cache.replay("UCS", "A", ["E"], {"find_all": False}) is None  # Evicted
+    events = []
+    result = cache.replay("UCS", "A", ["D"], {"find_all": False}, lambda *event: events.append(event))
+    assert result.goal == "D" and events[-1][:2] == (search_engine.GOAL, "D")
@@ -0,0 +1,67 @@
+"""Tests for the command-line batch runner."""
+import io
+import json
+
+import pytest
+
+import search_cli
+
+
+GRAPH_CSV = "char,heuristic,parent,path_cost\nA,3,,\nB,2,A,1\nC,1,A,4\nD,9,B,5\nE,1,B,1\nF,0,C,1\nF,,E,1\n"
+
+
+@pytest.fixture
+def graph_file(tmp_path):
+    path = tmp_path / "graph.csv"
+    path.write_text(GRAPH_CSV, encoding="utf-8")
+    return str(path)
+
+
+def test_plain_and_json_queries_parse_alike():
+    plain = search_cli.parse_query("UCS - F,D find_all=true")
+    as_json = search_cli.parse_query('{"algorithm": "ucs", "goals": "F,D", "find_all": "true"}')
+    assert plain == as_json == {"algorithm": "ucs", "start": None, "goals": ["F", "D"], "options": {"find_all": "true"}}
+
+
+@pytest.mark.parametrize("line", ["ucs A", "ucs A F depth", "[1, 2]", '{"start": "A", "goals": ["F"]}', "{oops"])
+def test_malformed_queries_raise_value_error(line):
+    with pytest.raises(ValueError):
+        search_cli.parse_query(line)
+
+
+def test_batch_reports_results_and_errors_per_line(graph_file):
+    root, nodes, _ = search_cli.tree_io.load_tree(graph_file)
+    lines = ["# comment", "", "astar - F", "bfs A F trace=1", "iddfs A F max_depth=1", "ucs A Z",
+             "sma_star A F max_nodes=x", "bidirectional A F weighted=yes", "nosuch A F"]
+    out = io.StringIO()
+    failures = search_cli.run_batch(lines, root, nodes, out, trace=True)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert failures == 4
+    assert records[0]["path"] == ["A", "B", "E", "F"] and records[0]["cost"] == 3
+    assert records[0]["expansion_order"] == ["A", "B", "E", "F"]
+    assert records[1] == {"line": 4, "error": "Unknown option 'trace' for bfs"}
+    assert records[2]["found"] is False
+    assert records[3] == {"line": 6, "error": "Goal node 'Z' does not exist"}
+    assert records[4]["line"] == 7
+    assert records[5]["cost"] == 3
+    assert records[6]["error"].startswith("Unknown algorithm 'nosuch'")
+
+
+def test_main_writes_output_and_exit_status(graph_file, tmp_path):
+    queries, output = tmp_path / "queries.txt", tmp_path / "results.jsonl"
+    queries.write_text("ucs - F,D find_all=1\n", encoding="utf-8")
+    assert search_cli.main([graph_file, str(queries), "--output", str(output)]) == 0
+    record = json.loads(output.read_text(encoding="utf-8"))
+    assert record["reached"]["D"]["cost"] == 6
+
+    queries.write_text("ucs - Z\n", encoding="utf-8")
+    assert search_cli.main([graph_file, str(queries), "--output", str(output)]) == 1
+
+
+def test_main_exits_on_unloadable_graph(tmp_path, capsys):
+    bad = tmp_path / "bad.csv"
+    bad.write_text("A,3,,\nB,2,Z,1\n", encoding="utf-8")
+    with pytest.raises(SystemExit) as exit_info:
+        search_cli.main([str(bad), "-"])
+    assert exit_info.value.code == 2
+    assert "Parent 'Z'" in capsys.readouterr().err
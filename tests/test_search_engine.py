@@ -0,0 +1,237 @@
+"""Tests for the headless search algorithms in search_engine."""
+import random
+
+import pytest
+
+import search_engine
+from search_engine import Node, ShortestPathTree
+
+
+def small_graph():
+    """A -> B -> E -> F costs 3, A -> C -> F is shallower but costs 5, and D is a dead end."""
+    nodes = {char: Node(char, heuristic) for char, heuristic in zip("ABCDEF", [3, 2, 1, 9, 1, 0])}
+    for parent, child, cost in [("A", "B", 1), ("A", "C", 4), ("B", "D", 5), ("B", "E", 1), ("C", "F", 1), ("E", "F", 1)]:
+        nodes[parent].add_edge(nodes[child], cost)
+    return nodes
+
+
+def random_graph(rng, size, edges, max_cost=9):
+    """A random directed graph with cycles; every node is reachable from n0 through a spanning tree."""
+    nodes = [Node(f"n{i}", 0) for i in range(size)]
+    for i in range(1, size):
+        nodes[rng.randrange(i)].add_edge(nodes[i], rng.randint(1, max_cost))
+    for _ in range(edges):
+        parent, child = rng.sample(nodes, 2)
+        parent.add_edge(child, rng.randint(1, max_cost))
+    return nodes
+
+
+def path_cost(nodes, path):
+    return sum(nodes[parent].cost_to(nodes[child]) for parent, child in zip(path, path[1:]))
+
+
+def test_iterative_deepening_restarts_each_limit_by_default():
+    nodes = small_graph()
+    result = search_engine.iterative_deepening(nodes["A"], ["F"])
+    assert result.path == ["A", "C", "F"]
+    assert result.iterations == [1, 3, 6]
+    assert result.expanded.count("A") == 3
+
+
+def test_iterative_deepening_reuse_frontier_expands_each_node_once():
+    nodes = small_graph()
+    result = search_engine.iterative_deepening(nodes["A"], ["F"], reuse_frontier=True)
+    assert result.path == ["A", "C", "F"]
+    assert result.expanded == ["A", "B", "C", "D", "E", "F"]
+    assert result.iterations == [1, 2, 3]
+
+
+@pytest.mark.parametrize("reuse_frontier", [False, True])
+def test_iterative_deepening_find_all_and_max_depth(reuse_frontier):
+    nodes = small_graph()
+    result = search_engine.iterative_deepening(nodes["A"], ["F", "D"], find_all=True, reuse_frontier=reuse_frontier)
+    assert {goal: (path, cost) for goal, (path, cost, _) in result.goals.items()} == {
+        "D": (["A", "B", "D"], 6), "F": (["A", "C", "F"], 5)}
+    assert not search_engine.iterative_deepening(nodes["A"], ["F"], max_depth=1, reuse_frontier=reuse_frontier).found
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_iterative_deepening_modes_find_shallowest_goal(seed):
+    rng = random.Random(seed)
+    nodes = random_graph(rng, 30, 40)
+    goal = rng.choice(nodes[1:]).char
+    depth = len(search_engine.bfs(nodes[0], [goal]).path)
+    for reuse_frontier in (False, True):
+        result = search_engine.iterative_deepening(nodes[0], [goal], reuse_frontier=reuse_frontier)
+        assert len(result.path) == depth
+    reused = search_engine.iterative_deepening(nodes[0], [goal], reuse_frontier=True)
+    assert len(reused.expanded) == len(set(reused.expanded))
+
+
+@pytest.mark.parametrize("search, path", [
+    (search_engine.bfs, ["A", "C", "F"]),
+    (search_engine.iterative_deepening, ["A", "C", "F"]),
+    (search_engine.greedy, ["A", "C", "F"]),
+    (search_engine.ucs, ["A", "B", "E", "F"]),
+    (search_engine.astar, ["A", "B", "E", "F"]),
+    (search_engine.ida_star, ["A", "B", "E", "F"]),
+    (search_engine.sma_star, ["A", "B", "E", "F"]),
+])
+def test_algorithms_on_small_graph(search, path):
+    nodes = small_graph()
+    result = search(nodes["A"], ["F"])
+    assert result.goal == "F"
+    assert result.path == path
+    assert result.cost == path_cost(nodes, path)
+    assert result.expanded[-1] == "F"
+
+
+@pytest.mark.parametrize("max_nodes, path", [(2, None), (3, ["A", "C", "F"]), (4, ["A", "B", "E", "F"])])
+def test_sma_star_returns_cheapest_path_that_fits(max_nodes, path):
+    nodes = small_graph()
+    result = search_engine.sma_star(nodes["A"], ["F"], max_nodes=max_nodes)
+    assert result.found == (path is not None)
+    if path is not None:
+        assert result.path == path
+        assert result.expanded[-1] == "F"
+
+
+def test_depth_limit_cuts_off_goal():
+    nodes = small_graph()
+    assert not search_engine.limited_dfs(nodes["A"], ["F"], depth_limit=1).found
+    assert search_engine.limited_dfs(nodes["A"], ["F"], depth_limit=2).path == ["A", "C", "F"]
+
+
+def test_find_all_records_every_goal():
+    nodes = small_graph()
+    result = search_engine.ucs(nodes["A"], ["F", "D"], find_all=True)
+    assert result.goal == "F"
+    assert {goal: cost for goal, (_, cost, _) in result.goals.items()} == {"F": 3, "D": 6}
+
+
+def test_bidirectional_search_finds_cheapest_path():
+    nodes = small_graph()
+    result = search_engine.bidirectional_search(nodes["A"], [nodes["F"]], weighted=True)
+    assert result.path == ["A", "B", "E", "F"]
+    assert result.cost == 3
+
+
+def test_bidirectional_search_finds_shallowest_path_unweighted():
+    nodes = small_graph()
+    result = search_engine.bidirectional_search(nodes["A"], [nodes["F"]])
+    assert result.path == ["A", "C", "F"]
+    assert result.cost == 5
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_cost_optimal_algorithms_agree_on_random_graphs(seed):
+    rng = random.Random(seed)
+    nodes = random_graph(rng, 30, 40)
+    by_char = {node.char: node for node in nodes}
+    table = ShortestPathTree(nodes[0])
+    goal = rng.choice(nodes[1:]).char
+    for search in (search_engine.ucs, search_engine.astar, search_engine.ida_star):
+        result = search(nodes[0], [goal])
+        assert result.cost == table.distance[goal]
+        assert path_cost(by_char, result.path) == result.cost
+
+    depth = len(search_engine.bfs(nodes[0], [goal]).path) - 1
+    assert len(search_engine.iterative_deepening(nodes[0], [goal]).path) - 1 == depth
+    assert len(search_engine.limited_dfs(nodes[0], [goal], depth_limit=depth).path) - 1 == depth
+    assert not search_engine.limited_dfs(nodes[0], [goal], depth_limit=depth - 1).found
+
+
+def test_stream_stops_early():
+    nodes = small_graph()
+    stream = search_engine.SearchStream(search_engine.iter_ucs(nodes["A"], ["F"]))
+    expanded = []
+    for kind, char, _ in stream:
+        if kind == search_engine.EXPAND:
+            expanded.append(char)
+            if char == "B":
+                stream.close()
+                break
+    assert expanded == ["A", "B"]
+    assert stream.done and stream.result is None
+
+
+def test_stream_reports_the_same_events_and_result_as_on_event():
+    nodes = small_graph()
+    events = []
+    expected = search_engine.astar(nodes["A"], ["F"], on_event=lambda *event: events.append(event))
+    stream = search_engine.SearchStream(search_engine.iter_astar(nodes["A"], ["F"]))
+    assert list(stream) == events
+    assert (stream.result.path, stream.result.expanded) == (expected.path, expected.expanded)
+
+
+def test_interleave_steps_streams_in_turn():
+    nodes = small_graph()
+    streams = [search_engine.SearchStream(search_engine.iter_bfs(nodes["A"], ["F"])),
+               search_engine.SearchStream(search_engine.iter_ucs(nodes["A"], ["F"]))]
+    order = [streams.index(stream) for stream, _ in search_engine.interleave(streams)]
+    shorter = min(order.count(0), order.count(1))
+    assert order[:2 * shorter] == [0, 1] * shorter
+    assert [stream.result.path for stream in streams] == [["A", "C", "F"], ["A", "B", "E", "F"]]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_shortest_path_tree_repairs_match_rebuild(seed):
+    rng = random.Random(seed)
+    nodes = random_graph(rng, 25, 20)
+    table = ShortestPathTree(nodes[0])
+    for _ in range(40):
+        parent, child = rng.sample(nodes, 2)
+        if child in parent.edge_costs:
+            parent.remove_edge(child)
+            table.remove_edge(parent, child)
+        else:
+            parent.add_edge(child, rng.randint(1, 9))
+            table.add_edge(parent, child)
+        fresh = ShortestPathTree(nodes[0])
+        assert table.distance == fresh.distance
+        for char in fresh.distance:
+            path = table.path_to(char)
+            assert path[0] == nodes[0].char and path[-1] == char
+            assert path_cost({node.char: node for node in nodes}, path) == fresh.distance[char]
+
+
+def test_shortest_path_tree_query_matches_ucs():
+    nodes = small_graph()
+    table = ShortestPathTree(nodes["A"])
+    for goals in (["F"], ["D", "F"], ["B", "E"], ["Z"]):
+        expected = search_engine.ucs(nodes["A"], goals, find_all=True)
+        result = table.query(goals, find_all=True)
+        assert (result.goal, result.path, result.cost) == (expected.goal, expected.path, expected.cost)
+        assert {goal: cost for goal, (_, cost, _) in result.goals.items()} == {
+            goal: cost for goal, (_, cost, _) in expected.goals.items()}
+
+
+@pytest.mark.parametrize("expanded, depth, factor", [(7, 2, 2), (3, 1, 2), (4, 3, 1), (5, 0, None)])
+def test_effective_branching_factor(expanded, depth, factor):
+    result = search_engine.effective_branching_factor(expanded, depth)
+    assert result == (None if factor is None else pytest.approx(factor, abs=1e-6))
+
+
+def test_heuristic_report_on_exact_heuristic():
+    nodes = small_graph()
+    report = search_engine.heuristic_report(nodes["A"], ["F"])
+    assert report["nodes"] == 6
+    assert report["admissible"] and report["consistent"] and report["astar_optimal"]
+    assert report["mean_accuracy"] == 1.0  # D cannot reach F, so it is left out
+    assert report["optimal_cost"] == 3
+    assert report["A*"]["expanded"] == 4 and report["A*"]["depth"] == 3
+
+
+def test_heuristic_report_flags_overestimates():
+    nodes = small_graph()
+    nodes["C"].heuristic = 6
+    report = search_engine.heuristic_report(nodes["A"], ["F"])
+    assert report["inadmissible"] == [("C", 6, 1)]
+    assert report["inconsistent"] == [("C", "F", 6, 1, 0)]
+    assert report["astar_optimal"]  # C's overestimate only delays a path that is not optimal anyway
+
+    nodes["B"].heuristic, nodes["C"].heuristic = 9, 1
+    report = search_engine.heuristic_report(nodes["A"], ["F"])
+    assert not report["astar_optimal"]
+    assert report["A*"]["cost"] == 5 and report["UCS"]["cost"] == 3
+
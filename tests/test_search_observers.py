@@ -0,0 +1,83 @@
+"""Tests for the search observers and the instrument helper."""
+import pstats
+
+import search_engine
+from search_engine import EXPAND, ENQUEUE, GOAL, PRUNE, Node
+from search_observers import PhaseTimer, SearchCounters, combine, instrument
+from test_search_engine import small_graph
+
+
+def test_counters_match_the_search():
+    nodes = small_graph()
+    counters = SearchCounters()
+    result = search_engine.ucs(nodes["A"], ["F"], on_event=counters)
+    assert counters.as_dict() == {"expansions": 4, "re_expansions": 0, "enqueues": 5, "duplicate_pushes": 0,
+                                  "prunes": 0, "goals": 1, "frontier_high_water": 3}
+    assert counters.expansions == len(result.expanded)
+
+
+def test_cheaper_path_counts_as_duplicate_push():
+    a, b, c = Node("A", 0), Node("B", 0), Node("C", 0)
+    a.add_edge(b, 5)
+    a.add_edge(c, 1)
+    c.add_edge(b, 1)
+    counters = SearchCounters()
+    search_engine.ucs(a, ["B"], on_event=counters)
+    assert counters.duplicate_pushes == 1
+    assert counters.frontier_high_water == 2
+
+
+def test_directions_are_counted_apart_in_bidirectional_search():
+    nodes = small_graph()
+    counters = SearchCounters()
+    search_engine.bidirectional_search(nodes["A"], [nodes["F"]], on_event=counters)
+    assert counters.enqueues == 4  # C is queued by both directions
+    assert counters.duplicate_pushes == 0
+    assert counters.re_expansions == 0
+
+
+def test_ida_star_iterations_count_as_re_expansions():
+    nodes = small_graph()
+    for node in nodes.values():
+        node.heuristic = 0  # Forces one iteration per distinct f bound
+    counters = SearchCounters()
+    result = search_engine.ida_star(nodes["A"], ["F"], on_event=counters)
+    assert counters.expansions == len(result.expanded)
+    assert counters.re_expansions == len(result.expanded) - len(set(result.expanded)) > 0
+
+
+def test_prune_from_the_queuing_parent_removes_the_node():
+    counters = SearchCounters()
+    for event in [(EXPAND, "A", None), (ENQUEUE, "B", "A"), (PRUNE, "B", "A"), (ENQUEUE, "B", "A")]:
+        counters(*event)
+    assert counters.duplicate_pushes == 0  # B had been forgotten before it was queued again
+
+    for event in [(PRUNE, "B", "C"), (ENQUEUE, "B", "A")]:
+        counters(*event)
+    assert counters.duplicate_pushes == 1  # A prune from another parent leaves B queued
+    assert counters.prunes == 2
+
+
+def test_phase_timer_splits_select_and_expand():
+    ticks = iter(range(100))
+    timer = PhaseTimer(clock=lambda: next(ticks))
+    for event in [(EXPAND, "A", None), (ENQUEUE, "B", "A"), (EXPAND, "B", "A"), (GOAL, "B", "A")]:
+        timer(*event)
+    assert timer.phases == {"select": 1, "expand": 2}
+    assert timer.first_goal == 6
+
+
+def test_combine_and_instrument():
+    assert combine(None) is None
+    counters = SearchCounters()
+    assert combine(counters, None) is counters
+
+    nodes = small_graph()
+    events = []
+    result, report = instrument(
+        lambda on_event: search_engine.astar(nodes["A"], ["F"], on_event=on_event),
+        counters, lambda *event: events.append(event), profile=True, trace_memory=True)
+    assert result.path == ["A", "B", "E", "F"]
+    assert counters.expansions == 4 and len(events) == 4 + counters.enqueues + counters.prunes + counters.goals
+    assert report["wall_time_s"] >= 0 and report["peak_memory_bytes"] > 0
+    assert isinstance(report["profile"], pstats.Stats)
@@ -0,0 +1,86 @@
+"""Tests for loading trees and graphs from CSV and JSON."""
+import json
+
+import pytest
+
+import tree_io
+
+
+def test_repeated_csv_row_without_cost_uses_node_path_cost():
+    rows = [["A", "3", "", ""], ["B", "2", "A", "1"], ["C", "1", "A", "4"], ["C", "", "B", ""]]
+    root, nodes, _ = tree_io.tree_from_rows(rows)
+    assert nodes["A"].cost_to(nodes["C"]) == 4
+    assert nodes["B"].cost_to(nodes["C"]) == 4
+    assert nodes["B"].edge_costs[nodes["C"]] == 4
+
+
+def test_json_edge_without_cost_uses_child_path_cost():
+    data = {"root": "A",
+            "nodes": [{"char": "A", "heuristic": 1}, {"char": "B", "heuristic": 0, "path_cost": 2}],
+            "edges": [{"from": "A", "to": "B"}]}
+    root, nodes, _ = tree_io.tree_from_json(data)
+    assert nodes["A"].edge_costs[nodes["B"]] == 2
+
+
+def test_invalid_cost_is_rejected():
+    with pytest.raises(ValueError):
+        tree_io.tree_from_rows([["A", "3", "", ""], ["B", "2", "A", "x"]])
+
+
+def test_csv_rows_may_list_children_before_parents(tmp_path):
+    path = tmp_path / "tree.csv"
+    path.write_text("char,heuristic,parent,path_cost\nC,1,B,2\nB,2,A,1\nA,3,,\n\nD,0,A,\n", encoding="utf-8")
+    root, nodes, parent_nodes = tree_io.load_tree(str(path))
+    assert root.char == "A"
+    assert [child.char for child in root.children] == ["B", "D"]
+    assert nodes["B"].cost_to(nodes["C"]) == 2
+    assert nodes["A"].cost_to(nodes["D"]) == 0
+    assert parent_nodes == {"A": None, "B": nodes["A"], "C": nodes["B"], "D": nodes["A"]}
+
+
+@pytest.mark.parametrize("rows, message", [
+    ([["A", "3", "", ""], ["B", "2", "", ""]], "second root"),
+    ([["A", "3", "", ""], ["B", "", "A", ""]], "no heuristic"),
+    ([["A", "3", "", ""], ["B", "2", "Z", ""]], "does not exist"),
+    ([["A", "3", "", ""], ["B", "2", "A", ""], ["B", "", "A", ""]], "Duplicate edge"),
+    ([["A", "3", "", ""], ["B", "2", "A", ""], ["B", "5", "A", ""]], "Duplicate node"),
+    ([["B", "2", "C", ""], ["C", "2", "B", ""], ["A", "3", "", ""]], "not reachable"),
+    ([["B", "2", "A", ""]], "does not exist"),
+])
+def test_invalid_csv_rows_are_rejected(rows, message):
+    with pytest.raises(ValueError, match=message):
+        tree_io.tree_from_rows(rows)
+
+
+def test_nested_json_keeps_child_order(tmp_path):
+    data = {"char": "A", "heuristic": 3, "children": [
+        {"char": "B", "heuristic": 2, "path_cost": 1, "children": [{"char": "D", "heuristic": 0, "path_cost": 4}]},
+        {"char": "C", "heuristic": 1, "path_cost": 2}]}
+    path = tmp_path / "tree.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    root, nodes, parent_nodes = tree_io.load_tree(str(path))
+    assert [child.char for child in root.children] == ["B", "C"]
+    assert nodes["B"].cost_to(nodes["D"]) == 4
+    assert parent_nodes["D"] is nodes["B"]
+
+
+def test_json_graph_with_undirected_edge_and_root():
+    data = {"root": "B",
+            "nodes": [{"char": "A", "heuristic": 1}, {"char": "B", "heuristic": 0}],
+            "edges": [{"from": "A", "to": "B", "cost": 3, "directed": False}]}
+    root, nodes, parent_nodes = tree_io.tree_from_json(data)
+    assert root is nodes["B"]
+    assert nodes["B"].cost_to(nodes["A"]) == nodes["A"].cost_to(nodes["B"]) == 3
+    assert parent_nodes == {"B": None, "A": nodes["B"]}
+
+
+@pytest.mark.parametrize("data", [
+    {"char": "A"},
+    {"char": "A", "heuristic": 1, "children": [{"char": "A", "heuristic": 1}]},
+    {"char": "A", "heuristic": 1, "children": ["B"]},
+    {"root": "Z", "nodes": [{"char": "A", "heuristic": 1}]},
+    {"nodes": [{"char": "A", "heuristic": 1}], "edges": [{"from": "A", "to": "Z"}]},
+])
+def test_invalid_json_is_rejected(data):
+    with pytest.raises(ValueError):
+        tree_io.tree_from_json(data)
@@ -0,0 +1,75 @@
+"""Tests for the incremental tidy tree layout."""
+import random
+
+import pytest
+
+from search_engine import Node
+from tree_layout import TidyLayout
+
+
+def test_incremental_layout_matches_fresh_layout():
+    rng = random.Random(3)
+    root = Node("r", 0)
+    kids = {root: []}
+    parents = {root: None}
+    collapsed = set()
+
+    def children(node):
+        return [] if node in collapsed else kids[node]
+
+    layout = TidyLayout(children)
+    layout.layout(root)
+    for step in range(300):
+        choice = rng.random()
+        if choice < 0.6 or len(kids) == 1:
+            parent = rng.choice(list(kids))
+            child = Node(f"n{step}", 0)
+            kids[parent].insert(rng.randrange(len(kids[parent]) + 1), child)
+            kids[child], parents[child] = [], parent
+            target = parent
+        elif choice < 0.8:
+            leaf = rng.choice([node for node in kids if not kids[node] and node is not root])
+            target = parents.pop(leaf)
+            kids[target].remove(leaf)
+            del kids[leaf]
+            collapsed.discard(leaf)
+            layout.forget(leaf)
+        else:
+            target = rng.choice(list(kids))
+            collapsed.symmetric_difference_update({target})
+
+        before = dict(layout.x)
+        moved = set(layout.relayout(target))
+        fresh = TidyLayout(children)
+        fresh.layout(root)
+        for node in fresh.x:  # Nodes hidden under a collapsed node keep stale entries in layout.x
+            assert layout.x[node] - layout.x[root] == pytest.approx(fresh.x[node] - fresh.x[root])
+            assert layout.depth[node] == fresh.depth[node]
+            if node not in moved:
+                assert layout.x[node] == before[node]
+
+    levels = {}
+    for node, x in fresh.x.items():
+        levels.setdefault(fresh.depth[node], []).append(x)
+    for xs in levels.values():
+        xs.sort()
+        assert all(right - left >= 1 - 1e-9 for left, right in zip(xs, xs[1:]))
+
+
+def test_layout_keeps_subtrees_left_of_an_edit():
+    root = Node("r", 0)
+    left, right = Node("a", 0), Node("b", 0)
+    kids = {root: [left, right], left: [Node("a1", 0), Node("a2", 0)], right: []}
+    for child in kids[left]:
+        kids[child] = []
+    layout = TidyLayout(lambda node: kids[node])
+    layout.layout(root)
+    before = dict(layout.x)
+
+    grandchild = Node("b1", 0)
+    kids[right].extend([grandchild, Node("b2", 0), Node("b3", 0)])
+    for child in kids[right]:
+        kids[child] = []
+    layout.relayout(right)
+    for node in [left] + kids[left]:
+        assert layout.x[node] == before[node]
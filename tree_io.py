@@ -0,0 +1,184 @@
+"""Bulk loading of search trees and graphs from CSV or JSON files.
+
+CSV files hold one ``char,heuristic,parent,path_cost`` row per edge (an
+optional header row is skipped, and the root has an empty parent). Repeating a
+char with another parent, and an empty or equal heuristic, gives that node an
+extra parent; an empty path_cost there means the node's own path cost, as in
+the GUI. An edge without a cost in a JSON graph defaults the same way. JSON files hold either a nested tree of
+``{"char", "heuristic", "path_cost", "children"}`` objects or a graph
+``{"root", "nodes": [{"char", "heuristic"}], "edges": [{"from", "to", "cost",
+"directed"}]}``. Binary graph files written by graph_store (``.aigraph``)
+are loaded too. Either way the whole Node structure is built in one pass, so
+callers can lay it out and draw it once at the end.
+
+The returned ``parent_nodes`` maps every node to a single layout parent: the
+node it is first reached from in a breadth-first walk from the root.
+"""
+from collections import deque
+import csv
+import json
+
+import graph_store
+from search_engine import Node
+
+
+CSV_COLUMNS = ("char", "heuristic", "parent", "path_cost")
+
+
+def load_tree(path):
+    """Loads a tree or graph file and returns (root, nodes, parent_nodes) keyed by node char."""
+    if path.lower().endswith(graph_store.EXTENSION):
+        root, nodes, parent_nodes, _ = graph_store.load_graph(path)
+        return root, nodes, parent_nodes
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return tree_from_json(json.load(f))
+    with open(path, newline="", encoding="utf-8") as f:
+        return tree_from_rows(csv.reader(f))
+
+
+def _number(value, field, char):
+    """Parses a numeric field, treating an empty value as 0."""
+    if value is None or value == "":
+        return 0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Node '{char}' has an invalid {field}: {value!r}") from None
+
+
+def layout_parents(root, nodes):
+    """Picks one parent per node by walking breadth-first from root; every node must be reachable."""
+    if root is None:
+        return {}
+    parent_nodes = {root.char: None}
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        for child in node.children:
+            if child.char not in parent_nodes:
+                parent_nodes[child.char] = node
+                queue.append(child)
+
+    for char in nodes:
+        if char not in parent_nodes:
+            raise ValueError(f"Node '{char}' is not reachable from the root '{root.char}'")
+    return parent_nodes
+
+
+def tree_from_rows(rows):
+    """Builds a tree, or a DAG when a char repeats, from (char, heuristic, parent, path_cost) rows."""
+    nodes = {}
+    edges = []  # (parent char, child char, cost, line number)
+    root = None
+
+    for line_number, row in enumerate(rows, start=1):
+        row = [cell.strip() for cell in row]
+        if not row or not row[0]:
+            continue  # Skip blank lines
+        if line_number == 1 and row[0].lower() == CSV_COLUMNS[0]:
+            continue  # Skip the header row
+        row += [""] * (len(CSV_COLUMNS) - len(row))
+        char, heuristic, parent_char, path_cost = row[:len(CSV_COLUMNS)]
+
+        if char in nodes:
+            # A repeated char adds another parent to the same node
+            if not parent_char or (heuristic != "" and _number(heuristic, "heuristic", char) != nodes[char].heuristic):
+                raise ValueError(f"Duplicate node '{char}' on line {line_number}")
+            cost = nodes[char].path_cost if path_cost == "" else _number(path_cost, "path cost", char)
+            edges.append((parent_char, char, cost, line_number))
+            continue
+        if heuristic == "":
+            raise ValueError(f"Node '{char}' on line {line_number} has no heuristic")
+
+        nodes[char] = Node(char, _number(heuristic, "heuristic", char), _number(path_cost, "path cost", char))
+        if parent_char:
+            edges.append((parent_char, char, nodes[char].path_cost, line_number))
+        elif root is None:
+            root = nodes[char]
+        else:
+            raise ValueError(f"Node '{char}' on line {line_number} is a second root")
+
+    # Rows may list a child before its parent, so link once every node exists
+    for parent_char, char, cost, line_number in edges:
+        if parent_char not in nodes:
+            raise ValueError(f"Parent '{parent_char}' of node '{char}' does not exist")
+        if nodes[char] in nodes[parent_char].edge_costs:
+            raise ValueError(f"Duplicate edge '{parent_char}' -> '{char}' on line {line_number}")
+        nodes[parent_char].add_edge(nodes[char], cost)
+
+    if nodes and root is None:
+        raise ValueError("The tree has no root node")
+    return root, nodes, layout_parents(root, nodes)
+
+
+def tree_from_json(data):
+    """Builds a tree from a nested JSON object without recursion, or a graph from a nodes/edges object."""
+    if isinstance(data, dict) and "nodes" in data:
+        return graph_from_json(data)
+
+    nodes = {}
+    parent_nodes = {}
+    root = None
+
+    stack = [(data, None)]  # (json object, parent Node)
+    while stack:
+        item, parent = stack.pop()
+        if not isinstance(item, dict):
+            raise ValueError(f"Expected a node object, got {item!r}")
+        char = str(item.get("char", "")).strip()
+        if not char:
+            raise ValueError("Every node needs a 'char'")
+        if char in nodes:
+            raise ValueError(f"Duplicate node '{char}'")
+        if item.get("heuristic") is None:
+            raise ValueError(f"Node '{char}' has no heuristic")
+
+        node = Node(char, _number(item["heuristic"], "heuristic", char), _number(item.get("path_cost"), "path cost", char))
+        nodes[char] = node
+        parent_nodes[char] = parent
+        if parent is None:
+            root = node
+        else:
+            parent.add_edge(node)
+
+        # Push in reverse so children keep their file order in the tree
+        for child in reversed(item.get("children", [])):
+            stack.append((child, node))
+
+    return root, nodes, parent_nodes
+
+
+def graph_from_json(data):
+    """Builds a graph from ``{"root", "nodes", "edges"}``; edges are directed unless "directed" is false."""
+    nodes = {}
+    for item in data.get("nodes", []):
+        if not isinstance(item, dict):
+            raise ValueError(f"Expected a node object, got {item!r}")
+        char = str(item.get("char", "")).strip()
+        if not char:
+            raise ValueError("Every node needs a 'char'")
+        if char in nodes:
+            raise ValueError(f"Duplicate node '{char}'")
+        if item.get("heuristic") is None:
+            raise ValueError(f"Node '{char}' has no heuristic")
+        nodes[char] = Node(char, _number(item["heuristic"], "heuristic", char), _number(item.get("path_cost"), "path cost", char))
+
+    for item in data.get("edges", []):
+        if not isinstance(item, dict):
+            raise ValueError(f"Expected an edge object, got {item!r}")
+        parent_char, char = str(item.get("from", "")).strip(), str(item.get("to", "")).strip()
+        for end in (parent_char, char):
+            if end not in nodes:
+                raise ValueError(f"Edge '{parent_char}' -> '{char}' uses unknown node '{end}'")
+        cost = None if item.get("cost") in (None, "") else _number(item["cost"], "edge cost", char)  # None: child's path cost
+        nodes[parent_char].add_edge(nodes[char], cost, directed=item.get("directed", True))
+
+    root_char = data.get("root")
+    if root_char is None:
+        root = next(iter(nodes.values()), None)  # Default to the first node listed
+    elif root_char in nodes:
+        root = nodes[root_char]
+    else:
+        raise ValueError(f"Root '{root_char}' does not exist")
+    return root, nodes, layout_parents(root, nodes)
@@ -0,0 +1,294 @@
+"""Tidy tree layout in linear time.
+
+Implements the Reingold-Tilford layout in Walker's formulation, made linear
+by Buchheim, Juenger and Leipert (2002). Every subtree is pushed as close to
+its left siblings as their contours allow, parents are centered over their
+children, and small subtrees between large ones are spread out evenly. Both
+walks are iterative, so deep trees never hit the recursion limit.
+
+TidyLayout keeps its per-node state between calls. When one subtree changes
+(a child added, removed or collapsed), ``relayout(node)`` recomputes only that
+subtree and re-packs its ancestors. Each ancestor logs the contour threads and
+offsets it wrote into its children's subtrees, and these writes are undone
+first. Untouched sibling subtrees are therefore reused as they are and only
+shifted. The tree is not pinned at its root: the whole layout is placed so
+that the subtree left of the edit keeps its x, so an edit moves the changed
+subtree, its ancestors and what lies to its right, but not the rest.
+"""
+
+_MISSING = object()  # Marks a table entry that did not exist before a logged write
+
+
+class TidyLayout:
+    """Incremental tidy layout of the tree given by children(node).
+
+    Positions are in units: ``x[node]`` is a horizontal position with
+    neighbouring nodes ``distance`` apart, and ``depth[node]`` is the level
+    below the root. A first layout puts the root at x = 0; later layouts keep
+    existing nodes where they can, so the root drifts as the tree changes.
+    """
+
+    def __init__(self, children, distance=1.0):
+        self.children = children  # children(node) -> child nodes, left to right
+        self.distance = distance
+        self.root = None
+        self.x = {}
+        self.depth = {}
+        self._kids = {}  # node -> children at its last layout
+        self._parent = {}
+        self._number = {}  # node -> index among its siblings
+        self._prelim = {}
+        self._mod = {}
+        self._shift = {}
+        self._change = {}
+        self._thread = {}
+        self._ancestor = {}
+        self._log = {}  # node -> [(table, key, old value)] written by its combine below its children
+
+    def layout(self, root):
+        """Lays out the whole tree from root; returns the nodes whose position changed."""
+        for table in (self._kids, self._parent, self._number, self._prelim, self._mod, self._shift,
+                      self._change, self._thread, self._ancestor, self._log):
+            table.clear()
+        old_x, old_depth = self.x, self.depth
+        self.x, self.depth = {}, {}
+        self.root = root
+        if root is None:
+            return []
+
+        self._parent[root] = None
+        self._number[root] = 0
+        self.depth[root] = 0
+        self._first_walk(root)
+        self._place_root()
+        offset = old_x.get(root, 0) - self._prelim[root]  # Keep the root where it was
+        moved = []
+        for node, x in self._second_walk(root, offset):
+            if old_x.get(node) != x or old_depth.get(node) != self.depth[node]:
+                moved.append(node)
+        return moved
+
+    def relayout(self, node):
+        """Re-lays out the subtree at node after its children changed; returns the nodes that moved.
+
+        Only node's subtree is recomputed. Its ancestors are re-packed, and
+        their other subtrees are reused and shifted as a whole.
+        """
+        if node not in self._parent:
+            return self.layout(self.root)  # Never laid out, e.g. inside a collapsed subtree
+
+        path = []  # Ancestors of node, nearest first
+        child, ancestor = node, self._parent[node]
+        while ancestor is not None:
+            kids = self._kids[ancestor]
+            number = self._number[child]
+            if number >= len(kids) or kids[number] is not child:
+                return self.layout(self.root)  # Hidden below a node collapsed since its last layout
+            path.append(ancestor)
+            child, ancestor = ancestor, self._parent[ancestor]
+        on_path = set(path)
+        for ancestor in reversed(path):  # The root combined last, so it is undone first
+            self._undo(self._log.pop(ancestor, []))
+
+        self._first_walk(node)
+        for ancestor in path:
+            self._combine(ancestor)
+        self._place_root()
+
+        # Second walk: full below node; sibling subtrees along the path only shift
+        offset = self._anchor_offset(node, path)
+        moved = []
+        mod_sum = offset  # Sum of the mods above the current path node, plus the root offset
+        for ancestor in reversed(path):
+            x = self._prelim[ancestor] + mod_sum
+            if self._set_x(ancestor, x):
+                moved.append(ancestor)
+            mod_sum += self._mod[ancestor]
+            for child in self._kids[ancestor]:
+                if child is node or child in on_path:
+                    continue
+                delta = self._prelim[child] + mod_sum - self.x[child]
+                if abs(delta) > 1e-9:
+                    moved.extend(self._shift_subtree(child, delta))
+        moved.extend(descendant for descendant, _ in self._second_walk(node, mod_sum))
+        return moved
+
+    def _anchor_offset(self, node, path):
+        """The root offset that keeps the leftmost subtree outside the edit at its old x."""
+        chain = path[::-1] + [node]  # From the root down to node
+        mod_sum = 0
+        for ancestor, path_child in zip(chain, chain[1:]):
+            mod_sum += self._mod[ancestor]
+            first = self._kids[ancestor][0]
+            if first is not path_child:
+                # Nothing below the edit reaches into this subtree, so it keeps its shape
+                return self.x[first] - self._prelim[first] - mod_sum
+        return self.x[node] - self._prelim[node] - mod_sum  # Node is on the left edge; keep node itself
+
+    def forget(self, node):
+        """Drops everything known about a node removed from the tree."""
+        for table in (self.x, self.depth, self._kids, self._parent, self._number, self._prelim, self._mod,
+                      self._shift, self._change, self._thread, self._ancestor, self._log):
+            table.pop(node, None)
+
+    # First walk ---------------------------------------------------------
+
+    def _first_walk(self, top):
+        """Computes preliminary positions for top's subtree, children before parents."""
+        order = [top]
+        index = 0
+        while index < len(order):
+            node = order[index]
+            index += 1
+            kids = tuple(self.children(node))
+            self._kids[node] = kids
+            for number, child in enumerate(kids):
+                self._parent[child] = node
+                self._number[child] = number
+                self.depth[child] = self.depth[node] + 1
+            order.extend(kids)
+            self._prelim[node] = self._mod[node] = self._shift[node] = self._change[node] = 0
+            self._thread.pop(node, None)
+            self._ancestor.pop(node, None)
+            self._log.pop(node, None)
+        for node in reversed(order):
+            self._combine(node)
+
+    def _midpoint(self, node):
+        kids = self._kids[node]
+        return (self._prelim[kids[0]] + self._prelim[kids[-1]]) / 2 if kids else 0
+
+    def _combine(self, node):
+        """Places node's children next to each other, pushing each subtree clear of those on its left."""
+        kids = self._kids[node]
+        log = self._log[node] = []
+        default_ancestor = kids[0] if kids else None
+        for number, child in enumerate(kids):
+            midpoint = self._midpoint(child)
+            self._shift[child] = self._change[child] = 0
+            if number:
+                self._prelim[child] = self._prelim[kids[number - 1]] + self.distance
+                self._mod[child] = self._prelim[child] - midpoint if self._kids[child] else 0
+            else:
+                self._prelim[child] = midpoint
+                self._mod[child] = 0
+            default_ancestor = self._apportion(child, kids, default_ancestor, log)
+
+        # Spread the accumulated shifts over the children in one right-to-left pass
+        shift = change = 0
+        for child in reversed(kids):
+            self._prelim[child] += shift
+            self._mod[child] += shift
+            change += self._change[child]
+            shift += self._shift[child] + change
+
+    def _next_left(self, node):
+        kids = self._kids.get(node)
+        return kids[0] if kids else self._thread.get(node)
+
+    def _next_right(self, node):
+        kids = self._kids.get(node)
+        return kids[-1] if kids else self._thread.get(node)
+
+    def _apportion(self, node, siblings, default_ancestor, log):
+        """Moves node's subtree right until its left contour clears the right contour of its left siblings."""
+        number = self._number[node]
+        if number == 0:
+            return default_ancestor
+
+        prelim, mod = self._prelim, self._mod
+        inner_right = outer_right = node  # Contours of node's subtree
+        inner_left, outer_left = siblings[number - 1], siblings[0]  # Contours of the siblings on the left
+        sum_inner_right, sum_outer_right = mod[inner_right], mod[outer_right]
+        sum_inner_left, sum_outer_left = mod[inner_left], mod[outer_left]
+        while True:
+            next_inner_left = self._next_right(inner_left)
+            next_inner_right = self._next_left(inner_right)
+            if next_inner_left is None or next_inner_right is None:
+                break
+            inner_left, inner_right = next_inner_left, next_inner_right
+            outer_left, outer_right = self._next_left(outer_left), self._next_right(outer_right)
+            self._logged_set(log, self._ancestor, outer_right, node)
+
+            shift = (prelim[inner_left] + sum_inner_left) - (prelim[inner_right] + sum_inner_right) + self.distance
+            if shift > 0:
+                self._move_subtree(self._greatest_ancestor(inner_left, node, default_ancestor), node, shift)
+                sum_inner_right += shift
+                sum_outer_right += shift
+            sum_inner_left += mod[inner_left]
+            sum_inner_right += mod[inner_right]
+            sum_outer_left += mod[outer_left]
+            sum_outer_right += mod[outer_right]
+
+        # Thread the shorter contour onto the longer one so later comparisons can follow it
+        if next_inner_left is not None and self._next_right(outer_right) is None:
+            self._logged_set(log, self._thread, outer_right, next_inner_left)
+            self._logged_set(log, mod, outer_right, mod[outer_right] + sum_inner_left - sum_outer_right)
+        if next_inner_right is not None and self._next_left(outer_left) is None:
+            self._logged_set(log, self._thread, outer_left, next_inner_right)
+            self._logged_set(log, mod, outer_left, mod[outer_left] + sum_inner_right - sum_outer_left)
+            default_ancestor = node
+        return default_ancestor
+
+    def _greatest_ancestor(self, inner_left, node, default_ancestor):
+        """The left sibling of node whose subtree holds inner_left, or default_ancestor."""
+        ancestor = self._ancestor.get(inner_left, inner_left)
+        if self._parent.get(ancestor) is self._parent[node]:
+            return ancestor
+        return default_ancestor
+
+    def _move_subtree(self, left, right, shift):
+        """Shifts right's subtree and records the shift to spread over the subtrees between left and right."""
+        subtrees = self._number[right] - self._number[left]
+        self._change[right] -= shift / subtrees
+        self._shift[right] += shift
+        self._change[left] += shift / subtrees
+        self._prelim[right] += shift
+        self._mod[right] += shift
+
+    def _place_root(self):
+        self._prelim[self.root] = self._midpoint(self.root)
+        self._mod[self.root] = 0
+
+    @staticmethod
+    def _logged_set(log, table, key, value):
+        log.append((table, key, table.get(key, _MISSING)))
+        table[key] = value
+
+    @staticmethod
+    def _undo(log):
+        for table, key, old in reversed(log):
+            if old is _MISSING:
+                table.pop(key, None)
+            else:
+                table[key] = old
+
+    # Second walk --------------------------------------------------------
+
+    def _second_walk(self, top, mod_sum):
+        """Sets the final x of every node below top, given the mods summed above it; yields (node, x) when x changed."""
+        stack = [(top, mod_sum)]
+        while stack:
+            node, mod_sum = stack.pop()
+            x = self._prelim[node] + mod_sum
+            if self._set_x(node, x):
+                yield node, x
+            mod_sum += self._mod[node]
+            stack.extend((child, mod_sum) for child in self._kids[node])
+
+    def _set_x(self, node, x):
+        """Stores x; returns True if the node is new or moved."""
+        old = self.x.get(node)
+        self.x[node] = x
+        return old is None or abs(old - x) > 1e-9
+
+    def _shift_subtree(self, top, delta):
+        """Moves a whole subtree whose shape did not change; returns its nodes."""
+        stack = [top]
+        moved = []
+        while stack:
+            node = stack.pop()
+            self.x[node] += delta
+            moved.append(node)
+            stack.extend(self._kids[node])
+        return moved